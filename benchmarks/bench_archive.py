@@ -0,0 +1,83 @@
+"""
+30-day spread/depth history for one symbol: SQLite orderbook_snapshots with
+level blobs vs. the columnar tick archive with column projection.
+
+Usage: python -m benchmarks.bench_archive [--rows N] [--backend memmap|parquet] [--dir PATH]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.core.archive import TickArchive
+from src.core.level_codec import encode_levels
+from src.core.storage import TradingDataStorage
+
+SYMBOLS = ["BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"]
+DAYS = 30
+LEVELS = 50
+
+def make_blob(rng) -> bytes:
+    asks = np.vstack([50000.0 + np.arange(1, LEVELS + 1) * 0.1, rng.uniform(0.1, 5.0, LEVELS).round(3)])
+    bids = np.vstack([50000.0 - np.arange(LEVELS) * 0.1, rng.uniform(0.1, 5.0, LEVELS).round(3)])
+    return encode_levels(asks, bids)
+
+def generate_rows(n_rows: int, start: datetime):
+    rng = np.random.default_rng(0)
+    blobs = [make_blob(rng) for _ in range(64)]
+    step_ns = DAYS * 86400 * 10**9 // n_rows
+    start_ns = int(start.timestamp()) * 10**9
+    for i in range(n_rows):
+        yield start_ns + i * step_ns, SYMBOLS[i % len(SYMBOLS)], 50000.0 + (i % 1000) * 0.1, blobs[i % 64]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--backend", choices=["memmap", "parquet"], default=None)
+    parser.add_argument("--dir", type=str, default=None)
+    args = parser.parse_args()
+
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=DAYS)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_path = Path(tmp) / "trading.db"
+        archive = TickArchive(str(Path(tmp) / "archive"), backend=args.backend, flush_rows=100_000)
+        print(f"Building {args.rows:,} rows over {DAYS} days ({archive.backend} archive)...")
+        TradingDataStorage(str(db_path)).close()
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO orderbook_snapshots VALUES (?, 'okx', ?, ?, 0.1, 10.0, 20.0, ?)",
+            generate_rows(args.rows, start)
+        )
+        conn.commit()
+        conn.close()
+        for ts, symbol, mid, blob in generate_rows(args.rows, start):
+            archive.append(symbol, ts, mid, 0.1, 10.0, 20.0, blob)
+        archive.flush()
+
+        sqlite_storage = TradingDataStorage(str(db_path))
+        archive_storage = TradingDataStorage(str(Path(tmp) / "unused.db"), archive=archive)
+        timings = {}
+        for name, storage, columns in (
+            ("sqlite", sqlite_storage, None),
+            ("sqlite+proj", sqlite_storage, ["timestamp", "spread", "depth"]),
+            ("archive", archive_storage, ["timestamp", "spread", "depth"])
+        ):
+            t0 = time.perf_counter()
+            frame = storage.get_historical_data(start, end, symbol=SYMBOLS[0], columns=columns)['orderbook']
+            timings[name] = ((time.perf_counter() - t0) * 1000, len(frame))
+        sqlite_storage.close()
+        archive_storage.close()
+
+    print(f"{'source':>12} {'rows':>8} {'load ms':>10}")
+    for name, (ms, rows) in timings.items():
+        print(f"{name:>12} {rows:>8} {ms:>10.1f}")
+    print(f"speedup vs sqlite: {timings['sqlite'][0] / timings['archive'][0]:.0f}x")
+
+if __name__ == "__main__":
+    main()
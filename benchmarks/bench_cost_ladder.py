@@ -0,0 +1,94 @@
+"""
+Cost ladder (order sizes x fee tiers) for many symbols per tick.
+
+Compares one scalar fill/impact/fee evaluation per grid cell with
+CostLadderEngine's single vectorized pass per book, and checks the
+vectorized tick against TradingConfig.max_processing_time.
+
+Usage: python -m benchmarks.bench_cost_ladder [--symbols N] [--levels N] [--ticks N]
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.config.settings import TradingConfig
+from src.core.orderbook_processor import ArrayOrderBook
+from src.models.cost_ladder import CostLadderEngine
+from src.models.fill_simulator import FillSimulator
+from src.models.market_impact import AlmgrenChrissModel, MarketImpactParams
+
+def make_book(symbol: str, levels: int, rng: np.random.Generator) -> ArrayOrderBook:
+    mid = float(rng.uniform(1, 50000))
+    steps = np.cumsum(rng.uniform(0.5, 2.0, levels)) * mid / 1e5
+    return ArrayOrderBook(
+        timestamp=datetime.now(),
+        exchange="OKX",
+        symbol=symbol,
+        ask_levels=np.vstack([mid + steps, rng.uniform(1, 50, levels) * 1e4 / mid]),
+        bid_levels=np.vstack([mid - steps, rng.uniform(1, 50, levels) * 1e4 / mid])
+    )
+
+def scalar_ladder(book: ArrayOrderBook, config: TradingConfig, sigma: float):
+    """One fill walk, impact model and fee per (size, tier) cell"""
+    cells = []
+    for quantity in config.cost_ladder_quantities:
+        for rate in config.fee_tiers.values():
+            fill = FillSimulator(book).simulate(quantity, unit="quote")
+            base_quantity = quantity / book.mid_price
+            impact = AlmgrenChrissModel(MarketImpactParams(
+                eta=config.market_impact_eta, gamma=config.market_impact_gamma, sigma=sigma,
+                tau=config.time_horizon, initial_price=book.mid_price, total_quantity=base_quantity
+            )).calculate_market_impact(base_quantity, config.time_horizon)
+            cells.append(quantity * (fill.slippage_bps + impact) / 10000 + quantity * rate)
+    return cells
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--levels", type=int, default=400)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    config = TradingConfig()
+    rng = np.random.default_rng(42)
+    symbols = [f"SYM{i}-USDT-SWAP" for i in range(args.symbols)]
+    engine = CostLadderEngine.from_config(config)
+    cells = len(config.cost_ladder_quantities) * len(config.fee_tiers)
+
+    def tick_books():
+        # Fresh book objects per tick, so no cached liquidity carries over
+        return [make_book(symbol, args.levels, rng) for symbol in symbols]
+
+    scalar_ms = []
+    for _ in range(max(args.ticks // 5, 1)):
+        books = tick_books()
+        start = time.perf_counter()
+        for book in books:
+            scalar_ladder(book, config, config.default_volatility)
+        scalar_ms.append((time.perf_counter() - start) * 1000)
+
+    ladder_ms = []
+    for _ in range(args.ticks):
+        books = tick_books()
+        start = time.perf_counter()
+        for book in books:
+            engine.compute(book, config.default_volatility, 0.5)
+        ladder_ms.append((time.perf_counter() - start) * 1000)
+
+    book = tick_books()[0]
+    expected = np.reshape(scalar_ladder(book, config, config.default_volatility), (-1, len(config.fee_tiers)))
+    assert np.allclose(expected, engine.compute(book, config.default_volatility, 0.5).net_cost)
+
+    print(f"{args.symbols} symbols x {cells} cells ({len(config.cost_ladder_quantities)} sizes x "
+          f"{len(config.fee_tiers)} tiers), {args.levels} levels per side")
+    print(f"{'method':>8} {'ms/tick p50':>12} {'ms/tick max':>12}")
+    for name, samples in (("scalar", scalar_ms), ("ladder", ladder_ms)):
+        print(f"{name:>8} {np.median(samples):>12.2f} {np.max(samples):>12.2f}")
+    print(f"speedup: {np.median(scalar_ms) / np.median(ladder_ms):.1f}x, "
+          f"budget {config.max_processing_time:.0f} ms: "
+          f"{'ok' if np.max(ladder_ms) < config.max_processing_time else 'exceeded'}")
+
+if __name__ == "__main__":
+    main()
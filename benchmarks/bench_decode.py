@@ -0,0 +1,64 @@
+"""
+Per-message decode benchmark for the WebSocket hot loop.
+
+Compares the baseline path (json.loads + one OrderBookLevel per level +
+fromisoformat) against MessageDecoder at 50, 400 and full-depth books.
+
+Usage: python -m benchmarks.bench_decode [--iterations N]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+from src.core.decoder import MessageDecoder, available_backends
+from src.core.orderbook_processor import OrderBookLevel
+
+DEPTHS = {"50": 50, "400": 400, "full": 5000}
+
+def make_frame(depth: int) -> str:
+    asks = [[f"{50000.0 + i * 0.1:.1f}", f"{0.5 + (i % 13) * 0.137:.3f}"] for i in range(depth)]
+    bids = [[f"{49999.9 - i * 0.1:.1f}", f"{0.5 + (i % 11) * 0.173:.3f}"] for i in range(depth)]
+    return json.dumps({
+        "timestamp": "2025-05-04T10:39:13.123Z",
+        "exchange": "OKX",
+        "symbol": "BTC-USDT-SWAP",
+        "asks": asks,
+        "bids": bids
+    })
+
+def baseline_decode(frame: str):
+    message = json.loads(frame)
+    datetime.fromisoformat(message["timestamp"].replace("Z", "+00:00"))
+    asks = [OrderBookLevel(float(price), float(qty)) for price, qty in message["asks"]]
+    bids = [OrderBookLevel(float(price), float(qty)) for price, qty in message["bids"]]
+    return asks, bids
+
+def time_per_message(fn, frame: str, iterations: int, repeat: int = 5) -> float:
+    """Best-of-``repeat`` mean time per call in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn(frame)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'depth':>6} {'decoder':>10} {'us/msg':>10} {'speedup':>8}")
+    for label, depth in DEPTHS.items():
+        frame = make_frame(depth)
+        iterations = max(20, args.iterations * 50 // depth)
+        base = time_per_message(baseline_decode, frame, iterations)
+        print(f"{label:>6} {'baseline':>10} {base:>10.1f} {1.0:>8.2f}")
+        for backend in available_backends():
+            decoder = MessageDecoder(backend)
+            elapsed = time_per_message(decoder.decode_orderbook, frame, iterations)
+            print(f"{label:>6} {backend:>10} {elapsed:>10.1f} {base / elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
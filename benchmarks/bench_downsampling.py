@@ -0,0 +1,60 @@
+"""
+30-day spread chart: every raw row via get_historical_data vs. rollup-backed
+get_aggregated_data at one bucket per pixel.
+
+Usage: python -m benchmarks.bench_downsampling [--rows N] [--pixels W] [--dir PATH]
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.core.storage import TradingDataStorage
+
+DAYS = 30
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--pixels", type=int, default=1600)
+    parser.add_argument("--dir", type=str, default=None)
+    args = parser.parse_args()
+
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=DAYS)
+    step = timedelta(days=DAYS) / args.rows
+    spreads = np.random.default_rng(0).uniform(0.1, 2.0, args.rows)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        storage = TradingDataStorage(str(Path(tmp) / "trading.db"), batch_size=5000)
+        print(f"Writing {args.rows:,} snapshots over {DAYS} days...")
+        t0 = time.perf_counter()
+        for i, spread in enumerate(spreads.tolist()):
+            storage.save_orderbook_snapshot({
+                'timestamp': start + i * step, 'exchange': 'okx', 'symbol': 'BTC-USDT-SWAP',
+                'mid_price': 50000.0, 'spread': spread, 'depth': 10.0, 'volume': 20.0, 'data': {}
+            })
+        storage.flush()
+        write_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        raw = storage.get_historical_data(start, end, columns=['timestamp', 'spread'])['orderbook']
+        raw_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        aggregated = storage.get_aggregated_data('orderbook_snapshots', 'spread', start, end,
+                                                 max_points=args.pixels)
+        aggregated_ms = (time.perf_counter() - t0) * 1000
+        storage.close()
+
+    print(f"write incl. rollups: {args.rows / write_s:,.0f} rows/s")
+    print(f"{'query':>12} {'points':>8} {'ms':>10}")
+    print(f"{'raw':>12} {len(raw):>8} {raw_ms:>10.1f}")
+    print(f"{'aggregated':>12} {len(aggregated):>8} {aggregated_ms:>10.1f}")
+    print(f"speedup: {raw_ms / aggregated_ms:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Market order fill simulation: per-order Python depth walk vs FillSimulator.
+
+Walks a synthetic book for a ladder of order sizes, once per size with a
+loop over the levels and once as a single prefix-sum/searchsorted batch.
+
+Usage: python -m benchmarks.bench_fill [--levels N] [--sizes N] [--repeat N]
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.core.orderbook_processor import ArrayOrderBook
+from src.models.fill_simulator import FillSimulator
+
+def make_book(levels: int, rng: np.random.Generator) -> ArrayOrderBook:
+    steps = np.cumsum(rng.uniform(0.1, 1.0, levels))
+    return ArrayOrderBook(
+        timestamp=datetime.now(),
+        exchange="OKX",
+        symbol="BTC-USDT-SWAP",
+        ask_levels=np.vstack([50000.5 + steps, rng.uniform(0.01, 5.0, levels)]),
+        bid_levels=np.vstack([49999.5 - steps, rng.uniform(0.01, 5.0, levels)])
+    )
+
+def walk(asks, quantity: float) -> float:
+    """Reference per-order walk; returns the VWAP"""
+    remaining, notional = quantity, 0.0
+    for price, size in asks:
+        take = min(remaining, size)
+        notional += take * price
+        remaining -= take
+        if remaining <= 0:
+            break
+    return notional / (quantity - remaining)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", type=int, default=400)
+    parser.add_argument("--sizes", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    book = make_book(args.levels, rng)
+    sizes = np.linspace(0.1, book.ask_levels[1].sum() * 0.9, args.sizes)
+    asks = [(level.price, level.quantity) for level in book.asks]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        loop_vwap = [walk(asks, size) for size in sizes]
+    loop_us = (time.perf_counter() - start) / args.repeat * 1e6
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        batch = FillSimulator(book).simulate_batch(sizes)
+    batch_us = (time.perf_counter() - start) / args.repeat * 1e6
+
+    assert np.allclose(loop_vwap, batch.vwap)
+    print(f"{'method':>8} {'us/book':>10} {'us/order':>10}")
+    print(f"{'loop':>8} {loop_us:>10.1f} {loop_us / args.sizes:>10.2f}")
+    print(f"{'batch':>8} {batch_us:>10.1f} {batch_us / args.sizes:>10.2f}")
+    print(f"speedup: {loop_us / batch_us:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Cold import time of the engine, core and model modules against a budget,
+each measured in a fresh interpreter with ``-X importtime``.
+
+Usage: python -m benchmarks.bench_import_time [--repeat N]
+Exits non-zero when a module is over budget.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative import time budgets in ms, including numpy and the src package
+BUDGETS_MS = {
+    "src.core.storage": 300,
+    "src.core.archive": 250,
+    "src.core.connection_manager": 300,
+    "src.models.slippage": 250,
+    "src.models.maker_taker": 250,
+    "src.models.market_impact": 250,
+    "src.engine": 500
+}
+
+def import_time_ms(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    for line in reversed(result.stderr.splitlines()):
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'module':>28} {'best ms':>9} {'budget':>8}")
+    for module, budget in BUDGETS_MS.items():
+        best = min(import_time_ms(module) for _ in range(args.repeat))
+        flag = "" if best <= budget else "  OVER"
+        print(f"{module:>28} {best:>9.1f} {budget:>8}{flag}")
+        if best > budget:
+            over_budget.append(module)
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Size and encode/decode throughput of orderbook level payloads: JSON text
+(the legacy ``data`` column) vs. the binary level codec.
+
+Usage: python -m benchmarks.bench_level_codec [--depth N]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.core.level_codec import decode_levels, encode_levels
+
+def make_book(depth: int):
+    rng = np.random.default_rng(0)
+    asks = [[f"{50000.1 + i * 0.1:.1f}", f"{rng.uniform(0.001, 5):.3f}"] for i in range(depth)]
+    bids = [[f"{50000.0 - i * 0.1:.1f}", f"{rng.uniform(0.001, 5):.3f}"] for i in range(depth)]
+    return asks, bids
+
+def best_time_us(fn, iterations: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=400)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    asks, bids = make_book(args.depth)
+    ask_levels = np.array(asks, dtype=np.float64).T.copy()
+    bid_levels = np.array(bids, dtype=np.float64).T.copy()
+
+    variants = {
+        "json": (
+            lambda: json.dumps({"asks": asks, "bids": bids}),
+            lambda blob: [np.array(side, dtype=np.float64) for side in json.loads(blob).values()]
+        ),
+        "raw": (
+            lambda: encode_levels(ask_levels, bid_levels, delta=False, compress=False),
+            decode_levels
+        ),
+        "delta": (
+            lambda: encode_levels(ask_levels, bid_levels, delta=True, compress=False),
+            decode_levels
+        ),
+        "delta+zlib": (
+            lambda: encode_levels(ask_levels, bid_levels, delta=True, compress=True),
+            decode_levels
+        )
+    }
+
+    print(f"depth={args.depth} per side")
+    print(f"{'format':>12} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for name, (encode, decode) in variants.items():
+        blob = encode()
+        encode_us = best_time_us(encode, args.iterations)
+        decode_us = best_time_us(lambda: decode(blob), args.iterations)
+        print(f"{name:>12} {len(blob):>8} {encode_us:>10.1f} {decode_us:>10.1f}")
+
+if __name__ == "__main__":
+    main()
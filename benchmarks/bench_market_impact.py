@@ -0,0 +1,41 @@
+"""
+Vectorized Almgren-Chriss cost surface vs. the scalar per-point loop.
+
+Usage: python -m benchmarks.bench_market_impact
+"""
+import time
+
+import numpy as np
+
+from src.models.market_impact import AlmgrenChrissModel, MarketImpactParams
+
+GRIDS = [(20, 10, 5), (100, 20, 10), (200, 50, 10)]
+
+def main():
+    model = AlmgrenChrissModel(MarketImpactParams(
+        eta=0.1, gamma=0.1, sigma=0.02, tau=1.0, initial_price=50000.0, total_quantity=1.0
+    ))
+    print(f"{'points':>8} {'scalar ms':>10} {'batch ms':>10} {'speedup':>8}")
+    for n_q, n_t, n_s in GRIDS:
+        quantities = np.linspace(0.01, 10, n_q)
+        horizons = np.linspace(0.1, 8, n_t)
+        sigmas = np.linspace(0.005, 0.05, n_s)
+
+        start = time.perf_counter()
+        for sigma in sigmas:
+            model.params.sigma = sigma
+            for quantity in quantities:
+                for horizon in horizons:
+                    model.calculate_market_impact(quantity, horizon)
+                    model.estimate_execution_cost(quantity, horizon)
+        scalar = (time.perf_counter() - start) * 1000
+        model.params.sigma = 0.02
+
+        start = time.perf_counter()
+        model.cost_surface(quantities, horizons, sigmas)
+        batch = (time.perf_counter() - start) * 1000
+
+        print(f"{n_q * n_t * n_s:>8} {scalar:>10.2f} {batch:>10.3f} {scalar / batch:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Offline pipeline throughput: a synthetic 50-level capture replayed as fast
+as possible through the processors alone and through the full engine.
+
+Usage: python -m benchmarks.bench_replay [--messages N] [--levels L] [--symbols S]
+"""
+import argparse
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.config.settings import TradingConfig
+from src.core.connection_manager import ConnectionManager, StreamSpec
+from src.core.replay import Replayer, iter_capture_file, write_capture_file
+from src.engine import SimulationEngine
+
+def generate_frames(n_messages: int, n_levels: int, symbols):
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 3, 20, tzinfo=timezone.utc)
+    for i in range(n_messages):
+        mid = 50000.0 + rng.normal()
+        ask_qty = rng.uniform(0.01, 5.0, n_levels)
+        bid_qty = rng.uniform(0.01, 5.0, n_levels)
+        yield {
+            "timestamp": (start + timedelta(milliseconds=10 * i)).isoformat(),
+            "exchange": "okx",
+            "symbol": symbols[i % len(symbols)],
+            "asks": [[f"{mid + 0.1 * (k + 1):.1f}", f"{q:.4f}"] for k, q in enumerate(ask_qty)],
+            "bids": [[f"{mid - 0.1 * k:.1f}", f"{q:.4f}"] for k, q in enumerate(bid_qty)]
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--levels", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=5)
+    args = parser.parse_args()
+    symbols = [f"SYM{i}-USDT" for i in range(args.symbols)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = str(Path(tmp) / "capture.jsonl")
+        write_capture_file(capture, generate_frames(args.messages, args.levels, symbols))
+
+        manager = ConnectionManager([StreamSpec("okx", symbol, "wss://replay") for symbol in symbols])
+        manager.set_callback(lambda stream, orderbook: None)
+        processors = asyncio.run(Replayer(manager).run(iter_capture_file(capture)))
+
+        engine = SimulationEngine(TradingConfig(symbols=symbols))
+        full = asyncio.run(engine.replay(iter_capture_file(capture)))
+
+    print(f"{'pipeline':>12} {'messages':>9} {'msg/s':>10} {'us/msg':>8}")
+    for name, stats in (("processors", processors), ("engine", full)):
+        print(f"{name:>12} {stats.messages:>9} {stats.messages_per_second:>10.0f} "
+              f"{1e6 / stats.messages_per_second:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Throughput of the symbol-sharded engine against the single-process engine.
+
+Raw 50-level frames for several symbols are pushed through the full
+pipeline (decode, book, models); the sharded runs forward them to 1..N
+worker processes. Scaling is bounded by the cores available.
+
+Usage: python -m benchmarks.bench_sharding [--messages N] [--symbols S] [--workers 1 2 4]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from src.config.settings import TradingConfig
+from src.core.decoder import MessageDecoder
+from src.engine import SimulationEngine
+from src.sharding import ShardedEngine
+
+from .bench_replay import generate_frames
+
+async def run_single(config: TradingConfig, frames) -> float:
+    engine = SimulationEngine(config, record_orderbooks=False)
+    decoder = MessageDecoder()
+    start = time.perf_counter()
+    for symbol, frame in frames:
+        stream = engine.connections.streams[(config.exchange, symbol)]
+        await engine.connections.dispatch(stream, decoder.loads(frame), record_latency=False)
+    return len(frames) / (time.perf_counter() - start)
+
+async def run_sharded(config: TradingConfig, frames, workers: int) -> float:
+    engine = ShardedEngine(config, workers=workers)
+    received = 0
+
+    def count(metrics):
+        nonlocal received
+        received += 1
+
+    engine.subscribe(count)
+    engine.start_workers()
+    # Wait out process start-up before timing
+    for frame in generate_frames(len(config.symbols), 1, config.symbols):
+        await engine.submit(frame["symbol"], json.dumps(frame))
+    while received < len(config.symbols):
+        await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    for symbol, frame in frames:
+        await engine.submit(symbol, frame)
+    await engine.close()
+    return len(frames) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--levels", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}-USDT-SWAP" for i in range(args.symbols)]
+    config = TradingConfig(symbols=symbols)
+    frames = [(frame["symbol"], json.dumps(frame).encode())
+              for frame in generate_frames(args.messages, args.levels, symbols)]
+
+    print(f"{args.messages} frames, {args.symbols} symbols, {args.levels} levels, {os.cpu_count()} CPUs")
+    print(f"{'mode':>12} {'msg/s':>10}")
+    single = asyncio.run(run_single(config, frames))
+    print(f"{'single':>12} {single:>10.0f}")
+    for workers in args.workers:
+        rate = asyncio.run(run_sharded(config, frames, workers))
+        print(f"{f'{workers} workers':>12} {rate:>10.0f}  ({rate / single:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Prediction latency of SlippageEstimator as history grows.
+
+The batch mode refits QuantileRegressor over the retained history on every
+prediction; the online mode should stay flat up to 1M updates.
+
+Usage: python -m benchmarks.bench_slippage [--updates N]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.models.slippage import OrderBookLevel, SlippageEstimator
+
+def random_levels(rng: np.random.Generator):
+    mid = 50000.0 + rng.normal(0, 10)
+    return [
+        OrderBookLevel(mid - 0.5, float(rng.uniform(0.1, 5))),
+        OrderBookLevel(mid + 0.5 + rng.exponential(1.0), float(rng.uniform(0.1, 5)))
+    ]
+
+def predict_latency_us(estimator: SlippageEstimator, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        estimator.predict_slippage(2.5)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def run(mode: str, checkpoints, repeat: int, max_history: int):
+    rng = np.random.default_rng(42)
+    estimator = SlippageEstimator(mode=mode, max_history=max_history)
+    updates = 0
+    for checkpoint in checkpoints:
+        while updates < checkpoint:
+            estimator.update(random_levels(rng), 1.0)
+            updates += 1
+        print(f"{mode:>7} {updates:>9} {predict_latency_us(estimator, repeat):>14.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'mode':>7} {'updates':>9} {'predict us':>14}")
+    run("batch", [100, 1_000, 5_000], repeat=3, max_history=10_000)
+    checkpoints = [c for c in (1_000, 10_000, 100_000, 1_000_000) if c <= args.updates]
+    run("online", checkpoints, repeat=10_000, max_history=10_000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+1-hour historical query over a 30-day database: legacy TEXT timestamps with
+no index vs. the indexed epoch-nanosecond schema.
+
+Usage: python -m benchmarks.bench_storage_query [--rows N] [--dir PATH]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.core.storage import TradingDataStorage
+
+SYMBOLS = ["BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"]
+DAYS = 30
+
+def generate_rows(n_rows: int, start: datetime):
+    rng = np.random.default_rng(0)
+    offsets_ns = np.sort(rng.integers(0, DAYS * 86400 * 10**9, n_rows))
+    start_ns = int(start.timestamp()) * 10**9
+    for i, offset in enumerate(offsets_ns.tolist()):
+        yield start_ns + offset, SYMBOLS[i % len(SYMBOLS)], 50000.0 + (i % 1000) * 0.1
+
+def build_legacy(path: Path, n_rows: int, start: datetime):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE orderbook_snapshots (timestamp TEXT, exchange TEXT, symbol TEXT, "
+                 "mid_price REAL, spread REAL, depth REAL, volume REAL, data TEXT)")
+    conn.executemany(
+        "INSERT INTO orderbook_snapshots VALUES (?, 'okx', ?, ?, 0.1, 10.0, 20.0, '{}')",
+        (
+            (datetime.fromtimestamp(ts / 1e9, tz=timezone.utc).isoformat(), symbol, mid)
+            for ts, symbol, mid in generate_rows(n_rows, start)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+def build_indexed(path: Path, n_rows: int, start: datetime):
+    TradingDataStorage(str(path)).close()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO orderbook_snapshots VALUES (?, 'okx', ?, ?, 0.1, 10.0, 20.0, '{}')",
+        generate_rows(n_rows, start)
+    )
+    conn.commit()
+    conn.close()
+
+def time_query(conn: sqlite3.Connection, sql: str, params, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--dir", type=str, default=None)
+    args = parser.parse_args()
+
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    window_start = start + timedelta(days=15)
+    window_end = window_start + timedelta(hours=1)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        legacy_path = Path(tmp) / "legacy.db"
+        indexed_path = Path(tmp) / "indexed.db"
+        print(f"Building {args.rows:,} rows over {DAYS} days...")
+        build_legacy(legacy_path, args.rows, start)
+        build_indexed(indexed_path, args.rows, start)
+
+        legacy_ms, legacy_rows = time_query(
+            sqlite3.connect(legacy_path),
+            "SELECT * FROM orderbook_snapshots WHERE timestamp BETWEEN ? AND ? AND symbol = ?",
+            (window_start.isoformat(), window_end.isoformat(), SYMBOLS[0])
+        )
+        indexed_ms, indexed_rows = time_query(
+            sqlite3.connect(indexed_path),
+            "SELECT * FROM orderbook_snapshots WHERE timestamp BETWEEN ? AND ? AND symbol = ?",
+            (int(window_start.timestamp()) * 10**9, int(window_end.timestamp()) * 10**9, SYMBOLS[0])
+        )
+
+    print(f"{'schema':>10} {'rows':>8} {'query ms':>10}")
+    print(f"{'legacy':>10} {legacy_rows:>8} {legacy_ms:>10.2f}")
+    print(f"{'indexed':>10} {indexed_rows:>8} {indexed_ms:>10.2f}")
+    print(f"speedup: {legacy_ms / indexed_ms:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,57 @@
-from dataclasses import dataclass
-from typing import Dict
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
 
 @dataclass
 class TradingConfig:
     # WebSocket settings
     ws_url: str = "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/BTC-USDT-SWAP"
-    ws_reconnect_interval: int = 5  # seconds
+    ws_reconnect_interval: int = 5  # seconds, cap on reconnect backoff
+    ws_reconnect_base_delay: float = 0.1  # seconds, first backoff step
+    ws_min_stable_time: float = 1.0  # seconds up (or first data) before the backoff resets
+    ws_ping_interval: float = 20.0  # seconds
+    ws_stale_timeout: float = 30.0  # seconds without data before reconnecting
+    ws_url_template: str = "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/{exchange}/{symbol}"
+    exchange: str = "okx"
+    symbols: List[str] = field(default_factory=lambda: ["BTC-USDT-SWAP"])
+    max_streams_per_connection: int = 1  # >1 only for venues accepting several subscriptions per socket
+    ingest_queue_size: int = 1000  # messages buffered between reader and pipeline
+    ingest_overflow_policy: str = "block"  # block, drop_oldest or conflate
     
     # Trading parameters
     default_quantity: float = 100.0  # USD
-    default_volatility: float = 0.02
-    fee_tiers: Dict[str, float] = {
+    default_volatility: float = 0.02  # daily
+    live_volatility: bool = False  # estimate sigma from the mid-price stream instead of default_volatility
+    volatility_windows: List[float] = field(default_factory=lambda: [60.0, 300.0, 3600.0])  # seconds
+    volatility_halflives: List[float] = field(default_factory=lambda: [30.0, 300.0])  # seconds, first one drives sigma
+    volatility_tick_rate: float = 10.0  # expected book updates per second, sizes the volatility windows
+    fee_tiers: Dict[str, float] = field(default_factory=lambda: {
         "Tier 1": 0.001,  # 0.1%
         "Tier 2": 0.0008,  # 0.08%
         "Tier 3": 0.0006,  # 0.06%
-    }
+    })
     
     # Model parameters
     market_impact_eta: float = 0.1
     market_impact_gamma: float = 0.1
     time_horizon: float = 1.0  # hours
+    liquidity_levels: List[int] = field(default_factory=lambda: [1, 5, 10])  # imbalance over best N levels
+    liquidity_bands_bps: List[float] = field(default_factory=lambda: [10.0, 25.0, 50.0])  # depth within ±bps of mid
+    
+    # Cost ladder: every size x fee tier per tick, attached to the metrics as 'cost_ladder'
+    cost_ladder_enabled: bool = False
+    cost_ladder_quantities: List[float] = field(default_factory=lambda: [100.0 * 10 ** (i / 4) for i in range(20)])  # USD
     
     # Performance settings
     max_processing_time: float = 100.0  # ms
     performance_window: int = 100  # number of samples to keep
+    worker_processes: int = 1  # >1 shards symbols across processes (headless engine)
+    
+    # UI settings
+    ui_refresh_hz: float = 20.0  # output panel refresh rate, independent of tick rate
+    plot_max_fps: float = 10.0  # upper bound on chart redraws per second
+    plot_buffer_size: int = 5000  # live points kept per chart table
     
     @classmethod
     def load_from_file(cls, filepath: str) -> 'TradingConfig':
@@ -0,0 +1,226 @@
+import importlib.util
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pyarrow is optional (memory-mapped fallback) and, like pandas, only
+# imported once an archive is actually read or written
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+NS_PER_DAY = 86400 * 10**9
+
+# Fixed-width columns and their dtypes; ``data`` holds the encoded book payload
+NUMERIC_COLUMNS = {
+    'timestamp': np.int64,
+    'mid_price': np.float64,
+    'spread': np.float64,
+    'depth': np.float64,
+    'volume': np.float64
+}
+PAYLOAD_COLUMN = 'data'
+ALL_COLUMNS = tuple(NUMERIC_COLUMNS) + (PAYLOAD_COLUMN,)
+
+def _partition_day(timestamp_ns: int) -> str:
+    return datetime.fromtimestamp(timestamp_ns // 10**9, tz=timezone.utc).strftime("%Y-%m-%d")
+
+class TickArchive:
+    """
+    Append-only columnar archive of orderbook ticks partitioned by symbol and
+    UTC day (``root/symbol=X/date=YYYY-MM-DD/``).
+
+    Rows are buffered in memory and written per partition every
+    ``flush_rows`` rows: as Parquet part files when pyarrow is installed,
+    otherwise as raw per-column files read back with ``np.memmap``. Reads
+    prune partitions by day, only touch the requested columns and filter on
+    timestamp (Parquet row-group statistics, or binary search on the sorted
+    memory-mapped timestamp column).
+
+    Rows must be appended in timestamp order per symbol.
+    """
+
+    def __init__(self, root: str, backend: Optional[str] = None, flush_rows: int = 10000):
+        if backend is None:
+            backend = "parquet" if HAS_PYARROW else "memmap"
+        if backend == "parquet" and not HAS_PYARROW:
+            raise ValueError("parquet backend requested but pyarrow is not installed")
+        if backend not in ("parquet", "memmap"):
+            raise ValueError(f"Unknown archive backend: {backend}")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+        self.flush_rows = flush_rows
+        self._buffers: Dict[Tuple[str, str], Dict[str, list]] = {}
+        self._buffered_rows = 0
+        self._lock = threading.RLock()
+
+    def _partition_path(self, symbol: str, day: str) -> Path:
+        return self.root / f"symbol={symbol}" / f"date={day}"
+
+    def append(self,
+               symbol: str,
+               timestamp_ns: int,
+               mid_price: float,
+               spread: float,
+               depth: float,
+               volume: float,
+               data: Optional[bytes] = None):
+        """Buffer one tick; partitions are written every ``flush_rows`` rows"""
+        key = (symbol, _partition_day(timestamp_ns))
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = {column: [] for column in ALL_COLUMNS}
+            buffer['timestamp'].append(timestamp_ns)
+            buffer['mid_price'].append(mid_price)
+            buffer['spread'].append(spread)
+            buffer['depth'].append(depth)
+            buffer['volume'].append(volume)
+            buffer[PAYLOAD_COLUMN].append(data or b"")
+            self._buffered_rows += 1
+            if self._buffered_rows >= self.flush_rows:
+                self.flush()
+
+    def flush(self):
+        """Write all buffered rows to their partitions"""
+        with self._lock:
+            for (symbol, day), buffer in self._buffers.items():
+                path = self._partition_path(symbol, day)
+                path.mkdir(parents=True, exist_ok=True)
+                if self.backend == "parquet":
+                    self._write_parquet(path, buffer)
+                else:
+                    self._write_memmap(path, buffer)
+            self._buffers.clear()
+            self._buffered_rows = 0
+
+    def _write_parquet(self, path: Path, buffer: Dict[str, list]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        arrays = {
+            column: pa.array(np.asarray(buffer[column], dtype=dtype))
+            for column, dtype in NUMERIC_COLUMNS.items()
+        }
+        arrays[PAYLOAD_COLUMN] = pa.array(buffer[PAYLOAD_COLUMN], type=pa.binary())
+        part = len(list(path.glob("part-*.parquet")))
+        pq.write_table(pa.table(arrays), path / f"part-{part:06d}.parquet")
+
+    def _write_memmap(self, path: Path, buffer: Dict[str, list]):
+        for column, dtype in NUMERIC_COLUMNS.items():
+            with open(path / f"{column}.bin", "ab") as f:
+                f.write(np.asarray(buffer[column], dtype=dtype).tobytes())
+
+        payloads = buffer[PAYLOAD_COLUMN]
+        data_file = path / f"{PAYLOAD_COLUMN}.bin"
+        base = data_file.stat().st_size if data_file.exists() else 0
+        ends = base + np.cumsum([len(payload) for payload in payloads], dtype=np.int64)
+        with open(data_file, "ab") as f:
+            f.write(b"".join(payloads))
+        with open(path / f"{PAYLOAD_COLUMN}.offsets", "ab") as f:
+            f.write(ends.tobytes())
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            buffered = {symbol for symbol, _ in self._buffers}
+        stored = {p.name.split("=", 1)[1] for p in self.root.glob("symbol=*")}
+        return sorted(stored | buffered)
+
+    def _days(self, symbol: str, start_ns: int, end_ns: int) -> List[str]:
+        first, last = _partition_day(start_ns), _partition_day(end_ns)
+        days = [
+            p.name.split("=", 1)[1]
+            for p in (self.root / f"symbol={symbol}").glob("date=*")
+        ]
+        return sorted(day for day in days if first <= day <= last)
+
+    def read(self,
+             symbol: str,
+             start_ns: int,
+             end_ns: int,
+             columns: Optional[Sequence[str]] = None) -> 'pd.DataFrame':
+        """
+        Load ``columns`` (default: every numeric column, no payload) for
+        ``start_ns <= timestamp <= end_ns``.
+        """
+        import pandas as pd
+        columns = list(columns or NUMERIC_COLUMNS)
+        unknown = set(columns) - set(ALL_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown archive columns: {sorted(unknown)}")
+        read_columns = columns if 'timestamp' in columns else ['timestamp'] + columns
+
+        frames = []
+        for day in self._days(symbol, start_ns, end_ns):
+            path = self._partition_path(symbol, day)
+            if self.backend == "parquet":
+                frames.append(self._read_parquet(path, start_ns, end_ns, read_columns))
+            else:
+                frames.append(self._read_memmap(path, start_ns, end_ns, read_columns))
+        frames.append(self._read_buffered(symbol, start_ns, end_ns, read_columns))
+
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame({column: pd.Series(dtype=NUMERIC_COLUMNS.get(column, object))
+                                 for column in columns})
+        return pd.concat(frames, ignore_index=True)[columns]
+
+    def _read_parquet(self, path: Path, start_ns: int, end_ns: int, columns: List[str]) -> 'pd.DataFrame':
+        import pandas as pd
+        import pyarrow.parquet as pq
+        files = sorted(path.glob("part-*.parquet"))
+        if not files:
+            return pd.DataFrame(columns=columns)
+        table = pq.read_table(
+            [str(f) for f in files],
+            columns=columns,
+            filters=[('timestamp', '>=', start_ns), ('timestamp', '<=', end_ns)]
+        )
+        return table.to_pandas()
+
+    def _read_memmap(self, path: Path, start_ns: int, end_ns: int, columns: List[str]) -> 'pd.DataFrame':
+        import pandas as pd
+        timestamp_file = path / "timestamp.bin"
+        if not timestamp_file.exists() or timestamp_file.stat().st_size == 0:
+            return pd.DataFrame(columns=columns)
+        timestamps = np.memmap(timestamp_file, dtype=np.int64, mode='r')
+        lo = int(np.searchsorted(timestamps, start_ns, side='left'))
+        hi = int(np.searchsorted(timestamps, end_ns, side='right'))
+
+        result: Dict[str, Any] = {}
+        for column in columns:
+            if column == PAYLOAD_COLUMN:
+                result[column] = self._read_payloads(path, lo, hi)
+            else:
+                values = np.memmap(path / f"{column}.bin", dtype=NUMERIC_COLUMNS[column], mode='r')
+                result[column] = np.array(values[lo:hi])
+        return pd.DataFrame(result)
+
+    @staticmethod
+    def _read_payloads(path: Path, lo: int, hi: int) -> List[bytes]:
+        if hi <= lo:
+            return []
+        ends = np.memmap(path / f"{PAYLOAD_COLUMN}.offsets", dtype=np.int64, mode='r')
+        data = np.memmap(path / f"{PAYLOAD_COLUMN}.bin", dtype=np.uint8, mode='r')
+        starts = [int(ends[lo - 1]) if lo else 0] + ends[lo:hi - 1].tolist()
+        return [data[s:e].tobytes() for s, e in zip(starts, ends[lo:hi].tolist())]
+
+    def _read_buffered(self, symbol: str, start_ns: int, end_ns: int, columns: List[str]) -> 'pd.DataFrame':
+        import pandas as pd
+        with self._lock:
+            buffers = [
+                {column: list(buffer[column]) for column in columns}
+                for (buffered_symbol, _), buffer in self._buffers.items()
+                if buffered_symbol == symbol
+            ]
+        frames = []
+        for buffer in buffers:
+            frame = pd.DataFrame(buffer)
+            frames.append(frame[(frame['timestamp'] >= start_ns) & (frame['timestamp'] <= end_ns)])
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,277 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .orderbook_processor import OrderBookProcessor
+from .websocket_client import WebSocketClient
+
+StreamKey = Tuple[str, str]  # (exchange, symbol)
+
+RECONNECT = "reconnect"  # resync reason when the connection itself was replaced
+
+@dataclass
+class StreamSpec:
+    exchange: str
+    symbol: str
+    url: str
+    subscription: Optional[Dict[str, Any]] = None  # sent on connect, if the venue needs one
+
+    @property
+    def key(self) -> StreamKey:
+        return (self.exchange, self.symbol)
+
+class StreamStats:
+    """Message rate and feed latency for a single symbol stream"""
+
+    def __init__(self, window_size: int = 100):
+        self.messages = 0
+        self.errors = 0
+        self.latency: Deque[float] = deque(maxlen=window_size)
+        self.arrivals: Deque[float] = deque(maxlen=window_size)
+
+    def record(self, latency_ms: Optional[float]):
+        self.messages += 1
+        self.arrivals.append(time.monotonic())
+        if latency_ms is not None:
+            self.latency.append(latency_ms)
+
+    def to_dict(self) -> Dict[str, float]:
+        rate = 0.0
+        if len(self.arrivals) > 1:
+            elapsed = self.arrivals[-1] - self.arrivals[0]
+            rate = (len(self.arrivals) - 1) / elapsed if elapsed > 0 else 0.0
+        return {
+            'messages': self.messages,
+            'errors': self.errors,
+            'messages_per_second': rate,
+            'avg_latency': sum(self.latency) / len(self.latency) if self.latency else 0.0,
+            'max_latency': max(self.latency) if self.latency else 0.0
+        }
+
+def iter_book_messages(data: Dict[str, Any]) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    """
+    Yield ``(symbol, message)`` pairs for every book update in a frame.
+    Handles the flat gomarket layout and native OKX ``{"arg", "data"}``
+    pushes; subscription acks and other control frames yield nothing.
+    """
+    if "arg" in data and "data" in data:
+        symbol = data["arg"].get("instId")
+        action = data.get("action", "snapshot")
+        for entry in data["data"]:
+            message = dict(entry)
+            message["symbol"] = symbol
+            message["action"] = action
+            if "timestamp" not in message and "ts" in message:
+                message["timestamp"] = message["ts"]
+            yield symbol, message
+    elif "asks" in data or "bids" in data:
+        yield data.get("symbol"), data
+
+def default_processor(spec: StreamSpec) -> OrderBookProcessor:
+    """Incremental processor for subscribed (snapshot + delta) streams, columnar otherwise"""
+    if spec.subscription:
+        return OrderBookProcessor(incremental=True)
+    return OrderBookProcessor(columnar=True)
+
+class _RawFrames:
+    """Decoder stand-in that passes frames through untouched"""
+
+    def loads(self, raw):
+        return raw
+
+class ConnectionManager:
+    """
+    Multiplex many symbol streams over a pool of WebSocket connections on one
+    event loop, routing each update to a per-symbol OrderBookProcessor.
+
+    Streams sharing a URL are packed onto one connection, up to
+    ``max_streams_per_connection`` each (venues that take several
+    subscriptions per socket); every other stream gets its own connection.
+    Without a ``processor_factory``, streams with a subscription (native
+    venue feeds, which push snapshot then deltas) get an incremental
+    processor and the others a columnar one for full-book frames. A
+    sequence gap or checksum mismatch on an incremental stream recycles its
+    connection, since the venue only sends a new snapshot on subscribe;
+    delta streams therefore require the lossless ``block`` overflow policy.
+    Extra keyword arguments are passed to each WebSocketClient.
+    """
+
+    def __init__(self,
+                 streams: List[StreamSpec],
+                 max_streams_per_connection: int = 1,
+                 processor_factory: Optional[Callable[[], OrderBookProcessor]] = None,
+                 queue_size: int = 1000,
+                 overflow_policy: str = "block",
+                 performance_analyzer=None,
+                 window_size: int = 100,
+                 **client_kwargs):
+        if overflow_policy == "conflate" and max_streams_per_connection > 1:
+            raise ValueError("Conflation requires one stream per connection")
+        if overflow_policy != "block" and any(spec.subscription for spec in streams):
+            # Discarded deltas leave a sequence gap in every incremental book
+            raise ValueError(f"Subscribed delta streams need the block overflow policy, not {overflow_policy}")
+
+        self.performance_analyzer = performance_analyzer
+        self.logger = logging.getLogger('websocket')
+        self.callback: Optional[Callable] = None
+        self.streams: Dict[StreamKey, StreamSpec] = {}
+        self.processors: Dict[StreamKey, OrderBookProcessor] = {}
+        self.stats: Dict[StreamKey, StreamStats] = {}
+        self.clients: List[WebSocketClient] = []
+        self._groups: List[List[StreamSpec]] = []
+
+        by_url: Dict[str, List[StreamSpec]] = {}
+        for spec in streams:
+            if spec.key in self.streams:
+                raise ValueError(f"Duplicate stream: {spec.exchange}:{spec.symbol}")
+            self.streams[spec.key] = spec
+            self.processors[spec.key] = (processor_factory() if processor_factory
+                                         else default_processor(spec))
+            self.stats[spec.key] = StreamStats(window_size)
+            by_url.setdefault(spec.url, []).append(spec)
+
+        for url, specs in by_url.items():
+            for i in range(0, len(specs), max_streams_per_connection):
+                group = specs[i:i + max_streams_per_connection]
+                client = WebSocketClient(
+                    url,
+                    queue_size=queue_size,
+                    overflow_policy=overflow_policy,
+                    performance_analyzer=performance_analyzer,
+                    subscriptions=[spec.subscription for spec in group if spec.subscription],
+                    on_reconnect=self._make_resync(group),
+                    **client_kwargs
+                )
+                client.set_callback(self._make_router(group))
+                for spec in group:
+                    processor = self.processors[spec.key]
+                    if processor.incremental:
+                        processor.on_resync = self._make_recycle(client, processor.on_resync)
+                self.clients.append(client)
+                self._groups.append(group)
+
+    @classmethod
+    def from_config(cls, config, **kwargs) -> 'ConnectionManager':
+        """Build one stream per configured symbol from a TradingConfig"""
+        streams = [
+            StreamSpec(
+                exchange=config.exchange,
+                symbol=symbol,
+                url=config.ws_url_template.format(exchange=config.exchange, symbol=symbol)
+            )
+            for symbol in config.symbols
+        ]
+        kwargs.setdefault('max_streams_per_connection', config.max_streams_per_connection)
+        kwargs.setdefault('queue_size', config.ingest_queue_size)
+        kwargs.setdefault('overflow_policy', config.ingest_overflow_policy)
+        kwargs.setdefault('reconnect_base_delay', config.ws_reconnect_base_delay)
+        kwargs.setdefault('reconnect_max_delay', config.ws_reconnect_interval)
+        kwargs.setdefault('min_stable_time', config.ws_min_stable_time)
+        kwargs.setdefault('ping_interval', config.ws_ping_interval)
+        kwargs.setdefault('stale_timeout', config.ws_stale_timeout)
+        return cls(streams, **kwargs)
+
+    def set_callback(self, callback: Callable[[StreamSpec, Any], Any]):
+        """Set callback (plain or coroutine) receiving ``(stream, orderbook)``"""
+        self.callback = callback
+
+    def forward_frames(self, callback: Callable[[StreamSpec, Any], Any]):
+        """
+        Hand every raw frame to ``callback(stream, frame)`` undecoded instead
+        of processing it here, e.g. to forward it to another process. Needs
+        one stream per connection so the stream is known without decoding.
+        """
+        if any(len(group) > 1 for group in self._groups):
+            raise ValueError("Forwarding raw frames requires one stream per connection")
+        for client, group in zip(self.clients, self._groups):
+            spec = group[0]
+            client.decoder = _RawFrames()
+            client.set_callback(functools.partial(callback, spec))
+
+    async def start(self):
+        """Run all connections concurrently until closed"""
+        await asyncio.gather(*(client.start() for client in self.clients))
+
+    async def close(self):
+        """Close every connection in the pool"""
+        await asyncio.gather(*(client.close() for client in self.clients))
+
+    def _make_resync(self, specs: List[StreamSpec]) -> Callable[[], None]:
+        def resync():
+            for spec in specs:
+                processor = self.processors[spec.key]
+                if processor.incremental:
+                    processor.request_resync(RECONNECT)
+
+        return resync
+
+    @staticmethod
+    def _make_recycle(client: WebSocketClient,
+                      chained: Optional[Callable[[str], None]]) -> Callable[[str], None]:
+        def on_resync(reason: str):
+            if chained:
+                chained(reason)
+            # A new connection resubscribes and brings its own snapshot
+            if reason != RECONNECT:
+                client.recycle(reason)
+
+        return on_resync
+
+    def _make_router(self, specs: List[StreamSpec]) -> Callable:
+        by_symbol = {spec.symbol: spec for spec in specs}
+        single = specs[0] if len(specs) == 1 else None
+
+        async def route(data: Dict[str, Any]):
+            for symbol, message in iter_book_messages(data):
+                spec = single or (by_symbol.get(symbol) if symbol is not None else None)
+                if spec is None:
+                    continue
+                await self.dispatch(spec, message)
+
+        return route
+
+    async def dispatch(self, spec: StreamSpec, message: Dict[str, Any], record_latency: bool = True) -> bool:
+        """
+        Process one book update for a stream and notify the callback.
+        ``record_latency=False`` skips feed latency (exchange timestamp to
+        now), which is meaningless for replayed messages. Returns False if
+        the processor rejected the message or is waiting for a resync.
+        """
+        message.setdefault("exchange", spec.exchange)
+        message.setdefault("symbol", spec.symbol)
+        stats = self.stats[spec.key]
+        try:
+            orderbook = self.processors[spec.key].process_message(message)
+        except Exception as e:
+            stats.errors += 1
+            self.logger.error(f"Error processing {spec.exchange}:{spec.symbol}: {e}")
+            if self.performance_analyzer:
+                self.performance_analyzer.record_error()
+            return False
+        if orderbook is None:
+            return False
+
+        latency_ms = None
+        if record_latency and orderbook.timestamp is not None:
+            latency_ms = (time.time() - orderbook.timestamp.timestamp()) * 1000
+            if self.performance_analyzer:
+                self.performance_analyzer.record_ws_latency(latency_ms)
+        stats.record(latency_ms)
+
+        if self.callback:
+            result = self.callback(spec, orderbook)
+            if inspect.isawaitable(result):
+                await result
+        return True
+
+    def get_stream_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stream message rate and latency keyed by ``exchange:symbol``"""
+        return {
+            f"{exchange}:{symbol}": stats.to_dict()
+            for (exchange, symbol), stats in self.stats.items()
+        }
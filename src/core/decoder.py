@@ -0,0 +1,110 @@
+import json
+import sys
+from datetime import datetime, timezone
+from itertools import chain
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Protocol, Sequence, Union
+import numpy as np
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # optional faster JSON backend
+    orjson = None
+
+# Python 3.11+ parses the trailing "Z" natively, skipping a string copy per message
+_NATIVE_ZULU = sys.version_info >= (3, 11)
+
+def available_backends() -> list:
+    """List JSON backends usable in this environment, fastest first"""
+    return (["orjson"] if orjson is not None else []) + ["json"]
+
+def parse_levels(levels: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    Parse ``[[price, qty, ...], ...]`` string entries into a contiguous
+    (2, n) float64 array in a single pass over the strings.
+    Row 0 holds prices and row 1 quantities.
+    """
+    n = len(levels)
+    if n == 0:
+        return np.empty((2, 0), dtype=np.float64)
+    width = len(levels[0])
+    flat = np.fromiter(
+        map(float, chain.from_iterable(levels)),
+        dtype=np.float64,
+        count=n * width
+    )
+    return np.ascontiguousarray(flat.reshape(n, width)[:, :2].T)
+
+class TimestampParser:
+    """
+    ISO-8601 / epoch-millisecond timestamp parser.
+
+    Consecutive messages frequently carry the same timestamp (deltas in the
+    same millisecond, several symbols in one frame), so the last result is
+    reused when the input repeats.
+    """
+
+    def __init__(self):
+        self._last_raw: Optional[Union[str, int, float]] = None
+        self._last_value: Optional[datetime] = None
+
+    def __call__(self, raw: Union[str, int, float, datetime]) -> datetime:
+        if raw == self._last_raw and self._last_value is not None:
+            return self._last_value
+        if isinstance(raw, datetime):
+            return raw
+
+        if isinstance(raw, str) and not raw.isdigit():
+            value = datetime.fromisoformat(raw if _NATIVE_ZULU else raw.replace("Z", "+00:00"))
+        else:
+            value = datetime.fromtimestamp(int(raw) / 1000, tz=timezone.utc)
+
+        self._last_raw = raw
+        self._last_value = value
+        return value
+
+class FrameDecoder(Protocol):
+    """What WebSocketClient needs from a decoder: raw frame in, message out"""
+
+    def loads(self, raw: Union[str, bytes]) -> Any: ...
+
+class MessageDecoder:
+    """Pluggable JSON decoder for the WebSocket hot loop"""
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        ``backend`` is ``"orjson"`` or ``"json"``; by default the fastest
+        installed backend is used.
+        """
+        if backend is None:
+            backend = available_backends()[0]
+        self._loads: Callable[[Union[str, bytes]], Any]
+        if backend == "orjson":
+            if orjson is None:
+                raise ValueError("orjson backend requested but orjson is not installed")
+            self._loads = orjson.loads
+        elif backend == "json":
+            self._loads = json.loads
+        else:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        self.backend = backend
+        self.parse_timestamp = TimestampParser()
+
+    def loads(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        """Decode a raw WebSocket frame"""
+        return self._loads(raw)
+
+    def decode_orderbook(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Decode a frame and convert its book fields in place: ``asks``/``bids``
+        become (2, n) float64 arrays and ``timestamp`` a datetime.
+        """
+        message = self._loads(raw)
+        if "asks" in message:
+            message["asks"] = parse_levels(message["asks"])
+        if "bids" in message:
+            message["bids"] = parse_levels(message["bids"])
+        if "timestamp" in message:
+            message["timestamp"] = self.parse_timestamp(message["timestamp"])
+        return message
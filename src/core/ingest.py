@@ -0,0 +1,143 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "conflate")
+
+class _Control:
+    """Queued control item; unique by identity, so it also serves as its own conflation key"""
+    __slots__ = ("item",)
+
+    def __init__(self, item: Any):
+        self.item = item
+
+class IngestQueue:
+    """
+    Bounded queue between the WebSocket reader and the processing pipeline.
+
+    Overflow policies:
+        block       -- the producer waits for free space (lossless backpressure)
+        drop_oldest -- the oldest queued message is discarded to make room
+        conflate    -- a pending message with the same key is replaced by the
+                       newer one, keeping only the latest book per symbol;
+                       only safe for full-snapshot feeds, not delta streams
+
+    Control items (``put_control``) keep their place in the queue but are
+    exempt from the bound and the policy: never blocked on, dropped or
+    conflated.
+    """
+
+    def __init__(self,
+                 maxsize: int = 1000,
+                 policy: str = "block",
+                 key_func: Optional[Callable[[Any], Hashable]] = None,
+                 performance_analyzer=None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key_func = key_func or (lambda item: None)
+        self.performance_analyzer = performance_analyzer
+        self.dropped = 0
+        self.conflated = 0
+        self._keys: Deque[Hashable] = deque()
+        self._items: Dict[Hashable, Any] = {}
+        self._fifo: Deque[Any] = deque()
+        self._controls = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def qsize(self) -> int:
+        """Queued items counted against ``maxsize``, i.e. excluding controls"""
+        return (len(self._keys) if self.policy == "conflate" else len(self._fifo)) - self._controls
+
+    def full(self) -> bool:
+        return self.qsize() >= self.maxsize
+
+    def empty(self) -> bool:
+        return self.qsize() == 0 and not self._controls
+
+    async def put(self, item: Any):
+        """Enqueue an item, applying the overflow policy when full"""
+        if self.policy == "block":
+            while self.full():
+                self._not_full.clear()
+                await self._not_full.wait()
+        self.put_nowait(item)
+
+    def put_nowait(self, item: Any):
+        if self.policy == "conflate":
+            key = self.key_func(item)
+            if key in self._items:
+                self._items[key] = item
+                self._record_conflated()
+                return
+            if self.full():
+                del self._items[self._pop_oldest(self._keys)]
+                self._record_dropped()
+            self._keys.append(key)
+            self._items[key] = item
+        else:
+            if self.full():
+                if self.policy == "block":
+                    raise asyncio.QueueFull
+                self._pop_oldest(self._fifo)
+                self._record_dropped()
+            self._fifo.append(item)
+        self._not_empty.set()
+
+    def put_control(self, item: Any):
+        """Enqueue an item behind those already queued that is never dropped or conflated"""
+        control = _Control(item)
+        if self.policy == "conflate":
+            self._keys.append(control)
+            self._items[control] = item
+        else:
+            self._fifo.append(control)
+        self._controls += 1
+        self._not_empty.set()
+
+    async def get(self) -> Any:
+        """Remove and return the next item, waiting until one is available"""
+        while self.empty():
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Any:
+        if self.empty():
+            raise asyncio.QueueEmpty
+        if self.policy == "conflate":
+            key = self._keys.popleft()
+            item = self._items.pop(key)
+            if key.__class__ is _Control:
+                self._controls -= 1
+        else:
+            item = self._fifo.popleft()
+            if item.__class__ is _Control:
+                self._controls -= 1
+                item = item.item
+        self._not_full.set()
+        return item
+
+    def _pop_oldest(self, entries: Deque[Any]) -> Any:
+        # Evict the oldest entry that is not a control; a full queue always holds one
+        if self._controls:
+            for entry in entries:
+                if entry.__class__ is not _Control:
+                    entries.remove(entry)
+                    return entry
+        return entries.popleft()
+
+    def _record_dropped(self):
+        self.dropped += 1
+        if self.performance_analyzer:
+            self.performance_analyzer.record_dropped_message()
+
+    def _record_conflated(self):
+        self.conflated += 1
+        if self.performance_analyzer:
+            self.performance_analyzer.record_conflated_message()
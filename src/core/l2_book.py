@@ -0,0 +1,246 @@
+import weakref
+import zlib
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .orderbook_processor import ArrayOrderBook, _level_pairs
+
+CHECKSUM_DEPTH = 25  # levels per side included in the OKX book checksum
+
+_EMPTY_LEVELS = np.empty((2, 0), dtype=np.float64)
+
+class SequenceGapError(ValueError):
+    """Raised when a delta does not continue the last applied sequence"""
+
+class ChecksumMismatchError(ValueError):
+    """Raised when the local book disagrees with the exchange checksum"""
+
+class BookSide:
+    """One side of an L2 book keyed by price.
+
+    Quantities live in a dict (O(1) modify) and prices in a sorted key list
+    located with bisect (O(log n) search). Adding or removing a price level
+    shifts the tail of that list, so those are O(n) memmoves (a few hundred
+    levels move in well under a microsecond); quantity changes at existing
+    levels stay O(1). Bids are stored under negated keys so both sides
+    iterate best-first in ascending key order.
+    """
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self._keys: List[float] = []
+        self._levels: Dict[float, float] = {}
+        self._raw: Dict[float, Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys.clear()
+        self._levels.clear()
+        self._raw.clear()
+
+    def update(self, price: Union[str, float], quantity: Union[str, float]):
+        """Insert, modify or delete (zero quantity) a single price level"""
+        px = float(price)
+        qty = float(quantity)
+        key = -px if self.descending else px
+
+        if qty == 0.0:
+            if px in self._levels:
+                del self._levels[px]
+                del self._raw[px]
+                del self._keys[bisect_left(self._keys, key)]
+            return
+
+        if px not in self._levels:
+            self._keys.insert(bisect_left(self._keys, key), key)
+        self._levels[px] = qty
+        self._raw[px] = (str(price), str(quantity))
+
+    def best(self) -> Optional[float]:
+        if not self._keys:
+            return None
+        return -self._keys[0] if self.descending else self._keys[0]
+
+    def prices(self, max_levels: Optional[int] = None) -> List[float]:
+        keys = self._keys[:max_levels] if max_levels else self._keys
+        return [-k for k in keys] if self.descending else list(keys)
+
+    def raw_levels(self, max_levels: int) -> List[Tuple[str, str]]:
+        """Original (price, quantity) strings, best first"""
+        return [self._raw[px] for px in self.prices(max_levels)]
+
+    def to_array(self, max_levels: Optional[int] = None) -> np.ndarray:
+        """Materialize the side as a (2, n) float64 price/quantity array"""
+        prices = self.prices(max_levels)
+        levels = np.empty((2, len(prices)), dtype=np.float64)
+        levels[0] = prices
+        levels[1] = [self._levels[px] for px in prices]
+        return levels
+
+class L2BookView(ArrayOrderBook):
+    """ArrayOrderBook for one L2Book version, built lazily.
+
+    Creating a view is O(1); the (2, n) level arrays are materialized on
+    first read. If the book is about to change while a view is still alive
+    and unread, the book materializes it first, so a view always shows the
+    version it was created for.
+    """
+
+    def __init__(self, book: 'L2Book'):
+        self.timestamp = book.timestamp
+        self.exchange = book.exchange
+        self.symbol = book.symbol
+        self._liquidity = None
+        self._book: Optional[L2Book] = book
+        self._ask_levels = _EMPTY_LEVELS
+        self._bid_levels = _EMPTY_LEVELS
+
+    def _materialize(self):
+        book = self._book
+        if book is not None:
+            self._ask_levels = book.asks.to_array(book.max_levels)
+            self._bid_levels = book.bids.to_array(book.max_levels)
+            self._book = None
+
+    @property  # type: ignore[override]
+    def ask_levels(self) -> np.ndarray:
+        self._materialize()
+        return self._ask_levels
+
+    @ask_levels.setter
+    def ask_levels(self, levels: np.ndarray):
+        self._materialize()
+        self._ask_levels = levels
+
+    @property  # type: ignore[override]
+    def bid_levels(self) -> np.ndarray:
+        self._materialize()
+        return self._bid_levels
+
+    @bid_levels.setter
+    def bid_levels(self, levels: np.ndarray):
+        self._materialize()
+        self._bid_levels = levels
+
+class L2Book:
+    """Stateful L2 orderbook maintained from a snapshot followed by deltas.
+
+    Messages use the OKX ``books`` layout: ``action`` is ``"snapshot"`` or
+    ``"update"``, ``asks``/``bids`` hold ``[price, qty, ...]`` entries where a
+    zero quantity deletes the level, and optional ``seqId``/``prevSeqId`` and
+    ``checksum`` fields are validated when present. Pre-decoded messages
+    with (2, n) float arrays are accepted too; they lose the exchange's
+    price strings, so checksums are not validated until the next string
+    snapshot. Work per message is
+    proportional to the number of changed levels; to_orderbook() returns a
+    lazy view whose arrays are only built when it is read.
+    """
+
+    def __init__(self,
+                 exchange: str = "",
+                 symbol: str = "",
+                 max_levels: Optional[int] = None,
+                 validate_checksum: bool = True):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.max_levels = max_levels
+        self.validate_checksum = validate_checksum
+        self.asks = BookSide(descending=False)
+        self.bids = BookSide(descending=True)
+        self.timestamp: Optional[datetime] = None
+        self.seq_id: Optional[int] = None
+        self.initialized = False
+        self.version = 0
+        self._exact_levels = True  # raw strings match the exchange's, so checksums apply
+        self._view: Optional[weakref.ReferenceType] = None
+
+    def _release_view(self):
+        # Called before every change: a live, unread view keeps the version it was made for
+        view = self._view() if self._view is not None else None
+        if view is not None:
+            view._materialize()
+        self._view = None
+
+    def reset(self):
+        """Drop all state; the next message must be a snapshot"""
+        self._release_view()
+        self.asks.clear()
+        self.bids.clear()
+        self.seq_id = None
+        self.initialized = False
+        self.version += 1
+
+    def apply(self, message: dict, timestamp: Optional[datetime] = None):
+        """Apply a snapshot or delta message to the book"""
+        action = message.get("action", "snapshot")
+        seq_id = message.get("seqId")
+        self._release_view()
+
+        asks, bids = message.get("asks", ()), message.get("bids", ())
+        exact = not isinstance(asks, np.ndarray) and not isinstance(bids, np.ndarray)
+        if action == "snapshot":
+            self.asks.clear()
+            self.bids.clear()
+            self._exact_levels = exact
+        else:
+            if not self.initialized:
+                raise SequenceGapError("Delta received before snapshot")
+            prev_seq_id = message.get("prevSeqId")
+            if prev_seq_id is not None and self.seq_id is not None and prev_seq_id != self.seq_id:
+                raise SequenceGapError(
+                    f"Sequence gap: expected prevSeqId {self.seq_id}, got {prev_seq_id}"
+                )
+
+        self._apply_side(self.asks, asks)
+        self._apply_side(self.bids, bids)
+        self._exact_levels = self._exact_levels and exact
+
+        self.exchange = message.get("exchange", self.exchange)
+        self.symbol = message.get("symbol", self.symbol)
+        if timestamp is not None:
+            self.timestamp = timestamp
+        if seq_id is not None:
+            self.seq_id = seq_id
+        self.initialized = True
+        self.version += 1
+
+        expected = message.get("checksum")
+        if self.validate_checksum and self._exact_levels and expected is not None:
+            actual = self.checksum()
+            if actual != expected:
+                raise ChecksumMismatchError(
+                    f"Checksum mismatch: expected {expected}, got {actual}"
+                )
+
+    @staticmethod
+    def _apply_side(side: BookSide, levels: Union[np.ndarray, Sequence[Sequence[str]]]):
+        for price, quantity in _level_pairs(levels):
+            side.update(price, quantity)
+
+    def checksum(self) -> int:
+        """Compute the OKX CRC32 checksum over the top 25 levels per side"""
+        bids = self.bids.raw_levels(CHECKSUM_DEPTH)
+        asks = self.asks.raw_levels(CHECKSUM_DEPTH)
+        parts = []
+        for i in range(max(len(bids), len(asks))):
+            if i < len(bids):
+                parts.append(f"{bids[i][0]}:{bids[i][1]}")
+            if i < len(asks):
+                parts.append(f"{asks[i][0]}:{asks[i][1]}")
+        crc = zlib.crc32(":".join(parts).encode())
+        return crc - (1 << 32) if crc >= (1 << 31) else crc
+
+    def to_orderbook(self) -> ArrayOrderBook:
+        """
+        Return the current book through the columnar OrderBook read API.
+        The view is shared per version while anyone holds it.
+        """
+        view = self._view() if self._view is not None else None
+        if view is None:
+            view = L2BookView(self)
+            self._view = weakref.ref(view)
+        return view
@@ -0,0 +1,99 @@
+import struct
+import zlib
+from typing import Optional, Tuple, Union
+import numpy as np
+
+MAGIC = b"GQLB"
+VERSION = 1
+FLAG_DELTA_TICKS = 0x01  # prices stored as int64 tick deltas
+FLAG_ZLIB = 0x02  # body compressed with zlib
+
+MAX_DECIMALS = 9
+
+# magic, version, flags, price decimals, n_asks, n_bids
+_HEADER = struct.Struct("<4sBBBxII")
+
+def _price_decimals(prices: np.ndarray) -> Optional[int]:
+    """Smallest number of decimals whose integer ticks round-trip every price exactly"""
+    for decimals in range(MAX_DECIMALS + 1):
+        scale = float(10 ** decimals)
+        ticks = np.round(prices * scale)
+        if np.all(np.abs(ticks) < 2 ** 53) and np.array_equal(ticks / scale, prices):
+            return decimals
+    return None
+
+def encode_levels(ask_levels: np.ndarray,
+                  bid_levels: np.ndarray,
+                  delta: bool = True,
+                  compress: bool = True,
+                  compress_level: int = 1) -> bytes:
+    """
+    Pack (2, n) price/quantity arrays for both sides into a compact blob.
+
+    With ``delta`` prices are stored as int64 tick deltas from the previous
+    level (tick = 10**-decimals, detected from the data; falls back to raw
+    float64 when prices are not exact decimals). Quantities are stored as
+    raw float64. ``compress`` zlib-compresses the body, which shrinks the
+    mostly-constant tick deltas to a few bits per level.
+    """
+    ask_levels = np.asarray(ask_levels, dtype=np.float64).reshape(2, -1)
+    bid_levels = np.asarray(bid_levels, dtype=np.float64).reshape(2, -1)
+    prices = np.concatenate([ask_levels[0], bid_levels[0]])
+
+    flags = 0
+    decimals = _price_decimals(prices) if delta and len(prices) else None
+    if decimals is not None:
+        flags |= FLAG_DELTA_TICKS
+        ticks = np.round(prices * (10 ** decimals)).astype(np.int64)
+        n_asks = ask_levels.shape[1]
+        price_bytes = (
+            np.diff(ticks[:n_asks], prepend=0).tobytes()
+            + np.diff(ticks[n_asks:], prepend=0).tobytes()
+        )
+    else:
+        decimals = 0
+        price_bytes = prices.tobytes()
+
+    body = price_bytes + ask_levels[1].tobytes() + bid_levels[1].tobytes()
+    if compress:
+        flags |= FLAG_ZLIB
+        body = zlib.compress(body, compress_level)
+
+    header = _HEADER.pack(MAGIC, VERSION, flags, decimals, ask_levels.shape[1], bid_levels.shape[1])
+    return header + body
+
+def is_encoded_levels(blob) -> bool:
+    return isinstance(blob, (bytes, bytearray, memoryview)) and bytes(blob[:4]) == MAGIC
+
+def decode_levels(blob: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode a blob from encode_levels into (ask_levels, bid_levels) (2, n) arrays"""
+    magic, version, flags, decimals, n_asks, n_bids = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded orderbook level blob")
+    if version != VERSION:
+        raise ValueError(f"Unsupported level encoding version: {version}")
+
+    body: Union[bytes, memoryview] = memoryview(blob)[_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    n = n_asks + n_bids
+
+    price_width = 8 * n
+    if flags & FLAG_DELTA_TICKS:
+        deltas = np.frombuffer(body, dtype=np.int64, count=n)
+        scale = float(10 ** decimals)
+        ask_prices = np.cumsum(deltas[:n_asks]) / scale
+        bid_prices = np.cumsum(deltas[n_asks:]) / scale
+    else:
+        prices = np.frombuffer(body, dtype=np.float64, count=n)
+        ask_prices = prices[:n_asks]
+        bid_prices = prices[n_asks:]
+    quantities = np.frombuffer(body, dtype=np.float64, count=n, offset=price_width)
+
+    ask_levels = np.empty((2, n_asks), dtype=np.float64)
+    bid_levels = np.empty((2, n_bids), dtype=np.float64)
+    ask_levels[0] = ask_prices
+    ask_levels[1] = quantities[:n_asks]
+    bid_levels[0] = bid_prices
+    bid_levels[1] = quantities[n_asks:]
+    return ask_levels, bid_levels
@@ -0,0 +1,153 @@
+from typing import Dict, Sequence, Tuple, Union
+import numpy as np
+
+BOOK_SIDES = ("ask", "bid")
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+class LiquidityProfile:
+    """Derived depth features of one orderbook version.
+
+    Prefix sums of quantity and notional are built once per side; depth at
+    N levels, depth within a bps band around mid, imbalance and
+    depth-at-notional are then O(1) or O(log n) lookups. Books are
+    immutable per version (a new book object per update), so the owning
+    book caches its profile and an update invalidates it by construction.
+    """
+
+    __slots__ = ("mid_price", "_prices", "_cum_quantity", "_cum_notional", "_summaries")
+
+    def __init__(self, ask_levels: np.ndarray, bid_levels: np.ndarray):
+        """``ask_levels``/``bid_levels`` are (2, n) price/quantity arrays, best level first"""
+        self._prices = {}
+        self._cum_quantity = {}
+        self._cum_notional = {}
+        for side, levels in (("ask", ask_levels), ("bid", bid_levels)):
+            prices, quantities = levels[0], levels[1]
+            self._prices[side] = prices
+            # Leading zero so "depth of the first k levels" is cum[k] for every k
+            self._cum_quantity[side] = np.concatenate(([0.0], np.cumsum(quantities)))
+            self._cum_notional[side] = np.concatenate(([0.0], np.cumsum(prices * quantities)))
+        if len(ask_levels[0]) and len(bid_levels[0]):
+            self.mid_price = float(ask_levels[0, 0] + bid_levels[0, 0]) / 2
+        else:
+            self.mid_price = float("nan")
+        self._summaries: Dict[Tuple, Dict[str, float]] = {}
+
+    @classmethod
+    def from_levels(cls, asks, bids) -> 'LiquidityProfile':
+        """Build from OrderBookLevel sequences (list-based OrderBook)"""
+        def side(levels) -> np.ndarray:
+            return np.array([[level.price for level in levels],
+                             [level.quantity for level in levels]], dtype=np.float64).reshape(2, -1)
+        return cls(side(asks), side(bids))
+
+    @staticmethod
+    def _check_side(side: str):
+        if side not in BOOK_SIDES:
+            raise ValueError(f"Unknown book side: {side}")
+
+    def levels(self, side: str) -> int:
+        self._check_side(side)
+        return len(self._prices[side])
+
+    def prefix_sums(self, side: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(prices, cumulative quantity, cumulative notional) per level of ``side``"""
+        self._check_side(side)
+        return self._prices[side], self._cum_quantity[side][1:], self._cum_notional[side][1:]
+
+    def total_quantity(self, side: str) -> float:
+        self._check_side(side)
+        return float(self._cum_quantity[side][-1])
+
+    def total_notional(self, side: str) -> float:
+        self._check_side(side)
+        return float(self._cum_notional[side][-1])
+
+    def depth_at_levels(self, levels: int) -> Tuple[float, float]:
+        """(bid, ask) quantity in the best ``levels`` levels of each side"""
+        bid = self._cum_quantity["bid"][min(levels, len(self._prices["bid"]))]
+        ask = self._cum_quantity["ask"][min(levels, len(self._prices["ask"]))]
+        return float(bid), float(ask)
+
+    def _band_counts(self, bps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Number of levels priced within ``bps`` of mid on each side
+        if not np.isfinite(self.mid_price):
+            zeros = np.zeros(bps.shape, dtype=np.int64)
+            return zeros, zeros
+        offset = self.mid_price * bps / 10000
+        ask_count = np.searchsorted(self._prices["ask"], self.mid_price + offset, side="right")
+        # Bids are descending; search the negated prices
+        bid_count = np.searchsorted(-self._prices["bid"], -(self.mid_price - offset), side="right")
+        return bid_count, ask_count
+
+    def depth_within_bps(self, bps: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """(bid, ask) quantity priced within ``bps`` basis points of mid; accepts an array of bands"""
+        bands = np.asarray(bps, dtype=np.float64)
+        bid_count, ask_count = self._band_counts(bands)
+        return self._cum_quantity["bid"][bid_count], self._cum_quantity["ask"][ask_count]
+
+    def notional_within_bps(self, bps: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """(bid, ask) quote notional priced within ``bps`` basis points of mid"""
+        bands = np.asarray(bps, dtype=np.float64)
+        bid_count, ask_count = self._band_counts(bands)
+        return self._cum_notional["bid"][bid_count], self._cum_notional["ask"][ask_count]
+
+    def imbalance(self, levels: int) -> float:
+        """(bid - ask) / (bid + ask) over the best ``levels`` levels, in [-1, 1]"""
+        return _imbalance(*self.depth_at_levels(levels))
+
+    def imbalance_within_bps(self, bps: float) -> float:
+        """Imbalance of the quantity within ``bps`` of mid"""
+        bid, ask = self.depth_within_bps(bps)
+        return _imbalance(float(bid), float(ask))
+
+    def depth_at_notional(self, notional: ArrayLike, side: str = "ask") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Base quantity and number of levels needed to absorb ``notional``
+        (quote currency) on ``side``. Quantity is NaN where the visible side
+        holds less notional than requested.
+        """
+        self._check_side(side)
+        requested = np.asarray(notional, dtype=np.float64)
+        prices, cum_notional = self._prices[side], self._cum_notional[side]
+        cum_quantity = self._cum_quantity[side]
+        count = np.searchsorted(cum_notional, requested, side="left")
+        covered = count < len(cum_notional)
+        level = np.clip(count, 1, max(len(prices), 1))
+        if len(prices) == 0:
+            quantity = np.where(requested <= 0, 0.0, np.nan)
+            return quantity, np.zeros(requested.shape, dtype=np.int64)
+        remaining = requested - cum_notional[level - 1]
+        quantity = cum_quantity[level - 1] + remaining / prices[level - 1]
+        quantity = np.where(requested <= 0, 0.0, np.where(covered, quantity, np.nan))
+        levels = np.where(requested <= 0, 0, np.minimum(count, len(prices)))
+        return quantity, levels
+
+    def summary(self, levels: Sequence[int] = (1, 5, 10),
+                bands_bps: Sequence[float] = (10, 25, 50)) -> Dict[str, float]:
+        """
+        Flat feature dict: ``imbalance_{n}`` per level count and
+        ``bid_depth_{b}bps``/``ask_depth_{b}bps``/``imbalance_{b}bps`` per
+        band. Memoized per (levels, bands), so repeated readers share one
+        computation.
+        """
+        key = (tuple(levels), tuple(bands_bps))
+        cached = self._summaries.get(key)
+        if cached is not None:
+            return cached
+        features = {}
+        for n in levels:
+            features[f"imbalance_{n}"] = self.imbalance(n)
+        bid_depth, ask_depth = self.depth_within_bps(list(bands_bps))
+        for band, bid, ask in zip(bands_bps, bid_depth.tolist(), ask_depth.tolist()):
+            label = f"{band:g}bps"
+            features[f"bid_depth_{label}"] = bid
+            features[f"ask_depth_{label}"] = ask
+            features[f"imbalance_{label}"] = _imbalance(bid, ask)
+        self._summaries[key] = features
+        return features
+
+def _imbalance(bid: float, ask: float) -> float:
+    total = bid + ask
+    return (bid - ask) / total if total > 0 else 0.0
@@ -1,6 +1,14 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Sequence, Union, overload
 from datetime import datetime
+import logging
+import numpy as np
+
+from .decoder import TimestampParser, parse_levels
+from .liquidity import LiquidityProfile
+
+if TYPE_CHECKING:
+    from .l2_book import L2Book
 
 @dataclass
 class OrderBookLevel:
@@ -14,6 +22,14 @@ class OrderBook:
     symbol: str
     asks: List[OrderBookLevel]
     bids: List[OrderBookLevel]
+    _liquidity: Optional[LiquidityProfile] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def liquidity(self) -> LiquidityProfile:
+        """Depth features, computed on first access; treat the book as immutable after that"""
+        if self._liquidity is None:
+            self._liquidity = LiquidityProfile.from_levels(self.asks, self.bids)
+        return self._liquidity
     
     @property
     def mid_price(self) -> float:
@@ -32,34 +48,218 @@ class OrderBook:
     @property
     def depth(self) -> float:
         """Calculate orderbook depth"""
-        ask_depth = sum(level.quantity for level in self.asks)
-        bid_depth = sum(level.quantity for level in self.bids)
-        return (ask_depth + bid_depth) / 2
+        return self.total_volume / 2
     
     @property
     def total_volume(self) -> float:
         """Calculate total volume"""
-        return sum(level.quantity for level in self.asks + self.bids)
+        return self.liquidity.total_quantity("ask") + self.liquidity.total_quantity("bid")
+
+class LevelView(Sequence[OrderBookLevel]):
+    """Read-only list-like view over a pair of price/quantity arrays.
+
+    Indexing materializes a single OrderBookLevel on demand, so callers
+    written against OrderBook (e.g. ``book.asks[0].price``) keep working
+    without allocating one object per level per tick.
+    """
+
+    __slots__ = ("prices", "quantities")
+
+    def __init__(self, prices: np.ndarray, quantities: np.ndarray):
+        self.prices = prices
+        self.quantities = quantities
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @overload
+    def __getitem__(self, index: int) -> OrderBookLevel: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LevelView": ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return LevelView(self.prices[index], self.quantities[index])
+        return OrderBookLevel(float(self.prices[index]), float(self.quantities[index]))
+
+    def __iter__(self) -> Iterator[OrderBookLevel]:
+        for price, quantity in zip(self.prices.tolist(), self.quantities.tolist()):
+            yield OrderBookLevel(price, quantity)
+
+    def __repr__(self) -> str:
+        return f"LevelView(levels={len(self)})"
+
+def _empty_levels() -> np.ndarray:
+    return np.empty((2, 0), dtype=np.float64)
+
+def levels_to_array(levels: Union[np.ndarray, Sequence[Sequence[str]]]) -> np.ndarray:
+    """Return ``[[price, qty], ...]`` levels as a contiguous (2, n) float64 array"""
+    if isinstance(levels, np.ndarray):
+        return levels
+    return parse_levels(levels)
+
+def _level_pairs(levels: Union[np.ndarray, Sequence[Sequence[str]]]):
+    if isinstance(levels, np.ndarray):
+        return zip(levels[0].tolist(), levels[1].tolist())
+    return ((level[0], level[1]) for level in levels)
+
+@dataclass
+class ArrayOrderBook:
+    """Columnar orderbook storing each side as contiguous float64 arrays.
+
+    ``ask_levels``/``bid_levels`` have shape (2, n): row 0 is price, row 1 is
+    quantity, best level first. ``asks``/``bids`` return LevelView objects
+    compatible with the list-based OrderBook API.
+    """
+    timestamp: Optional[datetime]  # None until an incremental book has seen a timestamp
+    exchange: str
+    symbol: str
+    ask_levels: np.ndarray
+    bid_levels: np.ndarray
+    _liquidity: Optional[LiquidityProfile] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def liquidity(self) -> LiquidityProfile:
+        """Depth features of this book version, computed once on first access"""
+        if self._liquidity is None:
+            self._liquidity = LiquidityProfile(self.ask_levels, self.bid_levels)
+        return self._liquidity
+
+    @property
+    def ask_prices(self) -> np.ndarray:
+        return self.ask_levels[0]
+
+    @property
+    def ask_quantities(self) -> np.ndarray:
+        return self.ask_levels[1]
+
+    @property
+    def bid_prices(self) -> np.ndarray:
+        return self.bid_levels[0]
+
+    @property
+    def bid_quantities(self) -> np.ndarray:
+        return self.bid_levels[1]
+
+    @property
+    def asks(self) -> LevelView:
+        return LevelView(self.ask_levels[0], self.ask_levels[1])
+
+    @property
+    def bids(self) -> LevelView:
+        return LevelView(self.bid_levels[0], self.bid_levels[1])
+
+    @property
+    def mid_price(self) -> float:
+        """Calculate mid price"""
+        if self.ask_levels.shape[1] == 0 or self.bid_levels.shape[1] == 0:
+            return 0.0
+        return float(self.ask_levels[0, 0] + self.bid_levels[0, 0]) / 2
+
+    @property
+    def spread(self) -> float:
+        """Calculate spread"""
+        if self.ask_levels.shape[1] == 0 or self.bid_levels.shape[1] == 0:
+            return 0.0
+        return float(self.ask_levels[0, 0] - self.bid_levels[0, 0])
+
+    @property
+    def depth(self) -> float:
+        """Calculate orderbook depth"""
+        return self.total_volume / 2
+
+    @property
+    def total_volume(self) -> float:
+        """Calculate total volume"""
+        return self.liquidity.total_quantity("ask") + self.liquidity.total_quantity("bid")
+
+    @classmethod
+    def from_orderbook(cls, orderbook: OrderBook) -> 'ArrayOrderBook':
+        """Build a columnar book from a list-based OrderBook"""
+        def side(levels: List[OrderBookLevel]) -> np.ndarray:
+            if not levels:
+                return _empty_levels()
+            return np.array(
+                [[level.price for level in levels], [level.quantity for level in levels]],
+                dtype=np.float64
+            )
+
+        return cls(
+            timestamp=orderbook.timestamp,
+            exchange=orderbook.exchange,
+            symbol=orderbook.symbol,
+            ask_levels=side(orderbook.asks),
+            bid_levels=side(orderbook.bids)
+        )
 
 class OrderBookProcessor:
-    def __init__(self):
-        self.current_orderbook: OrderBook = None
+    def __init__(self,
+                 columnar: bool = False,
+                 incremental: bool = False,
+                 max_levels: Optional[int] = None,
+                 on_resync: Optional[Callable[[str], None]] = None):
+        """
+        With ``incremental=True`` messages are applied as snapshot/delta
+        updates to a persistent L2Book (always columnar) instead of
+        rebuilding the book from scratch. ``on_resync`` is called with the
+        reason whenever a sequence gap or checksum mismatch drops the book.
+        """
+        self.columnar = columnar or incremental
+        self.incremental = incremental
+        self.on_resync = on_resync
+        self.resync_required = False
+        self.logger = logging.getLogger('processor')
+        self.parse_timestamp = TimestampParser()
+        self._current_orderbook: Optional[Union[OrderBook, ArrayOrderBook]] = None
+        self.l2_book: Optional[L2Book] = None
+        if incremental:
+            from .l2_book import L2Book
+            self.l2_book = L2Book(max_levels=max_levels)
     
-    def process_message(self, message: dict) -> OrderBook:
-        """Process incoming WebSocket message into OrderBook format"""
-        timestamp = datetime.fromisoformat(message["timestamp"].replace("Z", "+00:00"))
+    @property
+    def current_orderbook(self) -> Optional[Union[OrderBook, ArrayOrderBook]]:
+        """Last processed book; in incremental mode a lazy view of the L2 book"""
+        if self.l2_book is not None:
+            if self.resync_required or not self.l2_book.initialized:
+                return None
+            return self.l2_book.to_orderbook()
+        return self._current_orderbook
+
+    def process_message(self, message: dict) -> Optional[Union[OrderBook, ArrayOrderBook]]:
+        """
+        Process incoming WebSocket message into OrderBook format.
+        In incremental mode returns None while waiting for a resync snapshot.
+        """
+        if self.incremental:
+            return self._apply_update(message)
+        if message.get("action", "snapshot") != "snapshot":
+            # A delta would silently replace the whole book with the changed levels
+            raise ValueError(f"Delta ({message['action']}) message needs an incremental processor")
+        
+        timestamp = self.parse_timestamp(message["timestamp"])
+        
+        if self.columnar:
+            self._current_orderbook = ArrayOrderBook(
+                timestamp=timestamp,
+                exchange=message["exchange"],
+                symbol=message["symbol"],
+                ask_levels=levels_to_array(message["asks"]),
+                bid_levels=levels_to_array(message["bids"])
+            )
+            return self._current_orderbook
         
         asks = [
             OrderBookLevel(float(price), float(qty))
-            for price, qty in message["asks"]
+            for price, qty in _level_pairs(message["asks"])
         ]
         
         bids = [
             OrderBookLevel(float(price), float(qty))
-            for price, qty in message["bids"]
+            for price, qty in _level_pairs(message["bids"])
         ]
         
-        self.current_orderbook = OrderBook(
+        self._current_orderbook = OrderBook(
             timestamp=timestamp,
             exchange=message["exchange"],
             symbol=message["symbol"],
@@ -67,7 +267,39 @@ class OrderBookProcessor:
             bids=bids
         )
         
-        return self.current_orderbook
+        return self._current_orderbook
+
+    def _apply_update(self, message: dict) -> Optional[ArrayOrderBook]:
+        """Apply a snapshot/delta message to the persistent L2 book"""
+        from .l2_book import ChecksumMismatchError, SequenceGapError
+        assert self.l2_book is not None
+        
+        if self.resync_required and message.get("action", "snapshot") != "snapshot":
+            return None
+        
+        timestamp = None
+        if "timestamp" in message:
+            timestamp = self.parse_timestamp(message["timestamp"])
+        
+        try:
+            self.l2_book.apply(message, timestamp)
+        except (SequenceGapError, ChecksumMismatchError) as e:
+            self.request_resync(str(e))
+            return None
+        
+        self.resync_required = False
+        # O(1): the view's arrays are built only if the caller reads it
+        return self.l2_book.to_orderbook()
+
+    def request_resync(self, reason: str):
+        """Drop the incremental book and wait for a fresh snapshot"""
+        self.logger.warning(f"Orderbook resync required: {reason}")
+        self.resync_required = True
+        self._current_orderbook = None
+        if self.l2_book is not None:
+            self.l2_book.reset()
+        if self.on_resync:
+            self.on_resync(reason)
 
     def calculate_mid_price(self) -> float:
         """Calculate the current mid price."""
@@ -76,4 +308,4 @@ class OrderBookProcessor:
         
         best_ask = self.current_orderbook.asks[0].price
         best_bid = self.current_orderbook.bids[0].price
-        return (best_ask + best_bid) / 2 
\ No newline at end of file
+        return (best_ask + best_bid) / 2
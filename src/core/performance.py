@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Any
 import time
 import statistics
 from collections import deque
@@ -11,6 +11,10 @@ class PerformanceMetrics:
     ws_latency: deque
     total_ticks: int
     errors: int
+    dropped_messages: int
+    conflated_messages: int
+    reconnects: int
+    downtime_seconds: float
     
     def __init__(self, window_size: int = 100):
         self.processing_times = deque(maxlen=window_size)
@@ -18,6 +22,10 @@ class PerformanceMetrics:
         self.ws_latency = deque(maxlen=window_size)
         self.total_ticks = 0
         self.errors = 0
+        self.dropped_messages = 0
+        self.conflated_messages = 0
+        self.reconnects = 0
+        self.downtime_seconds = 0.0
     
     def add_processing_time(self, time_ms: float):
         self.processing_times.append(time_ms)
@@ -32,6 +40,16 @@ class PerformanceMetrics:
     def increment_errors(self):
         self.errors += 1
     
+    def increment_dropped(self):
+        self.dropped_messages += 1
+    
+    def increment_conflated(self):
+        self.conflated_messages += 1
+    
+    def add_reconnect(self, downtime_seconds: float):
+        self.reconnects += 1
+        self.downtime_seconds += downtime_seconds
+    
     def get_statistics(self) -> Dict[str, float]:
         """Calculate performance statistics"""
         stats = {
@@ -74,6 +92,18 @@ class PerformanceAnalyzer:
         """Record an error occurrence"""
         self.metrics.increment_errors()
     
+    def record_dropped_message(self):
+        """Record a message discarded by the ingest queue"""
+        self.metrics.increment_dropped()
+    
+    def record_conflated_message(self):
+        """Record a queued message replaced by a newer one for the same key"""
+        self.metrics.increment_conflated()
+    
+    def record_reconnect(self, downtime_seconds: float):
+        """Record a WebSocket reconnect and how long the feed was down"""
+        self.metrics.add_reconnect(downtime_seconds)
+    
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate a comprehensive performance report"""
         stats = self.metrics.get_statistics()
@@ -84,5 +114,9 @@ class PerformanceAnalyzer:
             'uptime_seconds': uptime,
             'ticks_per_second': self.metrics.total_ticks / uptime if uptime > 0 else 0,
             'total_ticks': self.metrics.total_ticks,
-            'total_errors': self.metrics.errors
+            'total_errors': self.metrics.errors,
+            'dropped_messages': self.metrics.dropped_messages,
+            'conflated_messages': self.metrics.conflated_messages,
+            'reconnects': self.metrics.reconnects,
+            'downtime_seconds': self.metrics.downtime_seconds
         } 
\ No newline at end of file
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .connection_manager import ConnectionManager, StreamSpec, iter_book_messages
+from .decoder import MessageDecoder, TimestampParser
+from .orderbook_processor import OrderBookProcessor
+from .storage import TradingDataStorage, to_epoch_ns
+
+# (exchange timestamp in epoch ns or None, decoded frame)
+ReplayEvent = Tuple[Optional[int], Dict[str, Any]]
+
+def _frame_time_ns(frame: Dict[str, Any], parse_timestamp: TimestampParser) -> Optional[int]:
+    """Exchange timestamp of a decoded frame, flat or OKX ``{arg, data}`` layout"""
+    raw = frame.get("timestamp", frame.get("ts"))
+    if raw is None and frame.get("data"):
+        raw = frame["data"][0].get("ts")
+    if raw is None:
+        return None
+    return to_epoch_ns(parse_timestamp(raw))
+
+def iter_capture_file(path: str, decoder: Optional[MessageDecoder] = None) -> Iterator[ReplayEvent]:
+    """
+    Frames from a capture file holding one raw WebSocket frame per line, as
+    received. Lines are decoded with ``MessageDecoder.decode_orderbook``
+    exactly like the live client.
+    """
+    decoder = decoder or MessageDecoder()
+    parse_timestamp = TimestampParser()
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            frame = decoder.decode_orderbook(line)
+            yield _frame_time_ns(frame, parse_timestamp), frame
+
+def write_capture_file(path: str, frames: Iterable[Union[str, bytes, Dict[str, Any]]]):
+    """Write raw frames (or JSON-serialisable dicts) as a capture file"""
+    with open(path, "wb") as f:
+        for frame in frames:
+            if isinstance(frame, dict):
+                frame = json.dumps(frame)
+            if isinstance(frame, str):
+                frame = frame.encode()
+            f.write(frame.rstrip(b"\n") + b"\n")
+
+def iter_storage_snapshots(storage: TradingDataStorage,
+                           start_time: datetime,
+                           end_time: datetime,
+                           symbol: Optional[str] = None) -> Iterator[ReplayEvent]:
+    """Recorded books from ``orderbook_snapshots`` as flat book messages"""
+    for timestamp, row_symbol, ask_levels, bid_levels in storage.iter_orderbook_levels(start_time, end_time, symbol):
+        yield timestamp, {
+            "timestamp": datetime.fromtimestamp(timestamp / 1e9, tz=timezone.utc),
+            "symbol": row_symbol,
+            "asks": ask_levels,
+            "bids": bid_levels
+        }
+
+@dataclass
+class ReplayStats:
+    messages: int = 0  # frames read from the source
+    updates: int = 0  # book updates a stream processed
+    errors: int = 0  # book updates a stream rejected or dropped pending a resync
+    skipped: int = 0  # book updates for symbols without a configured stream
+    elapsed_seconds: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'messages': self.messages,
+            'updates': self.updates,
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'elapsed_seconds': self.elapsed_seconds,
+            'messages_per_second': self.messages_per_second
+        }
+
+class Replayer:
+    """
+    Offline stand-in for the live feed: pushes recorded frames through a
+    ConnectionManager's processors and callback, so the same pipeline runs
+    without a WebSocket.
+
+    ``speed=None`` replays as fast as possible; otherwise frames are paced
+    by their exchange timestamps at ``speed`` times wall-clock (2.0 = twice
+    as fast as recorded).
+
+    Replay swaps the manager's full-book processors for incremental ones:
+    a capture may mix flat full-book frames with native snapshot + delta
+    pushes, and an incremental processor applies both.
+    """
+
+    def __init__(self,
+                 manager: ConnectionManager,
+                 speed: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.manager = manager
+        self.speed = speed
+        self.clock = clock
+        self.sleep = sleep
+        self.logger = logging.getLogger('replay')
+        for key, processor in manager.processors.items():
+            if not processor.incremental:
+                manager.processors[key] = OrderBookProcessor(incremental=True)
+        self._by_symbol: Dict[Optional[str], StreamSpec] = {
+            spec.symbol: spec for spec in manager.streams.values()
+        }
+        if len(manager.streams) == 1:
+            # Flat frames without a symbol belong to the only stream
+            self._by_symbol[None] = next(iter(manager.streams.values()))
+
+    async def run(self, events: Iterable[ReplayEvent]) -> ReplayStats:
+        """Replay every event and return throughput statistics"""
+        stats = ReplayStats()
+        start = self.clock()
+        first_time_ns = None
+
+        for time_ns, frame in events:
+            if self.speed is not None and time_ns is not None:
+                if first_time_ns is None:
+                    first_time_ns = time_ns
+                delay = start + (time_ns - first_time_ns) / 1e9 / self.speed - self.clock()
+                if delay > 0:
+                    await self.sleep(delay)
+
+            stats.messages += 1
+            for symbol, message in iter_book_messages(frame):
+                spec = self._by_symbol.get(symbol)
+                if spec is None:
+                    stats.skipped += 1
+                    continue
+                if await self.manager.dispatch(spec, message, record_latency=False):
+                    stats.updates += 1
+                else:
+                    stats.errors += 1
+
+        stats.elapsed_seconds = self.clock() - start
+        self.logger.info(
+            f"Replayed {stats.messages} messages in {stats.elapsed_seconds:.3f}s "
+            f"({stats.messages_per_second:.0f} msg/s)"
+        )
+        return stats
@@ -0,0 +1,41 @@
+import threading
+from typing import Any, Optional
+
+class LatestSlot:
+    """
+    Single-value mailbox between the tick pipeline and a fixed-rate renderer.
+
+    publish() replaces whatever is pending, so the producer never blocks or
+    queues work for the UI; take() returns the newest value once, or None
+    when nothing new was published since the last take. Safe to use across
+    threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._version = 0
+        self._taken_version = 0
+        self.published = 0
+        self.coalesced = 0
+
+    def publish(self, value: Any):
+        with self._lock:
+            self._value = value
+            self._version += 1
+            self.published += 1
+
+    def take(self) -> Optional[Any]:
+        """Newest unseen value, or None if nothing was published since the last take"""
+        with self._lock:
+            if self._version == self._taken_version:
+                return None
+            # Every publish between two takes except the last was never rendered
+            self.coalesced += self._version - self._taken_version - 1
+            self._taken_version = self._version
+            return self._value
+
+    def peek(self) -> Optional[Any]:
+        """Latest published value, whether or not it was taken"""
+        with self._lock:
+            return self._value
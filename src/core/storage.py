@@ -1,129 +1,698 @@
+import atexit
+import logging
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
 import json
-from typing import List, Dict, Any
-import pandas as pd
+from typing import TYPE_CHECKING, Deque, List, Dict, Any, Iterator, Optional, Tuple, Union
+import numpy as np
 from pathlib import Path
 
+from .archive import NUMERIC_COLUMNS, PAYLOAD_COLUMN, TickArchive
+from .decoder import parse_levels
+from .level_codec import decode_levels, encode_levels, is_encoded_levels
+
+if TYPE_CHECKING:
+    import pandas as pd  # imported lazily by the query methods that return frames
+
+SCHEMA_VERSION = 4
+
+TABLE_SCHEMAS = {
+    'orderbook_snapshots': """
+        CREATE TABLE IF NOT EXISTS orderbook_snapshots (
+            timestamp INTEGER NOT NULL,
+            exchange TEXT,
+            symbol TEXT,
+            mid_price REAL,
+            spread REAL,
+            depth REAL,
+            volume REAL,
+            data BLOB
+        )
+    """,
+    'trading_metrics': """
+        CREATE TABLE IF NOT EXISTS trading_metrics (
+            timestamp INTEGER NOT NULL,
+            symbol TEXT,
+            slippage REAL,
+            fees REAL,
+            impact REAL,
+            net_cost REAL,
+            maker_taker REAL,
+            processing_time REAL
+        )
+    """,
+    'performance_metrics': """
+        CREATE TABLE IF NOT EXISTS performance_metrics (
+            timestamp INTEGER NOT NULL,
+            avg_processing_time REAL,
+            avg_ui_update_time REAL,
+            avg_ws_latency REAL,
+            error_rate REAL,
+            ticks_per_second REAL
+        )
+    """,
+    'rollups': """
+        CREATE TABLE IF NOT EXISTS rollups (
+            source TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            symbol TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            minimum REAL NOT NULL,
+            maximum REAL NOT NULL,
+            last REAL NOT NULL,
+            last_timestamp INTEGER NOT NULL,
+            PRIMARY KEY (source, metric, resolution, bucket, symbol)
+        ) WITHOUT ROWID
+    """
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_orderbook_symbol_time ON orderbook_snapshots (symbol, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_orderbook_time ON orderbook_snapshots (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_trading_symbol_time ON trading_metrics (symbol, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_trading_time ON trading_metrics (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_performance_time ON performance_metrics (timestamp)"
+]
+
+INSERT_STATEMENTS = {
+    'orderbook_snapshots': """
+        INSERT INTO orderbook_snapshots 
+        (timestamp, exchange, symbol, mid_price, spread, depth, volume, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'trading_metrics': """
+        INSERT INTO trading_metrics 
+        (timestamp, symbol, slippage, fees, impact, net_cost, maker_taker, processing_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'performance_metrics': """
+        INSERT INTO performance_metrics 
+        (timestamp, avg_processing_time, avg_ui_update_time, 
+         avg_ws_latency, error_rate, ticks_per_second)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+}
+
+NS_PER_SECOND = 10**9
+
+# Rollup bucket sizes in seconds, maintained incrementally on insert. The
+# 10s/10m steps keep a query within ~10x of its bucket count in rollup rows.
+ROLLUP_RESOLUTIONS = (1, 10, 60, 600, 3600)
+
+# Columns aggregated into rollups: table -> (symbol position or None,
+# {column: position}) within the rows of INSERT_STATEMENTS[table]
+ROLLUP_SOURCES = {
+    'orderbook_snapshots': (2, {'mid_price': 3, 'spread': 4, 'depth': 5, 'volume': 6}),
+    'trading_metrics': (1, {'slippage': 2, 'fees': 3, 'impact': 4, 'net_cost': 5,
+                            'maker_taker': 6, 'processing_time': 7}),
+    'performance_metrics': (None, {'avg_processing_time': 1, 'avg_ui_update_time': 2,
+                                   'avg_ws_latency': 3, 'error_rate': 4, 'ticks_per_second': 5})
+}
+
+UPSERT_ROLLUP = """
+    INSERT INTO rollups 
+    (source, metric, resolution, bucket, symbol, count, total, minimum, maximum, last, last_timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (source, metric, resolution, bucket, symbol) DO UPDATE SET
+        count = count + excluded.count,
+        total = total + excluded.total,
+        minimum = MIN(minimum, excluded.minimum),
+        maximum = MAX(maximum, excluded.maximum),
+        last = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last ELSE last END,
+        last_timestamp = MAX(last_timestamp, excluded.last_timestamp)
+"""
+
+AGGREGATE_COLUMNS = ['timestamp', 'count', 'mean', 'min', 'max', 'last']
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def to_epoch_ns(value: Union[int, str, datetime]) -> int:
+    """Convert a datetime, ISO-8601 string or epoch-ns int to epoch nanoseconds.
+    Naive datetimes are interpreted as local time."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+def _migrate_v1_to_v2(conn: sqlite3.Connection):
+    """Convert TEXT ISO timestamps to INTEGER epoch nanoseconds"""
+    legacy_columns = {
+        'orderbook_snapshots': "timestamp, exchange, symbol, mid_price, spread, depth, volume, data",
+        'trading_metrics': "timestamp, NULL, slippage, fees, impact, net_cost, maker_taker, processing_time",
+        'performance_metrics': ("timestamp, avg_processing_time, avg_ui_update_time, "
+                                "avg_ws_latency, error_rate, ticks_per_second")
+    }
+    for table, columns in legacy_columns.items():
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+        conn.execute(TABLE_SCHEMAS[table])
+        cursor = conn.execute(f"SELECT {columns} FROM {table}_v1 ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            conn.executemany(
+                INSERT_STATEMENTS[table],
+                [(to_epoch_ns(row[0]),) + tuple(row[1:]) for row in rows]
+            )
+        conn.execute(f"DROP TABLE {table}_v1")
+
+def _encode_book_data(data: Any) -> Any:
+    """Encode orderbook levels for the ``data`` column.
+
+    Accepts an OrderBook/ArrayOrderBook, a dict with ``asks``/``bids`` level
+    lists or (2, n) arrays, or an already encoded blob. Anything else is
+    stored as JSON text."""
+    if is_encoded_levels(data):
+        return bytes(data)
+    if hasattr(data, 'ask_levels'):
+        return encode_levels(data.ask_levels, data.bid_levels)
+    if hasattr(data, 'asks') and hasattr(data, 'bids'):
+        return encode_levels(
+            np.array([[level.price for level in data.asks], [level.quantity for level in data.asks]],
+                     dtype=np.float64).reshape(2, -1),
+            np.array([[level.price for level in data.bids], [level.quantity for level in data.bids]],
+                     dtype=np.float64).reshape(2, -1)
+        )
+    if isinstance(data, dict) and 'asks' in data and 'bids' in data:
+        return encode_levels(_as_level_array(data['asks']), _as_level_array(data['bids']))
+    return json.dumps(data)
+
+def _as_level_array(levels: Any) -> np.ndarray:
+    if isinstance(levels, np.ndarray):
+        return levels
+    return parse_levels(levels)
+
+def _migrate_v2_to_v3(conn: sqlite3.Connection):
+    """Re-encode JSON orderbook levels in orderbook_snapshots.data as binary blobs"""
+    conn.execute("ALTER TABLE orderbook_snapshots RENAME TO orderbook_snapshots_v2")
+    conn.execute(TABLE_SCHEMAS['orderbook_snapshots'])
+    cursor = conn.execute(
+        "SELECT timestamp, exchange, symbol, mid_price, spread, depth, volume, data "
+        "FROM orderbook_snapshots_v2 ORDER BY rowid"
+    )
+    while True:
+        rows = cursor.fetchmany(10000)
+        if not rows:
+            break
+        converted = []
+        for row in rows:
+            data = row[7]
+            try:
+                data = _encode_book_data(json.loads(data))
+            except (TypeError, ValueError):
+                pass  # leave non-JSON or non-book payloads untouched
+            converted.append(tuple(row[:7]) + (data,))
+        conn.executemany(INSERT_STATEMENTS['orderbook_snapshots'], converted)
+    conn.execute("DROP TABLE orderbook_snapshots_v2")
+
+def _rollup_rows(pending: Dict[str, List[Tuple]]) -> List[Tuple]:
+    """Aggregate a batch of inserted rows into rollup upsert rows"""
+    buckets: Dict[Tuple, List] = {}
+    for table, rows in pending.items():
+        if table not in ROLLUP_SOURCES:
+            continue
+        symbol_position, positions = ROLLUP_SOURCES[table]
+        for row in rows:
+            timestamp = row[0]
+            symbol = (row[symbol_position] if symbol_position is not None else None) or ''
+            for resolution in ROLLUP_RESOLUTIONS:
+                bucket = timestamp - timestamp % (resolution * NS_PER_SECOND)
+                for metric, position in positions.items():
+                    value = row[position]
+                    if value is None:
+                        continue
+                    value = float(value)
+                    key = (table, metric, resolution, bucket, symbol)
+                    aggregate = buckets.get(key)
+                    if aggregate is None:
+                        buckets[key] = [1, value, value, value, value, timestamp]
+                        continue
+                    aggregate[0] += 1
+                    aggregate[1] += value
+                    if value < aggregate[2]:
+                        aggregate[2] = value
+                    if value > aggregate[3]:
+                        aggregate[3] = value
+                    if timestamp >= aggregate[5]:
+                        aggregate[4] = value
+                        aggregate[5] = timestamp
+    return [key + tuple(aggregate) for key, aggregate in buckets.items()]
+
+def _migrate_v3_to_v4(conn: sqlite3.Connection):
+    """Create the rollups table and backfill it from existing rows"""
+    conn.execute(TABLE_SCHEMAS['rollups'])
+    column_lists = {
+        'orderbook_snapshots': "timestamp, exchange, symbol, mid_price, spread, depth, volume",
+        'trading_metrics': "timestamp, symbol, slippage, fees, impact, net_cost, maker_taker, processing_time",
+        'performance_metrics': ("timestamp, avg_processing_time, avg_ui_update_time, "
+                                "avg_ws_latency, error_rate, ticks_per_second")
+    }
+    for table, columns in column_lists.items():
+        cursor = conn.execute(f"SELECT {columns} FROM {table} ORDER BY timestamp")
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            conn.executemany(UPSERT_ROLLUP, _rollup_rows({table: rows}))
+
+# MIGRATIONS[n] upgrades a database from schema version n to n + 1
+MIGRATIONS = {
+    1: _migrate_v1_to_v2,
+    2: _migrate_v2_to_v3,
+    3: _migrate_v3_to_v4
+}
+
+def choose_bucket(start_ns: int, end_ns: int, max_points: int) -> Tuple[int, Optional[int]]:
+    """
+    Pick a bucket size (ns) giving at most ``max_points`` buckets over the
+    range, and the coarsest rollup resolution (s) it can be built from, or
+    None when the bucket is finer than every rollup and raw rows are needed.
+    """
+    target = max(1, -(-(end_ns - start_ns) // max(1, max_points)))
+    usable = [r for r in ROLLUP_RESOLUTIONS if r * NS_PER_SECOND <= target]
+    if not usable:
+        return target, None
+    resolution_ns = usable[-1] * NS_PER_SECOND
+    return -(-target // resolution_ns) * resolution_ns, usable[-1]
+
+def _reduce_buckets(bucket_ns: int,
+                    timestamps: np.ndarray,
+                    count: np.ndarray,
+                    total: np.ndarray,
+                    minimum: np.ndarray,
+                    maximum: np.ndarray,
+                    last: np.ndarray,
+                    last_timestamps: np.ndarray) -> 'pd.DataFrame':
+    """Merge partial aggregates (raw rows or rollup buckets) into ``bucket_ns`` buckets"""
+    import pandas as pd
+    if len(timestamps) == 0:
+        return pd.DataFrame({name: [] for name in AGGREGATE_COLUMNS})
+    keys = timestamps - timestamps % bucket_ns
+    # Within a bucket, order by time so the final entry holds the last value
+    order = np.lexsort((last_timestamps, keys))
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    counts = np.add.reduceat(count[order], starts)
+    return pd.DataFrame({
+        'timestamp': keys[starts],
+        'count': counts,
+        'mean': np.add.reduceat(total[order], starts) / counts,
+        'min': np.minimum.reduceat(minimum[order], starts),
+        'max': np.maximum.reduceat(maximum[order], starts),
+        'last': last[order][ends]
+    })
+
+_STOP = object()
+_FLUSH = object()
+
 class TradingDataStorage:
-    def __init__(self, db_path: str = "data/trading.db"):
+    def __init__(self, 
+                 db_path: str = "data/trading.db",
+                 batch_size: int = 500,
+                 flush_interval: float = 0.5,
+                 max_queue_size: int = 100000,
+                 archive: Optional[TickArchive] = None):
+        """
+        Writes are queued and committed in batches by a background writer
+        thread over one long-lived WAL-mode connection: a batch is committed
+        once ``batch_size`` rows are pending or ``flush_interval`` seconds
+        have passed. Call close() (also registered with atexit) to flush
+        pending rows on shutdown.
+        
+        When an ``archive`` is given, orderbook snapshots are written to the
+        columnar tick archive instead of SQLite and read back from it.
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger('storage')
+        self.archive = archive
+        
+        self._write_conn = self._connect()
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
         self._init_db()
+        
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._commit_latencies: Deque[float] = deque(maxlen=100)
+        self._rows_written = 0
+        self._commits = 0
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_loop, name="storage-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
     
     def _init_db(self):
-        """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS orderbook_snapshots (
-                    timestamp TEXT,
-                    exchange TEXT,
-                    symbol TEXT,
-                    mid_price REAL,
-                    spread REAL,
-                    depth REAL,
-                    volume REAL,
-                    data TEXT
-                )
-            """)
+        """Create tables and indexes, migrating older schemas in place"""
+        with self._write_conn as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == 0:
+                # Databases created before schema versioning have version 0
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orderbook_snapshots'"
+                ).fetchone()
+                version = 1 if exists else SCHEMA_VERSION
             
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS trading_metrics (
-                    timestamp TEXT,
-                    slippage REAL,
-                    fees REAL,
-                    impact REAL,
-                    net_cost REAL,
-                    maker_taker REAL,
-                    processing_time REAL
-                )
-            """)
+            while version < SCHEMA_VERSION:
+                self.logger.info(f"Migrating {self.db_path} from schema v{version} to v{version + 1}")
+                MIGRATIONS[version](conn)
+                version += 1
             
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS performance_metrics (
-                    timestamp TEXT,
-                    avg_processing_time REAL,
-                    avg_ui_update_time REAL,
-                    avg_ws_latency REAL,
-                    error_rate REAL,
-                    ticks_per_second REAL
-                )
-            """)
+            for statement in TABLE_SCHEMAS.values():
+                conn.execute(statement)
+            for statement in INDEXES:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _enqueue(self, table: str, row: Tuple):
+        if self._closed:
+            raise RuntimeError("Storage is closed")
+        self._queue.put((table, row))
     
     def save_orderbook_snapshot(self, snapshot: Dict[str, Any]):
-        """Save orderbook snapshot to database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO orderbook_snapshots 
-                (timestamp, exchange, symbol, mid_price, spread, depth, volume, data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                snapshot['timestamp'],
-                snapshot['exchange'],
-                snapshot['symbol'],
-                snapshot['mid_price'],
-                snapshot['spread'],
-                snapshot['depth'],
-                snapshot['volume'],
-                json.dumps(snapshot['data'])
-            ))
+        """Queue an orderbook snapshot for writing"""
+        self._enqueue('orderbook_snapshots', (
+            to_epoch_ns(snapshot['timestamp']),
+            snapshot['exchange'],
+            snapshot['symbol'],
+            snapshot['mid_price'],
+            snapshot['spread'],
+            snapshot['depth'],
+            snapshot['volume'],
+            _encode_book_data(snapshot['data'])
+        ))
     
     def save_trading_metrics(self, metrics: Dict[str, Any]):
-        """Save trading metrics to database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO trading_metrics 
-                (timestamp, slippage, fees, impact, net_cost, maker_taker, processing_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.now().isoformat(),
-                float(metrics['slippage']),
-                float(metrics['fees']),
-                float(metrics['impact']),
-                float(metrics['net_cost']),
-                float(metrics['maker_taker']),
-                float(metrics['processing_time'])
-            ))
+        """Queue trading metrics for writing, at their tick's timestamp when present"""
+        timestamp = metrics.get('timestamp')
+        self._enqueue('trading_metrics', (
+            time.time_ns() if timestamp is None else to_epoch_ns(timestamp),
+            metrics.get('symbol'),
+            float(metrics['slippage']),
+            float(metrics['fees']),
+            float(metrics['impact']),
+            float(metrics['net_cost']),
+            float(metrics['maker_taker']),
+            float(metrics['processing_time'])
+        ))
     
     def save_performance_metrics(self, metrics: Dict[str, Any]):
-        """Save performance metrics to database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO performance_metrics 
-                (timestamp, avg_processing_time, avg_ui_update_time, 
-                 avg_ws_latency, error_rate, ticks_per_second)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.now().isoformat(),
-                metrics['statistics']['avg_processing_time'],
-                metrics['statistics']['avg_ui_update_time'],
-                metrics['statistics']['avg_ws_latency'],
-                metrics['statistics']['error_rate'],
-                metrics['ticks_per_second']
-            ))
+        """Queue performance metrics for writing"""
+        self._enqueue('performance_metrics', (
+            time.time_ns(),
+            metrics['statistics']['avg_processing_time'],
+            metrics['statistics']['avg_ui_update_time'],
+            metrics['statistics']['avg_ws_latency'],
+            metrics['statistics']['error_rate'],
+            metrics['ticks_per_second']
+        ))
+    
+    def _writer_loop(self):
+        """Drain the write queue, committing in batches"""
+        pending: Dict[str, List[Tuple]] = {}
+        pending_count = 0
+        last_commit = time.monotonic()
+        stop = False
+        
+        while not stop:
+            force = False
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_commit))
+            try:
+                item = self._queue.get(timeout=timeout if pending_count else None)
+                while True:
+                    if item is _STOP or item is _FLUSH:
+                        self._queue.task_done()
+                        stop = item is _STOP
+                        force = True
+                        break
+                    table, row = item
+                    pending.setdefault(table, []).append(row)
+                    pending_count += 1
+                    if pending_count >= self.batch_size:
+                        break
+                    # Drain whatever is already queued without waiting
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            
+            due = time.monotonic() - last_commit >= self.flush_interval
+            if pending_count and (force or due or pending_count >= self.batch_size):
+                self._commit(pending, pending_count)
+                pending = {}
+                pending_count = 0
+                last_commit = time.monotonic()
+            elif not pending_count:
+                last_commit = time.monotonic()
+    
+    def _commit(self, pending: Dict[str, List[Tuple]], count: int):
+        start = time.perf_counter()
+        try:
+            rollups = _rollup_rows(pending)
+            if self.archive is not None and 'orderbook_snapshots' in pending:
+                self._archive_snapshots(pending.pop('orderbook_snapshots'))
+            with self._write_conn as conn:
+                for table, rows in pending.items():
+                    conn.executemany(INSERT_STATEMENTS[table], rows)
+                conn.executemany(UPSERT_ROLLUP, rollups)
+            self._rows_written += count
+            self._commits += 1
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"Failed to write {count} rows: {e}")
+        finally:
+            self._commit_latencies.append((time.perf_counter() - start) * 1000)
+            for _ in range(count):
+                self._queue.task_done()
+    
+    def _archive_snapshots(self, rows: List[Tuple]):
+        archive = self.archive
+        assert archive is not None
+        for timestamp, _, symbol, mid_price, spread, depth, volume, data in rows:
+            if isinstance(data, str):
+                data = data.encode()
+            archive.append(symbol, timestamp, mid_price, spread, depth, volume, data)
+    
+    def flush(self):
+        """Commit everything queued so far and block until it is written"""
+        if not self._closed:
+            self._queue.put(_FLUSH)
+        self._queue.join()
+        if self.archive is not None:
+            self.archive.flush()
+    
+    def close(self):
+        """Flush pending writes, stop the writer thread and close connections"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        if self.archive is not None:
+            self.archive.close()
+        self._write_conn.close()
+        self._read_conn.close()
+        atexit.unregister(self.close)
+    
+    def get_writer_stats(self) -> Dict[str, float]:
+        """Queue depth and commit latency of the background writer"""
+        latencies = self._commit_latencies
+        return {
+            'queue_depth': self._queue.qsize(),
+            'rows_written': self._rows_written,
+            'commits': self._commits,
+            'avg_commit_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+            'max_commit_latency': max(latencies) if latencies else 0.0
+        }
+    
+    def iter_orderbook_levels(self,
+                              start_time: datetime,
+                              end_time: datetime,
+                              symbol: Optional[str] = None) -> Iterator[Tuple[int, str, np.ndarray, np.ndarray]]:
+        """
+        Yield ``(timestamp_ns, symbol, ask_levels, bid_levels)`` for stored
+        snapshots in time order, decoding level blobs straight to (2, n)
+        arrays. Rows without binary level data are skipped.
+        """
+        if self.archive is not None:
+            frame = self._read_archive(start_time, end_time, symbol, ['timestamp', PAYLOAD_COLUMN])
+            for timestamp, row_symbol, data in zip(frame['timestamp'].tolist(), frame['symbol'].tolist(),
+                                                   frame[PAYLOAD_COLUMN]):
+                if is_encoded_levels(data):
+                    ask_levels, bid_levels = decode_levels(data)
+                    yield timestamp, row_symbol, ask_levels, bid_levels
+            return
+        
+        sql = """
+            SELECT timestamp, symbol, data FROM orderbook_snapshots
+            WHERE timestamp BETWEEN ? AND ?
+        """
+        params: List[Any] = [to_epoch_ns(start_time), to_epoch_ns(end_time)]
+        if symbol is not None:
+            sql += " AND symbol = ?"
+            params.append(symbol)
+        sql += " ORDER BY timestamp"
+        
+        with self._read_lock:
+            rows = self._read_conn.execute(sql, params).fetchall()
+        for timestamp, row_symbol, data in rows:
+            if is_encoded_levels(data):
+                ask_levels, bid_levels = decode_levels(data)
+                yield timestamp, row_symbol, ask_levels, bid_levels
+    
+    def _read_archive(self,
+                      start_time: Union[int, str, datetime],
+                      end_time: Union[int, str, datetime],
+                      symbol: Optional[str],
+                      columns: List[str]) -> 'pd.DataFrame':
+        """Read ``columns`` plus ``symbol`` from the tick archive in time order"""
+        import pandas as pd
+        archive = self.archive
+        assert archive is not None
+        start_ns, end_ns = to_epoch_ns(start_time), to_epoch_ns(end_time)
+        columns = [column for column in columns if column != 'symbol']
+        symbols = [symbol] if symbol is not None else archive.symbols()
+        frames = []
+        for name in symbols:
+            frame = archive.read(name, start_ns, end_ns, columns)
+            frame.insert(0, 'symbol', name)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=['symbol'] + columns)
+        result = pd.concat(frames, ignore_index=True)
+        if len(symbols) > 1 and 'timestamp' in result:
+            result = result.sort_values('timestamp', kind='stable', ignore_index=True)
+        return result
+    
+    def get_aggregated_data(self,
+                            table: str,
+                            column: str,
+                            start_time: datetime,
+                            end_time: datetime,
+                            max_points: int = 1000,
+                            symbol: Optional[str] = None) -> 'pd.DataFrame':
+        """
+        Time-bucketed ``count``/``mean``/``min``/``max``/``last`` of
+        ``table.column`` with at most ``max_points`` buckets (pass the plot
+        width in pixels). Buckets of a second or more are built from the
+        rollup tables; only finer buckets scan raw rows. ``timestamp`` is
+        the bucket start in epoch nanoseconds.
+        """
+        if column not in ROLLUP_SOURCES.get(table, (None, {}))[1]:
+            raise ValueError(f"No rollups for {table}.{column}")
+        start_ns, end_ns = to_epoch_ns(start_time), to_epoch_ns(end_time)
+        bucket_ns, resolution = choose_bucket(start_ns, end_ns, max_points)
+        
+        if resolution is None:
+            raw = self._raw_series(table, column, start_ns, end_ns, symbol)
+            timestamps = raw['timestamp'].to_numpy(dtype=np.int64)
+            values = raw[column].to_numpy(dtype=np.float64)
+            return _reduce_buckets(bucket_ns, timestamps, np.ones(len(values)),
+                                   values, values, values, values, timestamps)
+        
+        sql = """
+            SELECT bucket, count, total, minimum, maximum, last, last_timestamp FROM rollups
+            WHERE source = ? AND metric = ? AND resolution = ? AND bucket BETWEEN ? AND ?
+        """
+        params: List[Any] = [table, column, resolution,
+                             start_ns - start_ns % (resolution * NS_PER_SECOND), end_ns]
+        if symbol is not None:
+            sql += " AND symbol = ?"
+            params.append(symbol)
+        with self._read_lock:
+            rows = self._read_conn.execute(sql, params).fetchall()
+        
+        if not rows:
+            return _reduce_buckets(bucket_ns, *(np.empty(0) for _ in range(7)))
+        bucket, count, total, minimum, maximum, last, last_timestamp = (
+            np.asarray(values) for values in zip(*rows)
+        )
+        return _reduce_buckets(bucket_ns, bucket, count, total, minimum, maximum, last, last_timestamp)
+    
+    def _raw_series(self,
+                    table: str,
+                    column: str,
+                    start_ns: int,
+                    end_ns: int,
+                    symbol: Optional[str]) -> 'pd.DataFrame':
+        import pandas as pd
+        if table == 'orderbook_snapshots' and self.archive is not None:
+            return self._read_archive(start_ns, end_ns, symbol, ['timestamp', column])
+        sql = f"SELECT timestamp, {column} FROM {table} WHERE timestamp BETWEEN ? AND ? AND {column} IS NOT NULL"
+        params: List[Any] = [start_ns, end_ns]
+        if symbol is not None and ROLLUP_SOURCES[table][0] is not None:
+            sql += " AND symbol = ?"
+            params.append(symbol)
+        with self._read_lock:
+            return pd.read_sql_query(sql, self._read_conn, params=params)
     
     def get_historical_data(self, 
                           start_time: datetime, 
-                          end_time: datetime) -> Dict[str, pd.DataFrame]:
-        """Retrieve historical data for analysis"""
-        with sqlite3.connect(self.db_path) as conn:
-            orderbook_data = pd.read_sql_query("""
-                SELECT * FROM orderbook_snapshots 
-                WHERE timestamp BETWEEN ? AND ?
-            """, conn, params=(start_time.isoformat(), end_time.isoformat()))
-            
-            trading_metrics = pd.read_sql_query("""
+                          end_time: datetime,
+                          symbol: Optional[str] = None,
+                          columns: Optional[List[str]] = None) -> Dict[str, 'pd.DataFrame']:
+        """
+        Retrieve historical data for analysis. Range scans use the timestamp
+        indexes; ``timestamp`` columns are epoch nanoseconds.
+        
+        ``columns`` projects the orderbook frame (e.g. ``['timestamp',
+        'spread', 'depth']``). With an archive configured the orderbook
+        frame comes from the tick archive, and book payloads (``data``) are
+        only read when explicitly requested.
+        """
+        import pandas as pd
+        params: List[Any] = [to_epoch_ns(start_time), to_epoch_ns(end_time)]
+        symbol_filter = ""
+        if symbol is not None:
+            symbol_filter = " AND symbol = ?"
+            symbol_params = params + [symbol]
+        else:
+            symbol_params = params
+        
+        if self.archive is not None:
+            orderbook_data = self._read_archive(
+                start_time, end_time, symbol, list(columns or NUMERIC_COLUMNS)
+            )
+        else:
+            projection = ", ".join(columns) if columns else "*"
+            with self._read_lock:
+                orderbook_data = pd.read_sql_query(f"""
+                    SELECT {projection} FROM orderbook_snapshots 
+                    WHERE timestamp BETWEEN ? AND ?{symbol_filter}
+                    ORDER BY timestamp
+                """, self._read_conn, params=symbol_params)
+        
+        with self._read_lock:
+            trading_metrics = pd.read_sql_query(f"""
                 SELECT * FROM trading_metrics 
-                WHERE timestamp BETWEEN ? AND ?
-            """, conn, params=(start_time.isoformat(), end_time.isoformat()))
+                WHERE timestamp BETWEEN ? AND ?{symbol_filter}
+                ORDER BY timestamp
+            """, self._read_conn, params=symbol_params)
             
             performance_metrics = pd.read_sql_query("""
                 SELECT * FROM performance_metrics 
                 WHERE timestamp BETWEEN ? AND ?
-            """, conn, params=(start_time.isoformat(), end_time.isoformat()))
+                ORDER BY timestamp
+            """, self._read_conn, params=params)
         
         return {
             'orderbook': orderbook_data,
             'trading': trading_metrics,
             'performance': performance_metrics
-        } 
\ No newline at end of file
+        }
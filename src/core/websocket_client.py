@@ -1,16 +1,82 @@
 import asyncio
+import inspect
 import json
 import logging
-from typing import Optional, Callable, Dict, Any
+import random
+import time
+from typing import Optional, Callable, Dict, Any, List
 import websockets
 from websockets.exceptions import WebSocketException
 
+from .decoder import FrameDecoder, MessageDecoder
+from .ingest import IngestQueue
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def backoff_delay(attempt: int,
+                  base: float,
+                  cap: float,
+                  rng: Callable[[float, float], float] = random.uniform) -> float:
+    """
+    Exponential backoff with "equal jitter": half of the capped exponential
+    delay is fixed and the other half random, so reconnecting clients spread
+    out without ever retrying in a tight loop.
+    """
+    delay = min(cap, base * (2 ** max(attempt - 1, 0)))
+    return delay / 2 + rng(0, delay / 2)
+
 class WebSocketClient:
-    def __init__(self, url: str):
+    def __init__(self,
+                 url: str,
+                 decoder: Optional[FrameDecoder] = None,
+                 queue_size: int = 1000,
+                 overflow_policy: str = "block",
+                 performance_analyzer=None,
+                 subscriptions: Optional[List[Dict[str, Any]]] = None,
+                 reconnect_base_delay: float = 0.1,
+                 reconnect_max_delay: float = 5.0,
+                 max_reconnect_attempts: Optional[int] = None,
+                 min_stable_time: float = 1.0,
+                 ping_interval: Optional[float] = 20.0,
+                 ping_timeout: Optional[float] = 20.0,
+                 stale_timeout: Optional[float] = 30.0,
+                 on_reconnect: Optional[Callable[[], Any]] = None):
+        """
+        Received frames are buffered in a bounded IngestQueue so a slow
+        callback never stalls ``recv()``; ``overflow_policy`` selects what
+        happens when the queue is full (block, drop_oldest or conflate).
+        ``subscriptions`` are sent as JSON after every successful connect.
+
+        Dropped connections are retried immediately, then with jittered
+        exponential backoff between ``reconnect_base_delay`` and
+        ``reconnect_max_delay`` seconds. A connection only counts as healthy,
+        resetting the backoff, once it has delivered data or stayed up for
+        ``min_stable_time`` seconds; one that flaps (connects, then closes
+        before either) is backed off like a failed connect. Protocol pings detect dead peers and
+        a connection that delivers no data for ``stale_timeout`` seconds is
+        recycled. ``on_reconnect`` runs after every successful reconnect so
+        consumers can resync their books.
+        """
         self.url = url
+        self.subscriptions = subscriptions or []
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.min_stable_time = min_stable_time
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.stale_timeout = stale_timeout
+        self.on_reconnect = on_reconnect
+        self.reconnects = 0
+        self.last_message_time = 0.0
+        self.decoder: FrameDecoder = decoder or MessageDecoder()
+        self.performance_analyzer = performance_analyzer
+        self.queue = IngestQueue(
+            maxsize=queue_size,
+            policy=overflow_policy,
+            performance_analyzer=performance_analyzer
+        )
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.callback: Optional[Callable] = None
         self.running = False
@@ -19,8 +85,15 @@ class WebSocketClient:
     async def connect(self) -> bool:
         """Establish WebSocket connection."""
         try:
-            self.websocket = await websockets.connect(self.url)
+            self.websocket = await websockets.connect(
+                self.url,
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_timeout
+            )
+            self.last_message_time = time.monotonic()
             self.logger.info(f"Connected to {self.url}")
+            if self.subscriptions:
+                await self.subscribe()
             return True
         except Exception as e:
             self.logger.error(f"Failed to connect: {e}")
@@ -31,35 +104,142 @@ class WebSocketClient:
         if not self.websocket:
             raise RuntimeError("WebSocket not connected")
         
-        # Add subscription message if required by the exchange
-        # await self.websocket.send(json.dumps({"op": "subscribe", "args": ["orderbook"]}))
+        for subscription in self.subscriptions:
+            await self.websocket.send(json.dumps(subscription))
 
-    def set_callback(self, callback: Callable[[Dict[str, Any]], None]):
-        """Set callback function for processing messages."""
+    def set_callback(self, callback: Callable[[Any], Any]):
+        """Set callback function (plain or coroutine) for processing messages."""
         self.callback = callback
 
     async def start(self):
-        """Start listening to the WebSocket feed."""
-        if not await self.connect():
-            return
-
+        """Start listening to the WebSocket feed, reconnecting until closed."""
         self.running = True
+        consumer = asyncio.create_task(self._consume())
+        attempt = 0
+        connected_before = False
+        disconnected_at: Optional[float] = None
+        try:
+            while self.running:
+                if not await self.connect():
+                    if disconnected_at is None:
+                        disconnected_at = time.monotonic()
+                    attempt += 1
+                    if not await self._back_off(attempt):
+                        break
+                    continue
+
+                if connected_before:
+                    await self._on_reconnected(time.monotonic() - disconnected_at)
+                connected_before = True
+                connected_at = time.monotonic()
+                disconnected_at = None
+
+                received = await self._read_until_disconnected()
+                disconnected_at = time.monotonic()
+                if received or disconnected_at - connected_at >= self.min_stable_time:
+                    attempt = 0
+                elif self.running:
+                    self.logger.warning("Connection closed before delivering data")
+                    attempt += 1
+                    if not await self._back_off(attempt):
+                        break
+        finally:
+            consumer.cancel()
+            await self.close()
+
+    async def _back_off(self, attempt: int) -> bool:
+        """Sleep before reconnect ``attempt``; False once the attempts are exhausted."""
+        if self.max_reconnect_attempts is not None and attempt > self.max_reconnect_attempts:
+            self.logger.error(f"Giving up after {attempt - 1} reconnect attempts")
+            return False
+        await asyncio.sleep(
+            backoff_delay(attempt, self.reconnect_base_delay, self.reconnect_max_delay)
+        )
+        return True
+
+    async def _read_until_disconnected(self) -> bool:
+        """
+        Receive frames into the ingest queue until the connection is lost.
+        Returns whether any frame arrived.
+        """
+        websocket = self.websocket
+        assert websocket is not None
+        received = False
+        watchdog = None
+        if self.stale_timeout:
+            watchdog = asyncio.create_task(self._watch_stale_connection(websocket))
         try:
             while self.running:
                 try:
-                    message = await self.websocket.recv()
-                    data = json.loads(message)
-                    if self.callback:
-                        await self.callback(data)
+                    message = await websocket.recv()
                 except websockets.exceptions.ConnectionClosed:
-                    self.logger.error("Connection closed unexpectedly")
-                    if not await self.connect():
-                        break
+                    if self.running:
+                        self.logger.error("Connection closed unexpectedly")
+                    return received
                 except Exception as e:
-                    self.logger.error(f"Error processing message: {e}")
-                    await asyncio.sleep(1)  # Prevent tight loop on errors
+                    self.logger.error(f"Connection error: {e}")
+                    await self._drop_connection()
+                    return received
+                received = True
+                self.last_message_time = time.monotonic()
+                await self.queue.put(message)
+            return received
         finally:
-            await self.close()
+            if watchdog:
+                watchdog.cancel()
+
+    async def _watch_stale_connection(self, websocket):
+        """Close a connection that has gone quiet so the supervisor reconnects."""
+        while True:
+            idle = time.monotonic() - self.last_message_time
+            if idle >= self.stale_timeout:
+                self.logger.warning(f"No data for {idle:.1f}s, recycling connection")
+                await websocket.close()
+                return
+            await asyncio.sleep(self.stale_timeout - idle)
+
+    def recycle(self, reason: str):
+        """
+        Close the current connection from synchronous code, e.g. a book
+        callback; the supervisor reconnects and resubscribes, so the venue
+        sends fresh snapshots.
+        """
+        if self.running and self.websocket is not None:
+            self.logger.warning(f"Recycling connection: {reason}")
+            asyncio.ensure_future(self._drop_connection())
+
+    async def _drop_connection(self):
+        """Close the current socket without stopping the client."""
+        if self.websocket:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+
+    async def _on_reconnected(self, downtime: float):
+        self.reconnects += 1
+        self.logger.info(f"Reconnected after {downtime:.2f}s")
+        if self.performance_analyzer:
+            self.performance_analyzer.record_reconnect(downtime)
+        if self.on_reconnect:
+            result = self.on_reconnect()
+            if inspect.isawaitable(result):
+                await result
+
+    async def _consume(self):
+        """Drain the ingest queue, decoding and dispatching each frame."""
+        while True:
+            message = await self.queue.get()
+            try:
+                data = self.decoder.loads(message)
+                if self.callback:
+                    result = self.callback(data)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception as e:
+                self.logger.error(f"Error processing message: {e}")
+                if self.performance_analyzer:
+                    self.performance_analyzer.record_error()
 
     async def close(self):
         """Close the WebSocket connection."""
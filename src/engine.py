@@ -0,0 +1,359 @@
+"""
+Headless simulation engine: WebSocket feeds -> orderbook processing ->
+slippage / market impact / maker-taker models -> fees -> storage.
+
+Runs without any Qt dependency. GUIs attach as subscribers receiving the
+per-tick metrics dict; servers run it directly:
+
+    python -m src.engine --symbols BTC-USDT-SWAP ETH-USDT-SWAP --duration 60
+
+or replay a recorded session through the same pipeline:
+
+    python -m src.engine --replay capture.jsonl --speed 10
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from .config.settings import TradingConfig
+from .core.connection_manager import ConnectionManager, StreamSpec
+from .core.performance import PerformanceAnalyzer
+from .core.replay import ReplayEvent, Replayer, ReplayStats, iter_capture_file, iter_storage_snapshots
+from .core.snapshot_slot import LatestSlot
+from .core.storage import TradingDataStorage
+from .models.cost_ladder import CostLadderEngine
+from .models.fill_simulator import FillSimulator
+from .models.maker_taker import MakerTakerPredictor, touch_maker_proxy
+from .models.market_impact import AlmgrenChrissModel, MarketImpactParams
+from .models.slippage import SlippageEstimator
+from .models.volatility import RealizedVolatility
+from .sharding import ShardedEngine
+
+class SimulationEngine:
+    def __init__(self,
+                 config: Optional[TradingConfig] = None,
+                 storage: Optional[TradingDataStorage] = None,
+                 quantity: Optional[float] = None,
+                 volatility: Optional[float] = None,
+                 fee_tier: str = "Tier 1",
+                 record_orderbooks: bool = True,
+                 connections: Optional[ConnectionManager] = None):
+        """
+        ``quantity`` is the simulated market order size in USD and defaults,
+        like ``volatility``, to the config. With ``config.live_volatility``
+        sigma comes from a per-symbol RealizedVolatility once it has warmed
+        up, and ``volatility`` is only the fallback. Every processed book
+        produces a metrics dict that is written to ``storage`` (when given)
+        and passed to each subscriber; with ``record_orderbooks`` the books
+        are stored too.
+        """
+        self.config = config or TradingConfig()
+        if fee_tier not in self.config.fee_tiers:
+            raise ValueError(f"Unknown fee tier: {fee_tier}")
+        self.storage = storage
+        self.quantity = quantity if quantity is not None else self.config.default_quantity
+        self.volatility = volatility if volatility is not None else self.config.default_volatility
+        self.fee_tier = fee_tier
+        self.record_orderbooks = record_orderbooks
+        self.logger = logging.getLogger('engine')
+
+        self.performance_analyzer = PerformanceAnalyzer(window_size=self.config.performance_window)
+        self.connections = connections or ConnectionManager.from_config(
+            self.config, performance_analyzer=self.performance_analyzer
+        )
+        self.connections.set_callback(self.on_orderbook)
+
+        # Per-symbol model state
+        self.slippage_estimators: Dict[str, SlippageEstimator] = {}
+        self.maker_taker_predictors: Dict[str, MakerTakerPredictor] = {}
+        self.volatility_estimators: Dict[str, RealizedVolatility] = {}
+        self.cost_ladder = CostLadderEngine.from_config(self.config) if self.config.cost_ladder_enabled else None
+        # Extra sizes walked every tick so the slippage fallback learns the whole size curve
+        self.slippage_training_quantities = np.asarray(self.config.cost_ladder_quantities, dtype=np.float64)
+        self.subscribers: List[Callable[[Dict[str, Any]], Any]] = []
+        self.latest: Dict[str, Dict[str, Any]] = {}
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Any]):
+        """Register a callback (plain or coroutine) receiving each metrics dict"""
+        self.subscribers.append(callback)
+
+    def set_parameters(self,
+                       quantity: Optional[float] = None,
+                       volatility: Optional[float] = None,
+                       fee_tier: Optional[str] = None):
+        """Change simulation inputs; applies from the next tick"""
+        if fee_tier is not None:
+            if fee_tier not in self.config.fee_tiers:
+                raise ValueError(f"Unknown fee tier: {fee_tier}")
+            self.fee_tier = fee_tier
+        if quantity is not None:
+            self.quantity = quantity
+        if volatility is not None:
+            self.volatility = volatility
+
+    def compute_metrics(self, orderbook) -> Optional[Dict[str, Any]]:
+        """Estimate the cost of a ``quantity`` USD market buy against one book"""
+        start_time = self.performance_analyzer.start_processing()
+        mid_price = orderbook.mid_price
+        if mid_price <= 0:
+            return None
+        symbol = orderbook.symbol
+        base_quantity = self.quantity / mid_price
+
+        sigma = self.volatility
+        if self.config.live_volatility:
+            realized = self.volatility_estimators.get(symbol)
+            if realized is None:
+                realized = self.volatility_estimators[symbol] = RealizedVolatility(
+                    self.config.volatility_windows, self.config.volatility_halflives,
+                    tick_rate=self.config.volatility_tick_rate
+                )
+            realized.update(mid_price, orderbook.timestamp.timestamp())
+            sigma = realized.sigma(self.volatility)
+
+        # Walk the asks for the order and the training sizes in one pass; the estimator learns from them
+        simulator = FillSimulator(orderbook)
+        fills = simulator.simulate_batch(np.append(self.slippage_training_quantities, self.quantity),
+                                         side="buy", unit="quote")
+        fill = fills[len(fills) - 1]
+        estimator = self.slippage_estimators.get(symbol)
+        if estimator is None:
+            estimator = self.slippage_estimators[symbol] = SlippageEstimator(mode="online")
+        complete = fills.complete
+        for filled, walked in zip(fills.filled_quantity[complete].tolist(), fills.slippage_bps[complete].tolist()):
+            estimator.observe(mid_price, filled, walked)
+        if not complete.all():
+            # Every size deeper than the book walks all of it: one point for the whole book
+            deepest = int(np.argmin(complete))
+            estimator.observe(mid_price, float(fills.filled_quantity[deepest]), float(fills.slippage_bps[deepest]))
+        # Orders deeper than the visible book fall back to the fitted model
+        slippage = fill.slippage_bps if fill.complete else estimator.predict_slippage(base_quantity)
+
+        impact_model = AlmgrenChrissModel(MarketImpactParams(
+            eta=self.config.market_impact_eta,
+            gamma=self.config.market_impact_gamma,
+            sigma=sigma,
+            tau=self.config.time_horizon,
+            initial_price=mid_price,
+            total_quantity=base_quantity
+        ))
+        impact = impact_model.calculate_market_impact(base_quantity, self.config.time_horizon)
+
+        liquidity = orderbook.liquidity.summary(self.config.liquidity_levels, self.config.liquidity_bands_bps)
+
+        predictor = self.maker_taker_predictors.get(symbol)
+        if predictor is None:
+            predictor = self.maker_taker_predictors[symbol] = MakerTakerPredictor()
+        features = (orderbook.spread, orderbook.depth, orderbook.total_volume, sigma)
+        maker_proportion = predictor.predict_maker_proportion(*features)
+        # Train after predicting, so the served value is out of sample
+        predictor.update(*features, touch_maker_proxy(*orderbook.liquidity.depth_at_levels(1)))
+
+        # Market orders pay the taker fee of the selected tier
+        fees = self.quantity * self.config.fee_tiers[self.fee_tier]
+        net_cost = self.quantity * (slippage + impact) / 10000 + fees
+
+        metrics = {
+            'timestamp': orderbook.timestamp,
+            'exchange': orderbook.exchange,
+            'symbol': symbol,
+            'mid_price': mid_price,
+            'spread': orderbook.spread,
+            'depth': orderbook.depth,
+            'volume': orderbook.total_volume,
+            'slippage': slippage,
+            'fill_complete': fill.complete,
+            'fees': fees,
+            'impact': impact,
+            'net_cost': net_cost,
+            'maker_taker': maker_proportion * 100,
+            'volatility': sigma,
+            'liquidity': liquidity
+        }
+        if self.cost_ladder is not None:
+            # Shares the book's prefix sums, sigma and maker/taker prediction with the single order
+            metrics['cost_ladder'] = self.cost_ladder.compute(orderbook, sigma, maker_proportion,
+                                                              estimator, simulator)
+
+        self.performance_analyzer.end_processing(start_time)
+        metrics['processing_time'] = (time.time() - start_time) * 1000
+        return metrics
+
+    async def on_orderbook(self, stream: StreamSpec, orderbook):
+        """ConnectionManager callback: compute, store and publish one tick"""
+        try:
+            metrics = self.compute_metrics(orderbook)
+        except Exception as e:
+            self.logger.error(f"Error computing metrics for {stream.symbol}: {e}")
+            self.performance_analyzer.record_error()
+            return
+        if metrics is None:
+            return
+        self.latest[stream.symbol] = metrics
+
+        if self.storage is not None:
+            self.storage.save_trading_metrics(metrics)
+            if self.record_orderbooks:
+                self.storage.save_orderbook_snapshot({
+                    'timestamp': orderbook.timestamp,
+                    'exchange': orderbook.exchange,
+                    'symbol': orderbook.symbol,
+                    'mid_price': metrics['mid_price'],
+                    'spread': metrics['spread'],
+                    'depth': orderbook.depth,
+                    'volume': orderbook.total_volume,
+                    'data': orderbook
+                })
+
+        for callback in self.subscribers:
+            try:
+                result = callback(metrics)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"Subscriber failed: {e}")
+
+    async def _report_performance(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            if self.storage is not None:
+                self.storage.save_performance_metrics(self.performance_analyzer.get_performance_report())
+
+    async def run(self, duration: Optional[float] = None, performance_interval: float = 5.0):
+        """Stream until cancelled, or for ``duration`` seconds"""
+        reporter = asyncio.ensure_future(self._report_performance(performance_interval))
+        try:
+            if duration is None:
+                await self.connections.start()
+            else:
+                try:
+                    await asyncio.wait_for(self.connections.start(), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            reporter.cancel()
+            await self.close()
+
+    async def replay(self, events: Iterable[ReplayEvent], speed: Optional[float] = None) -> ReplayStats:
+        """
+        Feed recorded events (see ``core.replay``) through the pipeline
+        instead of the live feed, as fast as possible or at ``speed`` times
+        wall-clock. Returns throughput statistics.
+        """
+        stats = await Replayer(self.connections, speed=speed).run(events)
+        if self.storage is not None:
+            self.storage.flush()
+        return stats
+    
+    async def close(self):
+        """Close feeds and flush storage; the storage itself stays open for its owner"""
+        await self.connections.close()
+        if self.storage is not None:
+            self.storage.flush()
+
+def _format_metrics(metrics: Dict[str, Any]) -> str:
+    return (f"{metrics['symbol']} mid={metrics['mid_price']:.2f} "
+            f"slippage={metrics['slippage']:.2f}bps impact={metrics['impact']:.4f}bps "
+            f"fees={metrics['fees']:.4f} net_cost={metrics['net_cost']:.4f} "
+            f"maker={metrics['maker_taker']:.1f}% latency={metrics['processing_time']:.3f}ms")
+
+async def _print_latest(slot: LatestSlot, interval: float):
+    # One line per symbol per interval, however fast the feed runs
+    while True:
+        await asyncio.sleep(interval)
+        latest = slot.take()
+        if latest:
+            for metrics in latest.values():
+                print(_format_metrics(metrics), flush=True)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the trade cost simulator without a GUI")
+    parser.add_argument("--config", type=str, default=None, help="TradingConfig JSON file")
+    parser.add_argument("--symbols", nargs="+", default=None)
+    parser.add_argument("--quantity", type=float, default=None, help="order size in USD")
+    parser.add_argument("--volatility", type=float, default=None)
+    parser.add_argument("--live-volatility", action="store_true",
+                        help="estimate sigma from the mid-price stream (--volatility is the warm-up fallback)")
+    parser.add_argument("--fee-tier", type=str, default="Tier 1")
+    parser.add_argument("--db", type=str, default="data/trading.db")
+    parser.add_argument("--no-storage", action="store_true")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run (default: forever)")
+    parser.add_argument("--print-interval", type=float, default=1.0)
+    parser.add_argument("--replay", type=str, default=None, metavar="CAPTURE",
+                        help="replay a capture file (one raw frame per line) instead of connecting")
+    parser.add_argument("--replay-db", type=str, default=None, metavar="DB",
+                        help="replay orderbook_snapshots from a storage database")
+    parser.add_argument("--start", type=str, default="1970-01-01T00:00:00+00:00", help="--replay-db range start (ISO)")
+    parser.add_argument("--end", type=str, default="2100-01-01T00:00:00+00:00", help="--replay-db range end (ISO)")
+    parser.add_argument("--speed", type=float, default=None, help="replay speed multiple (default: as fast as possible)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="shard symbols across this many processes (default: config worker_processes)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    config = TradingConfig.load_from_file(args.config) if args.config else TradingConfig()
+    if args.symbols:
+        config.symbols = args.symbols
+    if args.live_volatility:
+        config.live_volatility = True
+    workers = args.workers or config.worker_processes
+    if workers > 1 and (args.replay or args.replay_db):
+        parser.error("--workers applies to live feeds only")
+    if args.replay_db and not args.no_storage and os.path.realpath(args.replay_db) == os.path.realpath(args.db):
+        # Replayed ticks would be stored into the table being replayed
+        parser.error("--replay-db and --db are the same database; pass another --db or --no-storage")
+    storage = None if args.no_storage else TradingDataStorage(args.db)
+    engine: Union[ShardedEngine, SimulationEngine]
+    if workers > 1:
+        engine = ShardedEngine(config, workers=workers, storage=storage, quantity=args.quantity,
+                               volatility=args.volatility, fee_tier=args.fee_tier)
+    else:
+        engine = SimulationEngine(config, storage=storage, quantity=args.quantity,
+                                  volatility=args.volatility, fee_tier=args.fee_tier)
+
+    slot = LatestSlot()
+    engine.subscribe(lambda metrics: slot.publish(dict(engine.latest)))
+
+    async def run():
+        printer = asyncio.ensure_future(_print_latest(slot, args.print_interval))
+        try:
+            if args.replay or args.replay_db:
+                await replay()
+            else:
+                await engine.run(duration=args.duration)
+        finally:
+            printer.cancel()
+            if storage is not None:
+                storage.close()
+
+    async def replay():
+        if args.replay:
+            events = iter_capture_file(args.replay)
+            stats = await engine.replay(events, speed=args.speed)
+        else:
+            source = TradingDataStorage(args.replay_db)
+            try:
+                events = iter_storage_snapshots(source, datetime.fromisoformat(args.start),
+                                                datetime.fromisoformat(args.end))
+                stats = await engine.replay(events, speed=args.speed)
+            finally:
+                source.close()
+        print(json.dumps(stats.to_dict(), indent=2))
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    report = engine.performance_analyzer.get_performance_report()
+    print(json.dumps({key: value for key, value in report.items() if key != 'statistics'}, indent=2))
+
+if __name__ == "__main__":
+    main()
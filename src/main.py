@@ -1,22 +1,34 @@
 import sys
 import asyncio
-import json
+from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QComboBox, QPushButton, QGroupBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 import qasync
-import websockets
 
-WS_URL = "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/BTC-USDT-SWAP"
+if __package__ in (None, ""):
+    # Support ``python src/main.py`` as well as ``python -m src.main``
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config.settings import TradingConfig
+from src.core.snapshot_slot import LatestSlot
+from src.engine import SimulationEngine
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("GoQuant Trading Simulator")
         self.setMinimumSize(1200, 800)
+        self.config = TradingConfig()
         self._setup_ui()
+        # Ticks only replace the latest metrics; outputs refresh at ui_refresh_hz
+        self._metrics_slot = LatestSlot()
+        self._render_timer = QTimer(self)
+        self._render_timer.setInterval(int(1000 / self.config.ui_refresh_hz))
+        self._render_timer.timeout.connect(self._render)
+        self._render_timer.start()
 
     def _setup_ui(self):
         main_widget = QWidget()
@@ -77,25 +89,37 @@ class MainWindow(QMainWindow):
         layout.addStretch()
         return panel
 
-    def update_outputs(self, data):
-        # Dummy calculations for demonstration
+    def publish_metrics(self, metrics):
+        self._metrics_slot.publish(metrics)
+
+    def _render(self):
+        metrics = self._metrics_slot.take()
+        if metrics is not None:
+            self.update_outputs(metrics)
+
+    def update_outputs(self, metrics):
         self.status_label.setText("Status: Receiving data")
-        self.slippage_label.setText(f"Expected Slippage: {round(float(data['bids'][0][0]) * 0.0001, 4)} bps")
-        self.fees_label.setText(f"Expected Fees: {round(float(self.quantity_input.text()) * 0.001, 4)} USD")
-        self.impact_label.setText(f"Market Impact: {round(float(data['asks'][0][0]) * 0.0002, 4)} bps")
-        self.net_cost_label.setText(f"Net Cost: {round(float(self.quantity_input.text()) * 1.001, 4)} USD")
-        self.maker_taker_label.setText("Maker/Taker: 50/50")
-        self.latency_label.setText("Internal Latency: <1ms")
+        self.slippage_label.setText(f"Expected Slippage: {metrics['slippage']:.4f} bps")
+        self.fees_label.setText(f"Expected Fees: {metrics['fees']:.4f} USD")
+        self.impact_label.setText(f"Market Impact: {metrics['impact']:.4f} bps")
+        self.net_cost_label.setText(f"Net Cost: {metrics['net_cost']:.4f} USD")
+        self.maker_taker_label.setText(f"Maker/Taker: {metrics['maker_taker']:.1f}% maker")
+        self.latency_label.setText(f"Internal Latency: {metrics['processing_time']:.3f} ms")
 
-async def run_websocket(window: MainWindow):
+async def run_engine(window: MainWindow):
     window.status_label.setText("Status: Connecting...")
+    # The window only shows the latest book, so stale frames are conflated
+    config = TradingConfig(symbols=[window.asset_combo.currentText()], ingest_queue_size=1,
+                           ingest_overflow_policy="conflate")
+    engine = SimulationEngine(
+        config,
+        quantity=float(window.quantity_input.text()),
+        volatility=float(window.volatility_input.text()),
+        fee_tier=window.fee_tier_combo.currentText()
+    )
+    engine.subscribe(window.publish_metrics)
     try:
-        async with websockets.connect(WS_URL) as ws:
-            window.status_label.setText("Status: Connected!")
-            async for message in ws:
-                data = json.loads(message)
-                window.update_outputs(data)
-                await asyncio.sleep(0.1)
+        await engine.run()
     except Exception as e:
         window.status_label.setText(f"Error: {e}")
 
@@ -107,7 +131,7 @@ def main():
     window.show()
 
     def on_start():
-        asyncio.create_task(run_websocket(window))
+        asyncio.create_task(run_engine(window))
 
     window.control_button.clicked.connect(on_start)
 
@@ -0,0 +1,139 @@
+import numpy as np
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .fill_simulator import FillSimulator
+from .market_impact import AlmgrenChrissModel, MarketImpactParams
+from .slippage import SlippageEstimator
+
+@dataclass
+class CostLadder:
+    timestamp: datetime
+    symbol: str
+    mid_price: float
+    quantities: np.ndarray  # USD order sizes, shape (sizes,)
+    fee_tiers: Tuple[str, ...]
+    slippage: np.ndarray  # bps, shape (sizes,)
+    impact: np.ndarray  # bps, shape (sizes,)
+    fill_complete: np.ndarray  # False where the order is deeper than the visible book
+    maker_taker: float  # predicted maker proportion in percent, shared by all sizes; informational only
+    fees: np.ndarray  # USD, shape (sizes, tiers)
+    net_cost: np.ndarray  # USD, shape (sizes, tiers)
+
+    def tier(self, name: str) -> Dict[str, np.ndarray]:
+        """Columns of one fee tier's ladder"""
+        j = self.fee_tiers.index(name)
+        return {
+            'quantity': self.quantities,
+            'slippage': self.slippage,
+            'impact': self.impact,
+            'fees': self.fees[:, j],
+            'net_cost': self.net_cost[:, j]
+        }
+
+    def to_records(self) -> List[Dict[str, Union[float, str, bool]]]:
+        """One dict per (size, tier) cell, e.g. for JSON output"""
+        return [
+            {
+                'quantity': float(quantity),
+                'fee_tier': name,
+                'slippage': float(self.slippage[i]),
+                'impact': float(self.impact[i]),
+                'fees': float(self.fees[i, j]),
+                'net_cost': float(self.net_cost[i, j]),
+                'fill_complete': bool(self.fill_complete[i])
+            }
+            for i, quantity in enumerate(self.quantities)
+            for j, name in enumerate(self.fee_tiers)
+        ]
+
+class CostLadderEngine:
+    """
+    Transaction-cost grid of market buys (sizes x fee tiers) from one book.
+
+    Per tick the shared pieces are computed once: the book's cached
+    liquidity prefix sums (one searchsorted resolves every size), a single
+    Almgren-Chriss model evaluated over the size vector, and the maker/taker
+    prediction, which depends on the book rather than the order size.
+    Fees and net cost are then an outer product over the fee-rate vector.
+
+    Every size is costed as a market order paying the tier's taker rate.
+    ``maker_taker`` is reported alongside but does not enter fees or net
+    cost: the fee tiers carry no maker rates to blend with.
+    """
+
+    def __init__(self,
+                 quantities: Sequence[float],
+                 fee_tiers: Dict[str, float],
+                 eta: float,
+                 gamma: float,
+                 time_horizon: float):
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+        self.fee_tiers = tuple(fee_tiers)
+        self.fee_rates = np.array([fee_tiers[name] for name in self.fee_tiers], dtype=np.float64)
+        self.eta = eta
+        self.gamma = gamma
+        self.time_horizon = time_horizon
+        # Fees do not depend on the book: (sizes, tiers), computed once
+        self.fees = np.outer(self.quantities, self.fee_rates)
+
+    @classmethod
+    def from_config(cls, config) -> 'CostLadderEngine':
+        return cls(
+            quantities=config.cost_ladder_quantities,
+            fee_tiers=config.fee_tiers,
+            eta=config.market_impact_eta,
+            gamma=config.market_impact_gamma,
+            time_horizon=config.time_horizon
+        )
+
+    def compute(self,
+                orderbook,
+                sigma: float,
+                maker_proportion: float,
+                slippage_model: Optional[SlippageEstimator] = None,
+                fill: Optional[FillSimulator] = None) -> Optional[CostLadder]:
+        """
+        Cost ladder for ``orderbook``. Sizes deeper than the visible book use
+        ``slippage_model`` when given (their walked slippage otherwise). Pass
+        the tick's ``fill`` simulator to share it with the caller.
+        """
+        mid_price = orderbook.mid_price
+        if mid_price <= 0:
+            return None
+        fills = (fill or FillSimulator(orderbook)).simulate_batch(self.quantities, side="buy", unit="quote")
+        slippage = fills.slippage_bps
+        base_quantities = self.quantities / mid_price
+        if slippage_model is not None and not fills.complete.all():
+            slippage = slippage.copy()
+            for i in np.flatnonzero(~fills.complete):
+                slippage[i] = slippage_model.predict_slippage(base_quantities[i])
+
+        impact_model = AlmgrenChrissModel(MarketImpactParams(
+            eta=self.eta,
+            gamma=self.gamma,
+            sigma=sigma,
+            tau=self.time_horizon,
+            initial_price=mid_price,
+            total_quantity=float(base_quantities[-1]) if len(base_quantities) else 0.0
+        ))
+        impact = impact_model.calculate_market_impact_batch(base_quantities, self.time_horizon)
+
+        # Same formula as the single-order metrics: q * (slippage + impact) bps + fees
+        variable = self.quantities * (slippage + impact) / 10000
+        net_cost = variable[:, None] + self.fees
+
+        return CostLadder(
+            timestamp=orderbook.timestamp,
+            symbol=orderbook.symbol,
+            mid_price=mid_price,
+            quantities=self.quantities,
+            fee_tiers=self.fee_tiers,
+            slippage=slippage,
+            impact=impact,
+            fill_complete=fills.complete,
+            maker_taker=maker_proportion * 100,
+            fees=self.fees,
+            net_cost=net_cost
+        )
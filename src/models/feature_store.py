@@ -0,0 +1,131 @@
+import time
+import numpy as np
+from typing import Callable, Dict, Optional, Sequence, Union
+
+class RingBuffer:
+    """
+    Fixed-capacity, preallocated column-major ring buffer.
+
+    Every row is written twice, at ``i`` and ``i + capacity``, so the retained
+    window is always one contiguous slice of the backing array and views
+    are returned without copying. Appends are O(n_columns).
+    """
+
+    def __init__(self, capacity: int, n_columns: int = 1, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.n_columns = n_columns
+        self._data = np.zeros((n_columns, 2 * capacity), dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, row: Union[float, Sequence[float], np.ndarray]):
+        """Append one row, overwriting the oldest when full"""
+        end = self._start + self._size
+        if end >= self.capacity:
+            end -= self.capacity
+        self._data[:, end] = row
+        self._data[:, end + self.capacity] = row
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = self._start + 1 if self._start + 1 < self.capacity else 0
+
+    def drop_oldest(self, count: int):
+        """Discard the ``count`` oldest rows"""
+        count = min(count, self._size)
+        self._start = (self._start + count) % self.capacity
+        self._size -= count
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def view(self) -> np.ndarray:
+        """Read-only (n_columns, len) view of the window, oldest first"""
+        window = self._data[:, self._start:self._start + self._size]
+        window.flags.writeable = False
+        return window
+
+    def column(self, index: int) -> np.ndarray:
+        """Contiguous read-only view of one column, oldest first"""
+        return self.view()[index]
+
+    def last(self) -> np.ndarray:
+        if self._size == 0:
+            raise IndexError("RingBuffer is empty")
+        return self.view()[:, -1]
+
+class FeatureStore:
+    """
+    Named-column sliding window of model features backed by a RingBuffer.
+
+    The window is bounded by ``capacity`` samples and, optionally, by
+    ``max_age`` seconds measured on the sample timestamps. Column and
+    feature-matrix accessors return zero-copy views, so building training
+    data no longer walks Python lists.
+    """
+
+    def __init__(self,
+                 columns: Sequence[str],
+                 capacity: int = 10000,
+                 max_age: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        self.columns = tuple(columns)
+        self.max_age = max_age
+        self.clock = clock
+        self._index: Dict[str, int] = {name: i + 1 for i, name in enumerate(self.columns)}
+        self._buffer = RingBuffer(capacity, len(self.columns) + 1)  # row 0 holds timestamps
+        self._row = np.empty(len(self.columns) + 1, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.capacity
+
+    def append(self, values: Sequence[float], timestamp: Optional[float] = None):
+        """Append one sample given in column order"""
+        now = self.clock() if timestamp is None else timestamp
+        self._row[0] = now
+        self._row[1:] = values
+        self._buffer.append(self._row)
+        if self.max_age is not None:
+            self.expire(now)
+
+    def expire(self, now: Optional[float] = None):
+        """Drop samples older than ``max_age`` seconds"""
+        if self.max_age is None or len(self._buffer) == 0:
+            return
+        now = self.clock() if now is None else now
+        stale = int(np.searchsorted(self._buffer.column(0), now - self.max_age, side="left"))
+        if stale:
+            self._buffer.drop_oldest(stale)
+
+    def timestamps(self) -> np.ndarray:
+        return self._buffer.column(0)
+
+    def column(self, name: str) -> np.ndarray:
+        """Contiguous view of a single feature column"""
+        return self._buffer.column(self._index[name])
+
+    def matrix(self, *names: str) -> np.ndarray:
+        """
+        (n_samples, n_features) view for training. Adjacent columns in store
+        order are returned without copying (Fortran-ordered); any other
+        selection is gathered into a new array.
+        """
+        names = names or self.columns
+        indices = [self._index[name] for name in names]
+        view = self._buffer.view()
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return view[indices[0]:indices[-1] + 1].T
+        return view[indices].T
+
+    def clear(self):
+        self._buffer.clear()
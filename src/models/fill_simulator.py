@@ -0,0 +1,132 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Union
+
+ArrayLike = Union[float, np.ndarray, List[float]]
+
+SIDES = ("buy", "sell")
+UNITS = ("base", "quote")
+
+@dataclass
+class FillResult:
+    side: str
+    requested: float  # order size in ``unit``
+    unit: str
+    filled_quantity: float  # base currency
+    notional: float  # quote currency
+    vwap: float
+    levels_consumed: int
+    worst_price: float
+    mid_price: float
+    slippage_bps: float  # cost vs mid, positive when the fill is worse than mid
+    complete: bool  # False when the visible book is too thin for the order
+
+@dataclass
+class BatchFillResult:
+    side: str
+    unit: str
+    requested: np.ndarray
+    filled_quantity: np.ndarray
+    notional: np.ndarray
+    vwap: np.ndarray
+    levels_consumed: np.ndarray
+    worst_price: np.ndarray
+    mid_price: float
+    slippage_bps: np.ndarray
+    complete: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.requested)
+
+    def __getitem__(self, i: int) -> FillResult:
+        return FillResult(
+            side=self.side,
+            requested=float(self.requested[i]),
+            unit=self.unit,
+            filled_quantity=float(self.filled_quantity[i]),
+            notional=float(self.notional[i]),
+            vwap=float(self.vwap[i]),
+            levels_consumed=int(self.levels_consumed[i]),
+            worst_price=float(self.worst_price[i]),
+            mid_price=self.mid_price,
+            slippage_bps=float(self.slippage_bps[i]),
+            complete=bool(self.complete[i])
+        )
+
+class FillSimulator:
+    """
+    Market order fills against one orderbook by walking visible depth.
+
+    Cumulative quantity and notional per side come from the book's cached
+    LiquidityProfile (prefix sums); each order size is then resolved with a
+    binary search on the cumulative quantity (``unit="base"``) or notional
+    (``unit="quote"``), so a batch of sizes costs O(m log n). Accepts an
+    ArrayOrderBook or a list-based OrderBook.
+    """
+
+    def __init__(self, book):
+        self.book = book
+        self.profile = book.liquidity
+        self.mid_price = self.profile.mid_price
+
+    def simulate(self, quantity: float, side: str = "buy", unit: str = "base") -> FillResult:
+        """Fill one market order of ``quantity`` (base or quote units)"""
+        return self.simulate_batch([quantity], side, unit)[0]
+
+    def simulate_batch(self, quantities: ArrayLike, side: str = "buy", unit: str = "base") -> BatchFillResult:
+        """Fill many order sizes against the same book in one vectorized pass"""
+        if side not in SIDES:
+            raise ValueError(f"Unknown side: {side}")
+        if unit not in UNITS:
+            raise ValueError(f"Unknown unit: {unit}")
+        requested = np.atleast_1d(np.asarray(quantities, dtype=np.float64))
+        prices, cum_quantity, cum_notional = self.profile.prefix_sums("ask" if side == "buy" else "bid")
+        n_levels = len(prices)
+
+        if n_levels == 0:
+            empty = np.zeros_like(requested)
+            nan = np.full_like(requested, np.nan)
+            return BatchFillResult(side, unit, requested, empty, empty, nan,
+                                   empty.astype(np.int64), nan, self.mid_price, nan, requested <= 0)
+
+        cumulative = cum_quantity if unit == "base" else cum_notional
+        # First level whose cumulative depth covers the order
+        index = np.searchsorted(cumulative, requested, side="left")
+        complete = index < n_levels
+        last = np.minimum(index, n_levels - 1)
+        previous = last - 1
+        before_quantity = np.where(previous >= 0, cum_quantity[previous], 0.0)
+        before_notional = np.where(previous >= 0, cum_notional[previous], 0.0)
+
+        if unit == "base":
+            remaining = requested - before_quantity
+            filled = np.where(complete, requested, cum_quantity[-1])
+            notional = np.where(complete, before_notional + remaining * prices[last], cum_notional[-1])
+        else:
+            remaining = requested - before_notional
+            filled = np.where(complete, before_quantity + remaining / prices[last], cum_quantity[-1])
+            notional = np.where(complete, requested, cum_notional[-1])
+
+        active = requested > 0
+        filled = np.where(active, filled, 0.0)
+        notional = np.where(active, notional, 0.0)
+        levels_consumed = np.where(active, last + 1, 0)
+        worst_price = np.where(active, prices[last], np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = np.where(active, notional / filled, np.nan)
+        direction = 1.0 if side == "buy" else -1.0
+        slippage_bps = direction * (vwap - self.mid_price) / self.mid_price * 10000
+
+        return BatchFillResult(
+            side=side,
+            unit=unit,
+            requested=requested,
+            filled_quantity=filled,
+            notional=notional,
+            vwap=vwap,
+            levels_consumed=levels_consumed,
+            worst_price=worst_price,
+            mid_price=self.mid_price,
+            slippage_bps=slippage_bps,
+            complete=complete | ~active
+        )
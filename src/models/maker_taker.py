@@ -1,7 +1,14 @@
+import logging
+import threading
+import time
 import numpy as np
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import List, Tuple
-from sklearn.linear_model import LogisticRegression
+from typing import Dict, Optional
+
+from .feature_store import FeatureStore
+
+FEATURE_COLUMNS = ("spread", "depth", "volume", "volatility")
 
 @dataclass
 class OrderBookSnapshot:
@@ -11,11 +18,111 @@ class OrderBookSnapshot:
     volume: float
     volatility: float
 
+@dataclass(frozen=True)
+class LogisticCoefficients:
+    """Fitted weights in raw feature units, served without touching sklearn"""
+    coef: np.ndarray
+    intercept: float
+    n_samples: int
+    fitted_at: float
+    fit_duration_ms: float
+
+def fit_logistic(X: np.ndarray, y: np.ndarray) -> LogisticCoefficients:
+    """
+    Fit a fractional logistic regression of maker proportion on features.
+
+    Each sample is presented once as a maker (label 1, weight p) and once as
+    a taker (label 0, weight 1 - p), which fits proportions in [0, 1]
+    directly. Features are standardized for the solver and the scaling is
+    folded back into the returned coefficients. Module-level so it can run
+    in a process pool.
+    """
+    from sklearn.linear_model import LogisticRegression  # deferred: heavy import, only needed to fit
+    
+    start = time.perf_counter()
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = (X - mean) / std
+    n = len(y)
+    
+    model = LogisticRegression()
+    model.fit(
+        np.vstack([Z, Z]),
+        np.concatenate([np.ones(n), np.zeros(n)]),
+        sample_weight=np.concatenate([y, 1.0 - y])
+    )
+    
+    coef = model.coef_[0] / std
+    intercept = float(model.intercept_[0] - np.dot(coef, mean))
+    return LogisticCoefficients(
+        coef=coef,
+        intercept=intercept,
+        n_samples=n,
+        fitted_at=time.time(),
+        fit_duration_ms=(time.perf_counter() - start) * 1000
+    )
+
+def touch_maker_proxy(bid_queue: float, ask_queue: float) -> float:
+    """
+    Observable stand-in for the maker share of a buy order: the ask share
+    of the quantity at the touch. A buy resting at the bid fills passively
+    when sellers cross, which is likelier with heavy offers and a short bid
+    queue ahead of it. Used as the training label when no fills are seen.
+    """
+    total = bid_queue + ask_queue
+    return ask_queue / total if total > 0 else 0.5
+
+_default_executor: Optional[ThreadPoolExecutor] = None
+_default_executor_lock = threading.Lock()
+
+def _get_default_executor() -> ThreadPoolExecutor:
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(thread_name_prefix="maker-taker-fit")
+        return _default_executor
+
 class MakerTakerPredictor:
-    def __init__(self):
-        self.model = LogisticRegression()
-        self.orderbook_history: List[OrderBookSnapshot] = []
-        self.maker_taker_history: List[float] = []  # Proportion of maker orders
+    def __init__(self,
+                 max_history: int = 10000,
+                 max_age: Optional[float] = None,
+                 retrain_every: int = 100,
+                 retrain_interval: float = 5.0,
+                 background: bool = True,
+                 executor: Optional[Executor] = None):
+        """
+        Training is decoupled from inference: a retrain is scheduled after
+        ``retrain_every`` new samples or ``retrain_interval`` seconds
+        (whichever comes first, at most one in flight) and runs on
+        ``executor`` (a shared thread pool by default, or inline when
+        ``background=False``). Predictions use the last fitted coefficients.
+        """
+        self.retrain_every = retrain_every
+        self.retrain_interval = retrain_interval
+        self.background = background
+        self.executor = executor
+        self.logger = logging.getLogger('model')
+        # Feature window plus the observed proportion of maker orders
+        self.features = FeatureStore(
+            FEATURE_COLUMNS + ("maker_proportion",),
+            capacity=max_history,
+            max_age=max_age
+        )
+        self.coefficients: Optional[LogisticCoefficients] = None
+        self.fit_count = 0
+        self._samples_since_fit = 0
+        self._last_schedule_time = 0.0
+        self._pending: Optional[Future] = None
+    
+    @property
+    def orderbook_history(self) -> np.ndarray:
+        """(n_samples, 4) view of spread, depth, volume and volatility"""
+        return self.features.matrix(*FEATURE_COLUMNS)
+    
+    @property
+    def maker_taker_history(self) -> np.ndarray:
+        return self.features.column("maker_proportion")
         
     def update(self, 
                spread: float, 
@@ -24,36 +131,86 @@ class MakerTakerPredictor:
                volatility: float,
                maker_proportion: float) -> None:
         """Update the model with new orderbook data"""
-        snapshot = OrderBookSnapshot(
-            timestamp=len(self.orderbook_history),
-            spread=spread,
-            depth=depth,
-            volume=volume,
-            volatility=volatility
-        )
-        
-        self.orderbook_history.append(snapshot)
-        self.maker_taker_history.append(maker_proportion)
+        self.features.append((spread, depth, volume, volatility, maker_proportion))
+        self._samples_since_fit += 1
+        self._maybe_retrain()
         
     def predict_maker_proportion(self, 
                                spread: float, 
                                depth: float, 
                                volume: float, 
                                volatility: float) -> float:
-        """Predict the proportion of maker orders"""
-        if len(self.orderbook_history) < 10:  # Need minimum data for training
-            return 0.5  # Default to 50/50 split
-            
-        # Prepare features for training
-        X = np.array([[s.spread, s.depth, s.volume, s.volatility] 
-                      for s in self.orderbook_history])
-        y = np.array(self.maker_taker_history)
+        """Predict the proportion of maker orders from the cached coefficients"""
+        self._maybe_retrain()
+        coefficients = self.coefficients
+        if coefficients is None:
+            return 0.5  # Default to 50/50 split until the first fit lands
         
-        # Train model
-        self.model.fit(X, y)
+        c = coefficients.coef
+        z = c[0] * spread + c[1] * depth + c[2] * volume + c[3] * volatility + coefficients.intercept
+        # Clipped: features far outside the training range saturate instead of overflowing
+        return float(1.0 / (1.0 + np.exp(-np.clip(z, -50.0, 50.0))))
+    
+    def _maybe_retrain(self):
+        """Schedule a fit when enough new samples or time have accumulated"""
+        self._collect_fit()
+        if self._pending is not None:
+            return
+        if len(self.features) < 10 or self._samples_since_fit == 0:  # Need minimum data for training
+            return
+        now = time.monotonic()
+        if (self._samples_since_fit < self.retrain_every
+                and self.coefficients is not None
+                and now - self._last_schedule_time < self.retrain_interval):
+            return
         
-        # Predict for new data
-        features = np.array([[spread, depth, volume, volatility]])
-        prediction = self.model.predict_proba(features)[0][1]  # Probability of maker order
+        # Copy the window: the ring buffer keeps changing while the fit runs
+        X = np.array(self.features.matrix(*FEATURE_COLUMNS))
+        y = np.array(self.features.column("maker_proportion"))
+        self._samples_since_fit = 0
+        self._last_schedule_time = now
         
-        return float(prediction) 
\ No newline at end of file
+        if not self.background:
+            self._swap(fit_logistic(X, y))
+            return
+        executor = self.executor or _get_default_executor()
+        self._pending = executor.submit(fit_logistic, X, y)
+    
+    def _collect_fit(self):
+        """Swap in the result of a finished background fit, if any"""
+        pending = self._pending
+        if pending is None or not pending.done():
+            return
+        self._pending = None
+        try:
+            self._swap(pending.result())
+        except Exception as e:
+            self.logger.error(f"Maker/taker retrain failed: {e}")
+    
+    def _swap(self, coefficients: LogisticCoefficients):
+        # Single reference assignment: readers see either the old or new weights
+        self.coefficients = coefficients
+        self.fit_count += 1
+    
+    def wait_for_retrain(self, timeout: Optional[float] = None):
+        """Block until any in-flight background fit has been swapped in"""
+        if self._pending is not None:
+            wait([self._pending], timeout)
+            self._collect_fit()
+    
+    def get_model_metrics(self) -> Dict[str, float]:
+        """Fit duration and staleness of the served coefficients"""
+        coefficients = self.coefficients
+        if coefficients is None:
+            return {
+                'fits': 0,
+                'last_fit_duration_ms': 0.0,
+                'model_staleness_seconds': float('inf'),
+                'samples_since_fit': self._samples_since_fit
+            }
+        return {
+            'fits': self.fit_count,
+            'last_fit_duration_ms': coefficients.fit_duration_ms,
+            'model_staleness_seconds': time.time() - coefficients.fitted_at,
+            'samples_since_fit': self._samples_since_fit
+        }
@@ -1,6 +1,8 @@
 import numpy as np
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
+
+ArrayLike = Union[float, np.ndarray, List[float]]
 
 @dataclass
 class MarketImpactParams:
@@ -11,6 +13,14 @@ class MarketImpactParams:
     initial_price: float  # Initial price
     total_quantity: float  # Total quantity to execute
 
+@dataclass
+class CostSurface:
+    quantities: np.ndarray
+    horizons: np.ndarray
+    sigmas: np.ndarray
+    impact: np.ndarray  # basis points, shape (quantities, horizons, sigmas)
+    cost: np.ndarray  # quote currency, same shape as impact
+
 class AlmgrenChrissModel:
     def __init__(self, params: MarketImpactParams):
         self.params = params
@@ -66,4 +76,54 @@ class AlmgrenChrissModel:
         """
         impact = self.calculate_market_impact(quantity, time)
         cost = quantity * self.params.initial_price * (1 + impact/10000)
-        return cost 
\ No newline at end of file
+        return cost
+    
+    def calculate_market_impact_batch(self, 
+                                      quantity: ArrayLike, 
+                                      time: ArrayLike, 
+                                      sigma: Optional[ArrayLike] = None) -> np.ndarray:
+        """
+        Vectorized calculate_market_impact. Inputs broadcast against each
+        other; ``sigma`` defaults to the model volatility.
+        Returns the price impact in basis points.
+        """
+        quantity = np.asarray(quantity, dtype=np.float64)
+        time = np.asarray(time, dtype=np.float64)
+        sigma = self.params.sigma if sigma is None else np.asarray(sigma, dtype=np.float64)
+        
+        temp_impact = self.params.eta * (quantity / time) * (sigma / np.sqrt(time))
+        perm_impact = self.params.gamma * quantity
+        return (temp_impact + perm_impact) * (10000 / self.params.initial_price)
+    
+    def estimate_execution_cost_batch(self, 
+                                      quantity: ArrayLike, 
+                                      time: ArrayLike, 
+                                      sigma: Optional[ArrayLike] = None) -> np.ndarray:
+        """
+        Vectorized estimate_execution_cost with broadcasting.
+        Returns the total cost in the quote currency.
+        """
+        quantity = np.asarray(quantity, dtype=np.float64)
+        impact = self.calculate_market_impact_batch(quantity, time, sigma)
+        return quantity * self.params.initial_price * (1 + impact / 10000)
+    
+    def cost_surface(self, 
+                     quantities: ArrayLike, 
+                     horizons: ArrayLike, 
+                     sigmas: Optional[ArrayLike] = None) -> CostSurface:
+        """
+        Evaluate impact and cost over the full (quantity, horizon, sigma)
+        grid in one vectorized pass using this model's parameters.
+        """
+        q = np.atleast_1d(np.asarray(quantities, dtype=np.float64))
+        t = np.atleast_1d(np.asarray(horizons, dtype=np.float64))
+        s = np.atleast_1d(np.asarray(
+            self.params.sigma if sigmas is None else sigmas, dtype=np.float64
+        ))
+        
+        qq = q[:, None, None]
+        tt = t[None, :, None]
+        ss = s[None, None, :]
+        impact = self.calculate_market_impact_batch(qq, tt, ss)
+        cost = qq * self.params.initial_price * (1 + impact / 10000)
+        return CostSurface(quantities=q, horizons=t, sigmas=s, impact=impact, cost=cost)
@@ -1,20 +1,110 @@
 import numpy as np
 from dataclasses import dataclass
-from typing import List, Tuple
-from sklearn.linear_model import QuantileRegressor
+from typing import List, Optional, Tuple
+
+from .feature_store import FeatureStore
 
 @dataclass
 class OrderBookLevel:
     price: float
     quantity: float
 
+class OnlineQuantileRegressor:
+    """
+    Linear quantile regression on one feature fitted by SGD on the pinball loss.
+
+    Feature and target are standardized with running (exponentially weighted
+    once warm) mean/variance, so each update and prediction is O(1) in time
+    and memory regardless of how many samples have been seen.
+    """
+    
+    def __init__(self, quantile: float = 0.5, learning_rate: float = 0.01, min_alpha: float = 1e-3):
+        self.quantile = quantile
+        self.learning_rate = learning_rate
+        self.min_alpha = min_alpha
+        self.coef = 0.0
+        self.intercept = 0.0
+        self.n_samples = 0
+        self._x_mean = 0.0
+        self._x_var = 1.0
+        self._y_mean = 0.0
+        self._y_var = 1.0
+        
+    def partial_fit(self, x: float, y: float) -> None:
+        """Update running moments and take one SGD step on (x, y)"""
+        self.n_samples += 1
+        alpha = max(1.0 / self.n_samples, self.min_alpha)
+        
+        dx = x - self._x_mean
+        self._x_mean += alpha * dx
+        self._x_var = (1 - alpha) * (self._x_var + alpha * dx * dx)
+        dy = y - self._y_mean
+        self._y_mean += alpha * dy
+        self._y_var = (1 - alpha) * (self._y_var + alpha * dy * dy)
+        if self.n_samples == 1:
+            return
+        
+        x_std = np.sqrt(self._x_var) or 1.0
+        y_std = np.sqrt(self._y_var) or 1.0
+        z = (x - self._x_mean) / x_std
+        target = (y - self._y_mean) / y_std
+        
+        # Pinball loss subgradient w.r.t. the prediction
+        residual = target - (self.intercept + self.coef * z)
+        grad = -self.quantile if residual > 0 else 1.0 - self.quantile
+        self.intercept -= self.learning_rate * grad
+        self.coef -= self.learning_rate * grad * z
+        
+    def predict(self, x: float) -> float:
+        """Predict the conditional quantile of y at x"""
+        x_std = np.sqrt(self._x_var) or 1.0
+        y_std = np.sqrt(self._y_var) or 1.0
+        z = (x - self._x_mean) / x_std
+        return float(self._y_mean + y_std * (self.intercept + self.coef * z))
+
 class SlippageEstimator:
-    def __init__(self, quantile: float = 0.5):
+    def __init__(self,
+                 quantile: float = 0.5,
+                 mode: str = "batch",
+                 max_history: int = 10000,
+                 max_age: Optional[float] = None):
+        """
+        ``mode="batch"`` refits QuantileRegressor on the retained history at
+        every prediction; ``mode="online"`` updates an OnlineQuantileRegressor
+        per sample and predicts in O(1). History is a FeatureStore window of
+        ``max_history`` samples, optionally limited to ``max_age`` seconds.
+        """
+        if mode not in ("batch", "online"):
+            raise ValueError(f"Unknown slippage estimator mode: {mode}")
         self.quantile = quantile
-        self.model = QuantileRegressor(quantile=quantile)
-        self.price_history: List[float] = []
-        self.volume_history: List[float] = []
-        self.slippage_history: List[float] = []
+        self.mode = mode
+        self._model = None
+        self.online_model = OnlineQuantileRegressor(quantile=quantile)
+        self.features = FeatureStore(
+            ("mid_price", "volume", "slippage"),
+            capacity=max_history,
+            max_age=max_age
+        )
+    
+    @property
+    def model(self):
+        """Batch-mode QuantileRegressor; scikit-learn is imported on first use"""
+        if self._model is None:
+            from sklearn.linear_model import QuantileRegressor
+            self._model = QuantileRegressor(quantile=self.quantile)
+        return self._model
+    
+    @property
+    def price_history(self) -> np.ndarray:
+        return self.features.column("mid_price")
+    
+    @property
+    def volume_history(self) -> np.ndarray:
+        return self.features.column("volume")
+    
+    @property
+    def slippage_history(self) -> np.ndarray:
+        return self.features.column("slippage")
         
     def update(self, orderbook_levels: List[OrderBookLevel], executed_quantity: float) -> float:
         """
@@ -34,24 +124,29 @@ class SlippageEstimator:
         # Calculate slippage
         slippage = (vwap - mid_price) / mid_price * 10000  # in basis points
         
-        # Update history
-        self.price_history.append(mid_price)
-        self.volume_history.append(total_volume)
-        self.slippage_history.append(slippage)
-        
+        self.observe(mid_price, total_volume, slippage)
         return slippage
     
+    def observe(self, mid_price: float, quantity: float, slippage: float) -> None:
+        """Record one measured (quantity, slippage in bps) pair, e.g. from a simulated fill"""
+        self.features.append((mid_price, quantity, slippage))
+        if self.mode == "online":
+            self.online_model.partial_fit(quantity, slippage)
+    
     def predict_slippage(self, quantity: float) -> float:
         """
         Predict slippage for a given quantity using the trained model.
         Returns the predicted slippage in basis points.
         """
-        if len(self.price_history) < 2:
+        if len(self.features) < 2:
             return 0.0
+        
+        if self.mode == "online":
+            return max(0.0, self.online_model.predict(quantity))
             
         # Prepare features for prediction
-        X = np.array(self.volume_history).reshape(-1, 1)
-        y = np.array(self.slippage_history)
+        X = self.features.matrix("volume")
+        y = self.features.column("slippage")
         
         # Train model
         self.model.fit(X, y)
@@ -0,0 +1,148 @@
+import math
+from typing import Dict, Optional, Sequence
+
+from .feature_store import RingBuffer
+
+class RealizedVolatility:
+    """
+    Streaming realized volatility of log mid-price returns.
+
+    Each tick costs O(1) per horizon: fixed windows keep (time, squared
+    return, interval) rows in a RingBuffer with running sums, expiring rows
+    from the front as time advances; EWMA horizons decay a variance rate
+    with a time-based weight. Because ticks are irregular, variance is
+    measured per second (squared returns over elapsed time) and reported
+    scaled to ``unit_seconds`` (daily by default, the unit of
+    ``TradingConfig.default_volatility``).
+    """
+
+    def __init__(self,
+                 windows: Sequence[float] = (60.0, 300.0, 3600.0),
+                 halflives: Sequence[float] = (30.0, 300.0),
+                 unit_seconds: float = 86400.0,
+                 capacity: int = 100000,
+                 min_samples: int = 10,
+                 min_interval: float = 1e-3,
+                 tick_rate: Optional[float] = None):
+        """
+        ``windows`` and ``halflives`` are in seconds. ``capacity`` bounds the
+        rows kept per window; at high tick rates a window then covers fewer
+        seconds, and the rate is taken over the span actually retained.
+        With ``tick_rate`` (expected ticks per second) each window is sized
+        to ``window * tick_rate`` rows instead, still at most ``capacity``.
+        Consecutive ticks closer than ``min_interval`` seconds are treated
+        as that far apart.
+        """
+        self.windows = tuple(float(w) for w in windows)
+        self.halflives = tuple(float(h) for h in halflives)
+        self.unit_seconds = unit_seconds
+        self.min_samples = min_samples
+        self.min_interval = min_interval
+        self._buffers = {  # time, r^2, dt
+            w: RingBuffer(capacity if tick_rate is None else max(2, min(capacity, math.ceil(w * tick_rate))), 3)
+            for w in self.windows
+        }
+        self._sums = {w: [0.0, 0.0] for w in self.windows}  # sum r^2, sum dt
+        self._appends = {w: 0 for w in self.windows}
+        self._ewma: Dict[float, Optional[float]] = {h: None for h in self.halflives}
+        self._decay = {h: math.log(2) / h for h in self.halflives}
+        self._last_price: Optional[float] = None
+        self._last_time: Optional[float] = None
+        self.samples = 0
+
+    def update(self, mid_price: float, timestamp: float):
+        """Add one mid price observed at ``timestamp`` (epoch seconds)"""
+        if mid_price <= 0:
+            return
+        last_price, last_time = self._last_price, self._last_time
+        if last_price is None or last_time is None:
+            self._last_price, self._last_time = mid_price, timestamp
+            return
+        dt = max(timestamp - last_time, self.min_interval)
+        r2 = math.log(mid_price / last_price) ** 2
+        now = max(timestamp, last_time)
+        self._last_price, self._last_time = mid_price, now
+        self.samples += 1
+
+        for window in self.windows:
+            self._update_window(window, now, r2, dt)
+        rate = r2 / dt
+        for halflife, variance in self._ewma.items():
+            if variance is None:
+                self._ewma[halflife] = rate
+            else:
+                alpha = 1.0 - math.exp(-self._decay[halflife] * dt)
+                self._ewma[halflife] = variance + alpha * (rate - variance)
+
+    def _update_window(self, window: float, now: float, r2: float, dt: float):
+        buffer, sums = self._buffers[window], self._sums[window]
+        if len(buffer) == buffer.capacity:
+            oldest = buffer.view()[:, 0]
+            sums[0] -= oldest[1]
+            sums[1] -= oldest[2]
+        buffer.append((now, r2, dt))
+        sums[0] += r2
+        sums[1] += dt
+
+        view = buffer.view()
+        expired = 0
+        while expired < view.shape[1] - 1 and view[0, expired] <= now - window:
+            sums[0] -= view[1, expired]
+            sums[1] -= view[2, expired]
+            expired += 1
+        if expired:
+            buffer.drop_oldest(expired)
+
+        # Running sums drift with rounding; rebuild them once per capacity appends
+        self._appends[window] += 1
+        if self._appends[window] >= buffer.capacity:
+            self._appends[window] = 0
+            view = buffer.view()
+            sums[0], sums[1] = float(view[1].sum()), float(view[2].sum())
+
+    def _scale(self, variance_rate: float) -> float:
+        return math.sqrt(max(variance_rate, 0.0) * self.unit_seconds)
+
+    @property
+    def ready(self) -> bool:
+        return self.samples >= self.min_samples
+
+    def window(self, seconds: float) -> float:
+        """Realized volatility over the last ``seconds`` (one of ``windows``); NaN until ready"""
+        sum_r2, sum_dt = self._sums[float(seconds)]
+        if not self.ready or sum_dt <= 0:
+            return float("nan")
+        return self._scale(sum_r2 / sum_dt)
+
+    def ewma(self, halflife: float) -> float:
+        """EWMA volatility with ``halflife`` seconds (one of ``halflives``); NaN until ready"""
+        variance = self._ewma[float(halflife)]
+        if not self.ready or variance is None:
+            return float("nan")
+        return self._scale(variance)
+
+    def sigma(self, default: float) -> float:
+        """Live sigma for the models: the shortest-halflife EWMA, else the shortest window, else ``default``"""
+        if not self.ready:
+            return default
+        if self.halflives:
+            return self.ewma(self.halflives[0])
+        if self.windows:
+            value = self.window(self.windows[0])
+            return default if math.isnan(value) else value
+        return default
+
+    def estimates(self) -> Dict[str, float]:
+        """All horizons at once: ``window_{s}s`` and ``ewma_{h}s`` keys"""
+        values = {f"window_{w:g}s": self.window(w) for w in self.windows}
+        values.update({f"ewma_{h:g}s": self.ewma(h) for h in self.halflives})
+        return values
+
+    def reset(self):
+        for window in self.windows:
+            self._buffers[window].clear()
+            self._sums[window] = [0.0, 0.0]
+            self._appends[window] = 0
+        self._ewma = {h: None for h in self.halflives}
+        self._last_price = self._last_time = None
+        self.samples = 0
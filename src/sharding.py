@@ -0,0 +1,327 @@
+"""
+Symbol-sharded execution: the WebSocket front-end stays on one event loop
+and forwards raw frames over pipes to worker processes, each owning the
+processors and models of its symbols. Workers send back compact fixed-size
+result records, so model fitting for many symbols no longer serializes on
+one GIL.
+"""
+import asyncio
+import dataclasses
+import inspect
+import json
+import logging
+import multiprocessing
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from .config.settings import TradingConfig
+from .core.connection_manager import ConnectionManager, StreamSpec, iter_book_messages
+from .core.decoder import MessageDecoder
+from .core.ingest import IngestQueue
+from .core.performance import PerformanceAnalyzer
+from .core.storage import TradingDataStorage
+
+# Frame header: global symbol index; CONTROL carries JSON parameters, an empty payload stops the worker
+HEADER = struct.Struct("<H")
+CONTROL = 0xFFFF
+STOP = b""
+
+# One record per computed tick, sent back to the front-end in batches
+RESULT_DTYPE = np.dtype([
+    ('symbol', '<u2'),
+    ('timestamp', '<i8'),  # exchange time, epoch ns
+    ('mid_price', '<f8'),
+    ('spread', '<f8'),
+    ('slippage', '<f8'),
+    ('fill_complete', '?'),
+    ('fees', '<f8'),
+    ('impact', '<f8'),
+    ('net_cost', '<f8'),
+    ('maker_taker', '<f8'),
+    ('volatility', '<f8'),
+    ('processing_time', '<f8'),
+    ('latency', '<f8')  # exchange timestamp to result, ms
+])
+
+METRIC_FIELDS = (RESULT_DTYPE.names or ())[2:-1]
+
+def _run_worker(frames, results, config: TradingConfig, symbols: Dict[int, str],
+                quantity: float, volatility: float, fee_tier: str, batch_size: int):
+    """Worker process entry point: own the pipeline of ``symbols`` (global index -> symbol)"""
+    from .engine import SimulationEngine
+
+    config = dataclasses.replace(config, symbols=list(symbols.values()))
+    engine = SimulationEngine(config, quantity=quantity, volatility=volatility,
+                              fee_tier=fee_tier, record_orderbooks=False)
+    try:
+        asyncio.run(_serve(engine, frames, results, symbols, batch_size))
+    finally:
+        results.send_bytes(b"")
+        results.close()
+
+async def _serve(engine, frames, results, symbols: Dict[int, str], batch_size: int):
+    decoder = MessageDecoder()
+    specs = {index: engine.connections.streams[(engine.config.exchange, symbol)]
+             for index, symbol in symbols.items()}
+    index_of = {symbol: index for index, symbol in symbols.items()}
+    pending: List[tuple] = []
+
+    def collect(metrics: Dict[str, Any]):
+        timestamp = metrics['timestamp'].timestamp()
+        pending.append((index_of[metrics['symbol']], int(timestamp * 1e9))
+                       + tuple(metrics[name] for name in METRIC_FIELDS)
+                       + ((time.time() - timestamp) * 1000,))
+
+    engine.subscribe(collect)
+    while True:
+        try:
+            payload = frames.recv_bytes()
+        except EOFError:
+            break
+        if not payload:
+            break
+        (index,) = HEADER.unpack_from(payload)
+        if index == CONTROL:
+            engine.set_parameters(**json.loads(payload[HEADER.size:]))
+            continue
+        spec = specs[index]
+        try:
+            data = decoder.loads(payload[HEADER.size:])
+        except Exception as e:
+            engine.logger.error(f"Error decoding frame for {spec.symbol}: {e}")
+            continue
+        for _, message in iter_book_messages(data):
+            await engine.connections.dispatch(spec, message, record_latency=False)
+        # Batch results while more frames are queued; flush once the pipe is idle
+        if pending and (len(pending) >= batch_size or not frames.poll()):
+            results.send_bytes(np.array(pending, dtype=RESULT_DTYPE).tobytes())
+            pending.clear()
+    if pending:
+        results.send_bytes(np.array(pending, dtype=RESULT_DTYPE).tobytes())
+
+def _send_all(connection, payloads: List[bytes]):
+    for payload in payloads:
+        connection.send_bytes(payload)
+
+class ShardedEngine:
+    """
+    SimulationEngine counterpart running the per-symbol pipelines in
+    ``workers`` processes (symbols assigned round-robin). Subscribers
+    receive the same core metrics dicts; liquidity, cost ladder and
+    orderbook snapshots stay inside the workers and are not recorded.
+
+    Frames for each worker wait in a bounded IngestQueue (sized and
+    governed by ``ingest_queue_size``/``ingest_overflow_policy``) drained by
+    a writer task that sends from an executor thread, so a worker falling
+    behind never blocks the event loop; drops are counted by the
+    performance analyzer.
+    """
+
+    def __init__(self,
+                 config: Optional[TradingConfig] = None,
+                 workers: Optional[int] = None,
+                 storage: Optional[TradingDataStorage] = None,
+                 quantity: Optional[float] = None,
+                 volatility: Optional[float] = None,
+                 fee_tier: str = "Tier 1",
+                 batch_size: int = 64,
+                 connections: Optional[ConnectionManager] = None):
+        self.config = config or TradingConfig()
+        if fee_tier not in self.config.fee_tiers:
+            raise ValueError(f"Unknown fee tier: {fee_tier}")
+        self.symbols = list(self.config.symbols)
+        self.workers = max(1, min(workers or self.config.worker_processes, len(self.symbols)))
+        self.storage = storage
+        self.quantity = quantity if quantity is not None else self.config.default_quantity
+        self.volatility = volatility if volatility is not None else self.config.default_volatility
+        self.fee_tier = fee_tier
+        self.batch_size = batch_size
+        self.logger = logging.getLogger('engine')
+
+        self.performance_analyzer = PerformanceAnalyzer(window_size=self.config.performance_window)
+        self.connections = connections or ConnectionManager.from_config(
+            self.config, performance_analyzer=self.performance_analyzer
+        )
+        self.subscribers: List[Callable[[Dict[str, Any]], Any]] = []
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._frames: List[Connection] = []
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self._readers: List[threading.Thread] = []
+        self._queues: List[IngestQueue] = []
+        self._writers: List[asyncio.Future] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def shard_of(self, symbol: str) -> int:
+        return self._index[symbol] % self.workers
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Any]):
+        """Register a callback (plain or coroutine) receiving each metrics dict"""
+        self.subscribers.append(callback)
+
+    def set_parameters(self,
+                       quantity: Optional[float] = None,
+                       volatility: Optional[float] = None,
+                       fee_tier: Optional[str] = None):
+        """Change simulation inputs in every worker; applies from the next tick"""
+        if fee_tier is not None and fee_tier not in self.config.fee_tiers:
+            raise ValueError(f"Unknown fee tier: {fee_tier}")
+        updates = {name: value for name, value in
+                   (("quantity", quantity), ("volatility", volatility), ("fee_tier", fee_tier))
+                   if value is not None}
+        for name, value in updates.items():
+            setattr(self, name, value)
+        payload = HEADER.pack(CONTROL) + json.dumps(updates).encode()
+        for queue in self._queues:
+            # Queued behind the frames already submitted, exempt from the overflow policy
+            queue.put_control((payload, payload))
+
+    def start_workers(self):
+        """Spawn the worker processes; must be called from the running event loop"""
+        if self._processes:
+            return
+        self._loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        for shard in range(self.workers):
+            symbols = {i: symbol for i, symbol in enumerate(self.symbols) if i % self.workers == shard}
+            frames_reader, frames_writer = context.Pipe(duplex=False)
+            results_reader, results_writer = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_run_worker,
+                args=(frames_reader, results_writer, self.config, symbols,
+                      self.quantity, self.volatility, self.fee_tier, self.batch_size),
+                name=f"engine-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            # The child holds its own copies of these ends
+            frames_reader.close()
+            results_writer.close()
+            reader = threading.Thread(target=self._read_results, args=(results_reader,), daemon=True)
+            reader.start()
+            # Items are (conflation key, payload); frames conflate per symbol
+            queue = IngestQueue(
+                maxsize=self.config.ingest_queue_size,
+                policy=self.config.ingest_overflow_policy,
+                key_func=lambda item: item[0],
+                performance_analyzer=self.performance_analyzer
+            )
+            self._frames.append(frames_writer)
+            self._processes.append(process)
+            self._readers.append(reader)
+            self._queues.append(queue)
+            self._writers.append(asyncio.ensure_future(self._write_frames(shard, queue, frames_writer)))
+
+    @property
+    def dropped(self) -> int:
+        """Frames discarded by the worker queues' overflow policy"""
+        return sum(queue.dropped for queue in self._queues)
+
+    async def submit(self, symbol: str, frame: Union[str, bytes]):
+        """Queue one raw frame of ``symbol`` for its worker"""
+        if isinstance(frame, str):
+            frame = frame.encode()
+        index = self._index[symbol]
+        await self._queues[index % self.workers].put((index, HEADER.pack(index) + frame))
+
+    async def _forward(self, stream: StreamSpec, frame: Union[str, bytes]):
+        await self.submit(stream.symbol, frame)
+
+    async def _write_frames(self, shard: int, queue: IngestQueue, connection):
+        # Writer task per worker: drain what is queued and send it off the event loop
+        loop = asyncio.get_running_loop()
+        while True:
+            payloads = [(await queue.get())[1]]
+            while not queue.empty():
+                payloads.append(queue.get_nowait()[1])
+            try:
+                await loop.run_in_executor(None, _send_all, connection, payloads)
+            except (BrokenPipeError, OSError) as e:
+                self.logger.error(f"Worker {shard} unavailable: {e}")
+                self.performance_analyzer.record_error()
+                return
+            if payloads[-1] == STOP:
+                return
+
+    def _read_results(self, connection):
+        # Reader thread per worker; results are handed to the event loop in batches
+        while True:
+            try:
+                payload = connection.recv_bytes()
+            except EOFError:
+                break
+            if not payload:
+                break
+            self._loop.call_soon_threadsafe(self._deliver, payload)
+        connection.close()
+
+    def _deliver(self, payload: bytes):
+        for record in np.frombuffer(payload, dtype=RESULT_DTYPE).tolist():
+            symbol = self.symbols[record[0]]
+            metrics = {
+                'timestamp': datetime.fromtimestamp(record[1] / 1e9, tz=timezone.utc),
+                'exchange': self.config.exchange,
+                'symbol': symbol
+            }
+            metrics.update(zip(METRIC_FIELDS, record[2:-1]))
+            self.performance_analyzer.metrics.add_processing_time(metrics['processing_time'])
+            self.performance_analyzer.record_ws_latency(record[-1])
+            self.latest[symbol] = metrics
+            if self.storage is not None:
+                self.storage.save_trading_metrics(metrics)
+            for callback in self.subscribers:
+                try:
+                    result = callback(metrics)
+                    if inspect.isawaitable(result):
+                        asyncio.ensure_future(result)
+                except Exception as e:
+                    self.logger.error(f"Subscriber failed: {e}")
+
+    async def _report_performance(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            if self.storage is not None:
+                self.storage.save_performance_metrics(self.performance_analyzer.get_performance_report())
+
+    async def run(self, duration: Optional[float] = None, performance_interval: float = 5.0):
+        """Stream until cancelled, or for ``duration`` seconds"""
+        self.start_workers()
+        self.connections.forward_frames(self._forward)
+        reporter = asyncio.ensure_future(self._report_performance(performance_interval))
+        try:
+            if duration is None:
+                await self.connections.start()
+            else:
+                try:
+                    await asyncio.wait_for(self.connections.start(), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            reporter.cancel()
+            await self.close()
+
+    async def close(self):
+        """Close feeds, let workers finish queued frames and deliver their results"""
+        await self.connections.close()
+        for queue, writer in zip(self._queues, self._writers):
+            if not writer.done():
+                await queue.put((STOP, STOP))
+        await asyncio.gather(*self._writers)
+        for frames in self._frames:
+            frames.close()
+        loop = asyncio.get_running_loop()
+        for process, reader in zip(self._processes, self._readers):
+            await loop.run_in_executor(None, process.join)
+            await loop.run_in_executor(None, reader.join)
+        # Run the deliveries the reader threads scheduled last
+        await asyncio.sleep(0)
+        self._frames, self._processes, self._readers = [], [], []
+        self._queues, self._writers = [], []
+        if self.storage is not None:
+            self.storage.flush()
@@ -0,0 +1,47 @@
+"""
+Qt-free part of the live charts: the columns each tab plots and the
+selection of points inside the sliding time range.
+"""
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+TIME_RANGES = {
+    '1h': timedelta(hours=1),
+    '4h': timedelta(hours=4),
+    '1d': timedelta(days=1),
+    '1w': timedelta(weeks=1),
+    '1m': timedelta(days=30)
+}
+
+# Plotted columns per storage table, in plot order; engine metrics carry the same keys
+PLOT_COLUMNS = {
+    'performance_metrics': ('avg_processing_time', 'avg_ui_update_time', 'avg_ws_latency'),
+    'trading_metrics': ('slippage', 'impact', 'net_cost'),
+    'orderbook_snapshots': ('spread', 'depth', 'volume')
+}
+
+def live_row(table: str, values: Dict[str, Any], timestamp: Optional[float] = None) -> List[float]:
+    """Ring-buffer row for ``table``: epoch seconds, then PLOT_COLUMNS (NaN where missing)"""
+    row = [time.time() if timestamp is None else timestamp]
+    row.extend(np.nan if values.get(column) is None else float(values[column])
+               for column in PLOT_COLUMNS[table])
+    return row
+
+def visible_series(history: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+                   live_x: np.ndarray, live_y: np.ndarray,
+                   history_end: float, now: float, span: float) -> Tuple[np.ndarray, ...]:
+    """
+    (x, mean, min, max) of one plot over the last ``span`` seconds before
+    ``now``: the loaded history buckets plus the live points newer than
+    them. The start slides with ``now``, so old points leave the chart
+    between storage reloads.
+    """
+    start = now - span
+    x, mean, low, high = history
+    kept = x >= start
+    fresh = live_x > max(history_end, start)
+    y = live_y[fresh]
+    return (np.concatenate([x[kept], live_x[fresh]]), np.concatenate([mean[kept], y]),
+            np.concatenate([low[kept], y]), np.concatenate([high[kept], y]))
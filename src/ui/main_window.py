@@ -2,17 +2,19 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QLineEdit, QComboBox, QPushButton, QGroupBox,
                             QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from models.market_impact import AlmgrenChrissModel, MarketImpactParams
-from models.slippage import SlippageEstimator
-from models.maker_taker import MakerTakerPredictor
+import asyncio
 import time
-from core.performance import PerformanceAnalyzer
 from core.logger import TradingLogger
 from config.settings import TradingConfig
 from .visualization import TradingVisualization
 from core.storage import TradingDataStorage
+from core.snapshot_slot import LatestSlot
 
 class MainWindow(QMainWindow):
+    """
+    Display-only subscriber of a SimulationEngine (``src/engine.py``), which
+    owns the feeds, models and metric storage; see attach_engine().
+    """
     # Define signals for async updates
     update_metrics = pyqtSignal(dict)
     
@@ -21,10 +23,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("GoQuant Trading Simulator")
         self.setMinimumSize(1200, 800)
         
-        # Initialize models
-        self.market_impact_model = None
-        self.slippage_estimator = SlippageEstimator()
-        self.maker_taker_predictor = MakerTakerPredictor()
+        self.engine = None
+        self._engine_task = None
         
         # Performance tracking
         self.last_update_time = time.time()
@@ -33,17 +33,28 @@ class MainWindow(QMainWindow):
         # Initialize components
         self.config = TradingConfig()
         self.logger = TradingLogger()
-        self.performance_analyzer = PerformanceAnalyzer(
-            window_size=self.config.performance_window
-        )
+        # The engine's analyzer, which sees every tick; set by attach_engine()
+        self.performance_analyzer = None
         
         # Initialize storage and visualization
         self.storage = TradingDataStorage()
-        self.visualization = TradingVisualization(self.storage)
+        self.visualization = TradingVisualization(
+            self.storage,
+            max_fps=self.config.plot_max_fps,
+            buffer_size=self.config.plot_buffer_size
+        )
         
         self._setup_ui()
         self._connect_signals()
         
+        # Ticks publish into a latest-value slot; the UI renders at a fixed
+        # rate so its cost does not grow with the feed rate
+        self._metrics_slot = LatestSlot()
+        self._render_timer = QTimer(self)
+        self._render_timer.setInterval(int(1000 / self.config.ui_refresh_hz))
+        self._render_timer.timeout.connect(self._render)
+        self._render_timer.start()
+        
     def _setup_ui(self):
         # Create main widget and layout
         main_widget = QWidget()
@@ -152,17 +163,51 @@ class MainWindow(QMainWindow):
     def _connect_signals(self):
         """Connect UI signals to slots"""
         self.control_button.clicked.connect(self._toggle_simulation)
-        self.update_metrics.connect(self._update_metrics)
+        self.update_metrics.connect(self.publish_metrics)
+        
+    def attach_engine(self, engine):
+        """Subscribe to a SimulationEngine built on this window's storage"""
+        self.engine = engine
+        self.performance_analyzer = engine.performance_analyzer
+        engine.subscribe(self.publish_metrics)
         
     def _toggle_simulation(self):
-        """Toggle simulation start/stop"""
+        """Toggle simulation start/stop (needs a running asyncio loop, e.g. qasync)"""
         if self.control_button.text() == "Start Simulation":
+            if self.engine is None:
+                self.show_error("No simulation engine attached")
+                return
             self.control_button.setText("Stop Simulation")
-            # TODO: Start WebSocket connection
+            self.engine.set_parameters(
+                quantity=float(self.quantity_input.text()),
+                volatility=float(self.volatility_input.text()),
+                fee_tier=self.fee_tier_combo.currentText()
+            )
+            # run() also stores performance reports and closes the feeds when cancelled
+            self._engine_task = asyncio.ensure_future(self.engine.run())
         else:
             self.control_button.setText("Start Simulation")
-            # TODO: Stop WebSocket connection
+            self._stop_engine()
+            
+    def _stop_engine(self):
+        if self._engine_task is not None:
+            self._engine_task.cancel()
+            self._engine_task = None
             
+    def publish_metrics(self, metrics: dict):
+        """
+        Hand over metrics for one tick. Thread-safe and cheap, so the compute
+        pipeline can call it directly for every message; the engine has
+        already stored them.
+        """
+        self._metrics_slot.publish(metrics)
+    
+    def _render(self):
+        """Render the latest published metrics, if any arrived since the last frame"""
+        metrics = self._metrics_slot.take()
+        if metrics is not None:
+            self._update_metrics(metrics)
+    
     def _update_metrics(self, metrics: dict):
         """Update UI with new metrics"""
         start_time = self.performance_analyzer.start_ui_update()
@@ -190,14 +235,10 @@ class MainWindow(QMainWindow):
                 f"Total Ticks Processed: {perf_report['total_ticks']}"
             )
             
-            # Save metrics to storage
-            self.storage.save_trading_metrics(metrics)
-            self.storage.save_performance_metrics(
-                self.performance_analyzer.get_performance_report()
-            )
-            
-            # Update visualization
-            self.visualization._update_plots()
+            # Append live points; the charts redraw at most plot_max_fps times a second
+            self.visualization.append_metrics('trading_metrics', metrics)
+            self.visualization.append_metrics('orderbook_snapshots', metrics)
+            self.visualization.append_metrics('performance_metrics', stats)
             
         except Exception as e:
             self.logger.ui_logger.error(f"Error updating metrics: {str(e)}")
@@ -205,6 +246,13 @@ class MainWindow(QMainWindow):
         finally:
             self.performance_analyzer.end_ui_update(start_time)
 
+    def closeEvent(self, event):
+        """Flush queued storage writes before the window closes"""
+        self._render_timer.stop()
+        self._stop_engine()
+        self.storage.close()
+        super().closeEvent(event)
+
     def show_error(self, message: str):
         """Show error message to user"""
         QMessageBox.critical(self, "Error", message) 
\ No newline at end of file
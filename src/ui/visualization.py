@@ -1,10 +1,16 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTabWidget, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, 
                             QComboBox, QPushButton, QLabel)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 import pyqtgraph as pg
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import numpy as np
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from models.feature_store import RingBuffer
+from .live_series import PLOT_COLUMNS, TIME_RANGES, live_row, visible_series
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class PerformancePlot(pg.PlotWidget):
     def __init__(self, parent=None):
@@ -14,23 +20,67 @@ class PerformancePlot(pg.PlotWidget):
         self.setLabel('left', 'Value')
         self.setLabel('bottom', 'Time')
         
-    def update_data(self, data: pd.DataFrame, x_col: str, y_col: str):
-        self.clear()
-        self.plot(data[x_col], data[y_col], pen='b')
+        # Curve items are created once and updated in place with setData
+        band_pen = pg.mkPen(200, 200, 255)
+        self.low_curve = self.plot(pen=band_pen)
+        self.high_curve = self.plot(pen=band_pen)
+        self.addItem(pg.FillBetweenItem(self.low_curve, self.high_curve,
+                                        brush=pg.mkBrush(200, 200, 255, 80)))
+        self.mean_curve = self.plot(pen='b')
+        
+    def update_data(self, data: 'pd.DataFrame', x_col: str, y_col: str):
+        # Storage timestamps are epoch nanoseconds; plot seconds
+        y = data[y_col].to_numpy()
+        self.set_series(data[x_col].to_numpy() / 1e9, y, y, y)
+        
+    def update_aggregates(self, data: 'pd.DataFrame'):
+        """Plot bucketed aggregates: mean line over a min/max band"""
+        self.set_series(data['timestamp'].to_numpy() / 1e9, data['mean'].to_numpy(),
+                        data['min'].to_numpy(), data['max'].to_numpy())
+        
+    def set_series(self, x: np.ndarray, mean: np.ndarray, low: np.ndarray, high: np.ndarray):
+        self.low_curve.setData(x, low)
+        self.high_curve.setData(x, high)
+        self.mean_curve.setData(x, mean)
         
 class TradingVisualization(QWidget):
-    def __init__(self, storage):
+    """
+    Historical charts for the selected time range.
+    
+    Storage is only queried (as pixel-width aggregates) when the time range
+    changes; live points pushed through append_metrics() go into per-table
+    ring buffers and are drawn on top of that history, in a window that
+    slides with the clock. Redraws touch the visible tab only and are
+    throttled to ``max_fps``.
+    """
+    
+    def __init__(self, storage, max_fps: float = 10.0, buffer_size: int = 5000):
         super().__init__()
         self.storage = storage
+        self.buffer_size = buffer_size
+        self._live = {
+            table: RingBuffer(buffer_size, len(columns) + 1)
+            for table, columns in PLOT_COLUMNS.items()
+        }
+        # plot -> (x, mean, min, max) loaded from storage for the current range
+        self._history: Dict[PerformancePlot, Tuple[np.ndarray, ...]] = {}
+        self._history_end = 0.0
         self._setup_ui()
         
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(int(1000 / max_fps))
+        self._redraw_timer.timeout.connect(self._redraw)
+        # Load history once the widget is laid out and plot widths are known
+        QTimer.singleShot(0, self._update_plots)
+        
     def _setup_ui(self):
         layout = QVBoxLayout(self)
         
         # Time range selection
         time_range_layout = QHBoxLayout()
         self.time_range_combo = QComboBox()
-        self.time_range_combo.addItems(['1h', '4h', '1d', '1w', '1m'])
+        self.time_range_combo.addItems(list(TIME_RANGES))
         self.time_range_combo.currentTextChanged.connect(self._update_plots)
         time_range_layout.addWidget(QLabel("Time Range:"))
         time_range_layout.addWidget(self.time_range_combo)
@@ -72,57 +122,52 @@ class TradingVisualization(QWidget):
         orderbook_layout.addWidget(self.volume_plot)
         self.tab_widget.addTab(self.orderbook_tab, "Orderbook")
         
+        self.tab_widget.currentChanged.connect(lambda _: self._redraw())
         layout.addWidget(self.tab_widget)
         
+        # Tab index -> (table, plots in PLOT_COLUMNS order)
+        self._tabs: List[Tuple[str, List[PerformancePlot]]] = [
+            ('performance_metrics', [self.processing_time_plot, self.ui_update_plot, self.ws_latency_plot]),
+            ('trading_metrics', [self.slippage_plot, self.impact_plot, self.cost_plot]),
+            ('orderbook_snapshots', [self.spread_plot, self.depth_plot, self.volume_plot])
+        ]
+        
+    def append_metrics(self, table: str, values: Dict[str, Any], timestamp: Optional[float] = None):
+        """Add a live point (``timestamp`` in epoch seconds) and schedule a redraw"""
+        self._live[table].append(live_row(table, values, timestamp))
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
+        
     def _update_plots(self):
-        """Update all plots with new data"""
-        time_range = self.time_range_combo.currentText()
+        """Reload history for the selected time range and redraw"""
         end_time = datetime.now()
+        start_time = end_time - TIME_RANGES[self.time_range_combo.currentText()]
+        self._history_end = end_time.timestamp()
+        
+        for table, plots in self._tabs:
+            for plot, column in zip(plots, PLOT_COLUMNS[table]):
+                # One bucket per horizontal pixel, aggregated by storage
+                data = self.storage.get_aggregated_data(
+                    table, column, start_time, end_time, max_points=max(plot.width(), 100)
+                )
+                self._history[plot] = (
+                    data['timestamp'].to_numpy() / 1e9, data['mean'].to_numpy(),
+                    data['min'].to_numpy(), data['max'].to_numpy()
+                )
+        self._redraw()
+        
+    def _redraw(self):
+        """Draw history plus live points for the visible tab"""
+        table, plots = self._tabs[self.tab_widget.currentIndex()]
+        live = self._live[table].view()
+        if len(self._live[table]) == self.buffer_size and live[0, 0] > self._history_end:
+            # Live points older than the buffer were evicted; refill the gap from storage
+            self._update_plots()
+            return
         
-        # Calculate start time based on selected range
-        if time_range == '1h':
-            start_time = end_time - timedelta(hours=1)
-        elif time_range == '4h':
-            start_time = end_time - timedelta(hours=4)
-        elif time_range == '1d':
-            start_time = end_time - timedelta(days=1)
-        elif time_range == '1w':
-            start_time = end_time - timedelta(weeks=1)
-        else:  # 1m
-            start_time = end_time - timedelta(days=30)
-        
-        # Get historical data
-        data = self.storage.get_historical_data(start_time, end_time)
-        
-        # Update performance plots
-        self.processing_time_plot.update_data(
-            data['performance'], 'timestamp', 'avg_processing_time'
-        )
-        self.ui_update_plot.update_data(
-            data['performance'], 'timestamp', 'avg_ui_update_time'
-        )
-        self.ws_latency_plot.update_data(
-            data['performance'], 'timestamp', 'avg_ws_latency'
-        )
-        
-        # Update trading plots
-        self.slippage_plot.update_data(
-            data['trading'], 'timestamp', 'slippage'
-        )
-        self.impact_plot.update_data(
-            data['trading'], 'timestamp', 'impact'
-        )
-        self.cost_plot.update_data(
-            data['trading'], 'timestamp', 'net_cost'
-        )
-        
-        # Update orderbook plots
-        self.spread_plot.update_data(
-            data['orderbook'], 'timestamp', 'spread'
-        )
-        self.depth_plot.update_data(
-            data['orderbook'], 'timestamp', 'depth'
-        )
-        self.volume_plot.update_data(
-            data['orderbook'], 'timestamp', 'volume'
-        ) 
\ No newline at end of file
+        span = TIME_RANGES[self.time_range_combo.currentText()].total_seconds()
+        now = time.time()
+        for i, plot in enumerate(plots):
+            history = self._history.get(plot, (np.empty(0),) * 4)
+            plot.set_series(*visible_series(history, live[0], live[i + 1], self._history_end, now, span))
+                            
\ No newline at end of file
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+from src.core.archive import NS_PER_DAY, TickArchive
+from src.core.storage import TradingDataStorage
+
+DAY0 = 19800 * NS_PER_DAY
+ASKS = np.array([[101.0, 102.0], [1.0, 2.0]])
+BIDS = np.array([[100.0, 99.0], [3.0, 4.0]])
+
+def fill(archive, symbol="BTC-USDT", days=3, per_day=10):
+    for day in range(days):
+        for i in range(per_day):
+            ts = DAY0 + day * NS_PER_DAY + i * 10**9
+            archive.append(symbol, ts, 100.0 + i, 0.5 * i, 10.0 + day, 1.0, b"book%d" % i)
+
+@pytest.fixture
+def archive(tmp_path):
+    return TickArchive(str(tmp_path / "archive"), backend="memmap", flush_rows=7)
+
+def test_partitions_by_symbol_and_day(archive):
+    fill(archive)
+    archive.flush()
+    days = sorted(p.name for p in (archive.root / "symbol=BTC-USDT").iterdir())
+    assert days == ["date=2024-03-18", "date=2024-03-19", "date=2024-03-20"]
+    assert archive.symbols() == ["BTC-USDT"]
+
+def test_read_prunes_time_range_and_projects_columns(archive):
+    fill(archive)
+    start = DAY0 + NS_PER_DAY + 3 * 10**9
+    end = DAY0 + 2 * NS_PER_DAY + 1 * 10**9
+    frame = archive.read("BTC-USDT", start, end, ["timestamp", "spread"])
+    assert list(frame.columns) == ["timestamp", "spread"]
+    assert len(frame) == 7 + 2
+    assert frame["timestamp"].is_monotonic_increasing
+    assert frame["timestamp"].min() == start
+    assert frame["timestamp"].max() == end
+
+def test_read_includes_buffered_rows_and_payloads(tmp_path):
+    archive = TickArchive(str(tmp_path), backend="memmap", flush_rows=1000)
+    fill(archive, days=1, per_day=5)
+    frame = archive.read("BTC-USDT", DAY0, DAY0 + NS_PER_DAY, ["data"])
+    assert frame["data"].tolist() == [b"book%d" % i for i in range(5)]
+    
+    archive.flush()
+    fill(archive, symbol="ETH-USDT", days=1, per_day=2)
+    frame = archive.read("BTC-USDT", DAY0 + 2 * 10**9, DAY0 + NS_PER_DAY, ["data"])
+    assert frame["data"].tolist() == [b"book2", b"book3", b"book4"]
+
+def test_read_empty_range(archive):
+    fill(archive, days=1)
+    frame = archive.read("BTC-USDT", DAY0 + 5 * NS_PER_DAY, DAY0 + 6 * NS_PER_DAY)
+    assert len(frame) == 0
+    assert "mid_price" in frame.columns
+
+def test_unknown_column_raises(archive):
+    with pytest.raises(ValueError):
+        archive.read("BTC-USDT", 0, 1, ["bogus"])
+
+def test_storage_routes_snapshots_to_archive(tmp_path):
+    archive = TickArchive(str(tmp_path / "archive"), backend="memmap")
+    storage = TradingDataStorage(str(tmp_path / "trading.db"), archive=archive)
+    timestamp = datetime(2024, 3, 20, 12, tzinfo=timezone.utc)
+    for symbol in ("BTC-USDT", "ETH-USDT"):
+        storage.save_orderbook_snapshot({
+            'timestamp': timestamp, 'exchange': 'OKX', 'symbol': symbol,
+            'mid_price': 100.5, 'spread': 1.0, 'depth': 10.0, 'volume': 10.0,
+            'data': {'asks': ASKS, 'bids': BIDS}
+        })
+    storage.flush()
+    
+    start = datetime(2024, 3, 20, tzinfo=timezone.utc)
+    end = datetime(2024, 3, 21, tzinfo=timezone.utc)
+    data = storage.get_historical_data(start, end, columns=['timestamp', 'spread'])
+    assert list(data['orderbook'].columns) == ['symbol', 'timestamp', 'spread']
+    assert sorted(data['orderbook']['symbol']) == ["BTC-USDT", "ETH-USDT"]
+    
+    levels = list(storage.iter_orderbook_levels(start, end, symbol="ETH-USDT"))
+    storage.close()
+    assert len(levels) == 1
+    np.testing.assert_array_equal(levels[0][2], ASKS)
+    np.testing.assert_array_equal(levels[0][3], BIDS)
+
+def test_parquet_backend_matches_memmap(tmp_path):
+    pytest.importorskip("pyarrow")
+    parquet = TickArchive(str(tmp_path / "parquet"), backend="parquet", flush_rows=7)
+    memmap = TickArchive(str(tmp_path / "memmap"), backend="memmap", flush_rows=7)
+    fill(parquet)
+    fill(memmap)
+    start, end = DAY0 + 4 * 10**9, DAY0 + NS_PER_DAY + 8 * 10**9
+    columns = ["timestamp", "depth", "data"]
+    assert parquet.read("BTC-USDT", start, end, columns).equals(memmap.read("BTC-USDT", start, end, columns))
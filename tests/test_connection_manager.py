@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import Mock
+from src.config.settings import TradingConfig
+from src.core.connection_manager import ConnectionManager, StreamSpec
+
+OKX_PUBLIC = "wss://ws.okx.com:8443/ws/v5/public"
+
+def book_frame(symbol, price):
+    return {
+        "timestamp": "2024-03-20T10:00:00Z",
+        "exchange": "okx",
+        "symbol": symbol,
+        "asks": [[str(price + 1), "1.0"]],
+        "bids": [[str(price - 1), "2.0"]]
+    }
+
+@pytest.fixture
+def okx_streams():
+    return [
+        StreamSpec("okx", symbol, OKX_PUBLIC,
+                   {"op": "subscribe", "args": [{"channel": "books", "instId": symbol}]})
+        for symbol in ["BTC-USDT", "ETH-USDT", "SOL-USDT"]
+    ]
+
+def test_streams_are_pooled_per_url(okx_streams):
+    manager = ConnectionManager(okx_streams, max_streams_per_connection=2)
+    
+    assert len(manager.clients) == 2
+    assert len(manager.clients[0].subscriptions) == 2
+    assert len(manager.processors) == 3
+
+@pytest.mark.asyncio
+async def test_native_streams_apply_deltas(okx_streams):
+    manager = ConnectionManager(okx_streams[:1])
+    received = []
+    manager.set_callback(lambda stream, orderbook: received.append(orderbook.ask_prices.tolist()))
+    route = manager.clients[0].callback
+    
+    assert manager.processors[("okx", "BTC-USDT")].incremental
+    for action, asks in [("snapshot", [["101", "1"], ["102", "2"]]), ("update", [["101", "0"]])]:
+        await route({"arg": {"channel": "books", "instId": "BTC-USDT"}, "action": action,
+                     "data": [{"asks": asks, "bids": [["99", "1"]], "ts": "1710928800000"}]})
+    
+    assert received == [[101.0, 102.0], [102.0]]
+
+@pytest.mark.asyncio
+async def test_sequence_gap_recycles_connection_until_next_snapshot(okx_streams):
+    manager = ConnectionManager(okx_streams[:1])
+    received = []
+    manager.set_callback(lambda stream, orderbook: received.append(orderbook.ask_prices.tolist()))
+    client = manager.clients[0]
+    client.recycle = Mock()
+    
+    def frame(action, seq_id, prev_seq_id, asks):
+        return {"arg": {"channel": "books", "instId": "BTC-USDT"}, "action": action,
+                "data": [{"asks": asks, "bids": [["99", "1"]], "ts": "1710928800000",
+                          "seqId": seq_id, "prevSeqId": prev_seq_id}]}
+    
+    await client.callback(frame("snapshot", 1, -1, [["101", "1"]]))
+    await client.callback(frame("update", 3, 2, [["102", "1"]]))
+    for seq_id in range(4, 7):
+        await client.callback(frame("update", seq_id, seq_id - 1, [["103", "1"]]))
+    assert received == [[101.0]]
+    client.recycle.assert_called_once()
+    
+    # The reconnect resubscribes; its snapshot restores the book without recycling again
+    client.on_reconnect()
+    await client.callback(frame("snapshot", 10, -1, [["101", "2"]]))
+    await client.callback(frame("update", 11, 10, [["102", "1"]]))
+    assert received == [[101.0], [101.0], [101.0, 102.0]]
+    client.recycle.assert_called_once()
+
+def test_delta_streams_reject_lossy_overflow_policies(okx_streams):
+    for policy in ("drop_oldest", "conflate"):
+        with pytest.raises(ValueError):
+            ConnectionManager(okx_streams[:1], overflow_policy=policy)
+
+def test_from_config():
+    config = TradingConfig(symbols=["BTC-USDT-SWAP", "ETH-USDT-SWAP"])
+    manager = ConnectionManager.from_config(config)
+    
+    assert [client.url for client in manager.clients] == [
+        "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/BTC-USDT-SWAP",
+        "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/ETH-USDT-SWAP"
+    ]
+
+@pytest.mark.asyncio
+async def test_messages_routed_per_symbol(okx_streams):
+    manager = ConnectionManager(okx_streams, max_streams_per_connection=3)
+    received = []
+    manager.set_callback(lambda stream, orderbook: received.append((stream.symbol, orderbook.mid_price)))
+    route = manager.clients[0].callback
+    
+    await route(book_frame("ETH-USDT", 3000.0))
+    await route(book_frame("BTC-USDT", 50000.0))
+    await route({
+        "arg": {"channel": "books", "instId": "SOL-USDT"},
+        "action": "snapshot",
+        "data": [{"asks": [["151", "3"]], "bids": [["149", "4"]], "ts": "1710928800000"}]
+    })
+    await route({"event": "subscribe", "arg": {"channel": "books", "instId": "SOL-USDT"}})
+    
+    assert received == [("ETH-USDT", 3000.0), ("BTC-USDT", 50000.0), ("SOL-USDT", 150.0)]
+    stats = manager.get_stream_stats()
+    assert stats["okx:ETH-USDT"]["messages"] == 1
+    assert stats["okx:SOL-USDT"]["avg_latency"] > 0
+
+@pytest.mark.asyncio
+async def test_forward_raw_frames(okx_streams):
+    manager = ConnectionManager(okx_streams)
+    forwarded = []
+    manager.forward_frames(lambda stream, frame: forwarded.append((stream.symbol, frame)))
+    
+    client = manager.clients[1]
+    client.callback(client.decoder.loads(b'{"raw": true}'))
+    assert forwarded == [("ETH-USDT", b'{"raw": true}')]
+    
+    with pytest.raises(ValueError):
+        ConnectionManager(okx_streams, max_streams_per_connection=2).forward_frames(print)
+
+def test_conflation_requires_dedicated_connections(okx_streams):
+    with pytest.raises(ValueError):
+        ConnectionManager(okx_streams, max_streams_per_connection=2, overflow_policy="conflate")
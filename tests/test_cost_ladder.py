@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.config.settings import TradingConfig
+from src.core.orderbook_processor import ArrayOrderBook
+from src.models.cost_ladder import CostLadderEngine
+from src.models.fill_simulator import FillSimulator
+from src.models.market_impact import AlmgrenChrissModel, MarketImpactParams
+
+@pytest.fixture
+def book():
+    return ArrayOrderBook(
+        timestamp=datetime.now(),
+        exchange="OKX",
+        symbol="BTC-USDT-SWAP",
+        ask_levels=np.array([[50001.0, 50002.0, 50005.0], [0.5, 1.0, 2.0]]),
+        bid_levels=np.array([[49999.0, 49998.0], [1.0, 1.0]])
+    )
+
+@pytest.fixture
+def config():
+    return TradingConfig(cost_ladder_quantities=[1000.0, 30000.0, 100000.0])
+
+def test_ladder_matches_single_order_costs(book, config):
+    ladder = CostLadderEngine.from_config(config).compute(book, sigma=0.02, maker_proportion=0.25)
+    
+    assert ladder.net_cost.shape == (3, 3)
+    assert ladder.fee_tiers == ("Tier 1", "Tier 2", "Tier 3")
+    assert ladder.maker_taker == 25.0
+    for i, quantity in enumerate(config.cost_ladder_quantities):
+        fill = FillSimulator(book).simulate(quantity, unit="quote")
+        base_quantity = quantity / book.mid_price
+        impact = AlmgrenChrissModel(MarketImpactParams(
+            eta=config.market_impact_eta, gamma=config.market_impact_gamma, sigma=0.02,
+            tau=config.time_horizon, initial_price=book.mid_price, total_quantity=base_quantity
+        )).calculate_market_impact(base_quantity, config.time_horizon)
+        assert ladder.slippage[i] == pytest.approx(fill.slippage_bps)
+        assert ladder.impact[i] == pytest.approx(impact)
+        for j, rate in enumerate(config.fee_tiers.values()):
+            fees = quantity * rate
+            assert ladder.fees[i, j] == pytest.approx(fees)
+            assert ladder.net_cost[i, j] == pytest.approx(quantity * (fill.slippage_bps + impact) / 10000 + fees)
+    
+    tier = ladder.tier("Tier 2")
+    assert tier['net_cost'].tolist() == ladder.net_cost[:, 1].tolist()
+    assert len(ladder.to_records()) == 9
+
+def test_orders_deeper_than_book_use_slippage_model(book, config):
+    class FixedModel:
+        def predict_slippage(self, quantity):
+            return 123.0
+    
+    engine = CostLadderEngine.from_config(config)
+    ladder = engine.compute(book, 0.02, 0.5, slippage_model=FixedModel())
+    
+    # The asks hold about 175k USD
+    assert ladder.fill_complete.tolist() == [True, True, True]
+    ladder = CostLadderEngine([1000.0, 500000.0], config.fee_tiers, 0.1, 0.1, 1.0).compute(
+        book, 0.02, 0.5, slippage_model=FixedModel()
+    )
+    assert ladder.fill_complete.tolist() == [True, False]
+    assert ladder.slippage[1] == 123.0
+    assert ladder.slippage[0] != 123.0
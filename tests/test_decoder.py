@@ -0,0 +1,52 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from src.core.decoder import MessageDecoder, TimestampParser, available_backends, parse_levels
+
+@pytest.fixture
+def raw_frame():
+    return json.dumps({
+        "timestamp": "2024-03-20T10:00:00.250Z",
+        "exchange": "OKX",
+        "symbol": "BTC-USDT-SWAP",
+        "asks": [["50000.0", "1.0"], ["50001.0", "2.0"]],
+        "bids": [["49999.0", "1.5"], ["49998.0", "2.5"]]
+    })
+
+def test_parse_levels():
+    levels = parse_levels([["100.5", "2", "0", "1"], ["101.0", "3", "0", "2"]])
+    
+    assert levels.shape == (2, 2)
+    assert levels.flags['C_CONTIGUOUS']
+    assert levels[0].tolist() == [100.5, 101.0]
+    assert levels[1].tolist() == [2.0, 3.0]
+    assert parse_levels([]).shape == (2, 0)
+
+def test_timestamp_parser():
+    parse = TimestampParser()
+    expected = datetime(2024, 3, 20, 10, 0, 0, 250000, tzinfo=timezone.utc)
+    
+    assert parse("2024-03-20T10:00:00.250Z") == expected
+    assert parse("2024-03-20T10:00:00.250Z") is parse("2024-03-20T10:00:00.250Z")
+    assert parse("1710928800250") == expected
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_decode_orderbook(backend, raw_frame):
+    message = MessageDecoder(backend).decode_orderbook(raw_frame)
+    
+    assert message["asks"][0].tolist() == [50000.0, 50001.0]
+    assert message["bids"][1].tolist() == [1.5, 2.5]
+    assert message["timestamp"].microsecond == 250000
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        MessageDecoder("simdjson")
+
+def test_processor_accepts_decoded_message(raw_frame):
+    from src.core.orderbook_processor import OrderBookProcessor
+    
+    message = MessageDecoder().decode_orderbook(raw_frame)
+    orderbook = OrderBookProcessor(columnar=True).process_message(message)
+    
+    assert orderbook.asks[0].price == 50000.0
+    assert orderbook.spread == 1.0
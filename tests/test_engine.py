@@ -0,0 +1,151 @@
+import pytest
+from datetime import datetime, timedelta
+from src.config.settings import TradingConfig
+from src.core.storage import TradingDataStorage
+from src.engine import SimulationEngine
+from src.models.maker_taker import MakerTakerPredictor
+
+def book_message(symbol, price):
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "exchange": "okx",
+        "symbol": symbol,
+        "asks": [[str(price + 1), "1.0"], [str(price + 2), "3.0"]],
+        "bids": [[str(price - 1), "2.0"], [str(price - 2), "4.0"]]
+    }
+
+@pytest.fixture
+def engine(tmp_path):
+    config = TradingConfig(symbols=["BTC-USDT-SWAP", "ETH-USDT-SWAP"])
+    storage = TradingDataStorage(str(tmp_path / "trading.db"))
+    engine = SimulationEngine(config, storage=storage, quantity=1000.0, fee_tier="Tier 2")
+    yield engine
+    storage.close()
+
+async def feed(engine, symbol, price):
+    stream = engine.connections.streams[("okx", symbol)]
+    await engine.connections.dispatch(stream, book_message(symbol, price))
+
+@pytest.mark.asyncio
+async def test_ticks_produce_metrics_for_subscribers(engine):
+    received = []
+    engine.subscribe(received.append)
+    
+    await feed(engine, "BTC-USDT-SWAP", 50000.0)
+    await feed(engine, "ETH-USDT-SWAP", 3000.0)
+    
+    assert [metrics['symbol'] for metrics in received] == ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+    metrics = received[0]
+    assert metrics['mid_price'] == 50000.0
+    # 1000 USD fits in the best ask at 50001
+    assert metrics['fill_complete']
+    assert metrics['slippage'] == pytest.approx(1.0 / 50000.0 * 10000)
+    assert metrics['fees'] == pytest.approx(1000.0 * 0.0008)
+    assert metrics['net_cost'] == pytest.approx(
+        1000.0 * (metrics['slippage'] + metrics['impact']) / 10000 + metrics['fees']
+    )
+    assert metrics['liquidity']['imbalance_1'] == pytest.approx(1 / 3)
+    assert set(engine.slippage_estimators) == {"BTC-USDT-SWAP", "ETH-USDT-SWAP"}
+    assert engine.performance_analyzer.get_performance_report()['total_ticks'] == 2
+
+@pytest.mark.asyncio
+async def test_maker_taker_learns_from_the_book(engine):
+    symbol = "BTC-USDT-SWAP"
+    engine.maker_taker_predictors[symbol] = MakerTakerPredictor(retrain_every=20, background=False)
+    stream = engine.connections.streams[("okx", symbol)]
+    received = []
+    engine.subscribe(received.append)
+    
+    async def tick(half_spread, bid_qty, ask_qty):
+        await engine.connections.dispatch(stream, {
+            "timestamp": datetime.now().isoformat(),
+            "asks": [[str(50000.0 + half_spread), str(ask_qty)]],
+            "bids": [[str(50000.0 - half_spread), str(bid_qty)]]
+        })
+        return received[-1]['maker_taker']
+    
+    # Until the first fit the prediction is the 50% prior
+    assert await tick(1.0, 1.0, 4.0) == 50.0
+    # Tight books have heavy offers (passive buys fill), wide ones heavy bids
+    for _ in range(30):
+        await tick(1.0, 1.0, 4.0)
+        await tick(3.0, 4.0, 1.0)
+    
+    assert engine.maker_taker_predictors[symbol].fit_count > 0
+    assert await tick(1.0, 1.0, 4.0) > 60.0
+    assert await tick(3.0, 4.0, 1.0) < 40.0
+
+@pytest.mark.asyncio
+async def test_slippage_fallback_trained_on_walked_sizes(engine):
+    received = []
+    engine.subscribe(received.append)
+    # 1e6 USD is deeper than the 4 BTC on the asks
+    engine.set_parameters(quantity=1e6)
+    
+    await feed(engine, "BTC-USDT-SWAP", 50000.0)
+    
+    estimator = engine.slippage_estimators["BTC-USDT-SWAP"]
+    assert len(estimator.features) > 2
+    assert received[0]['fill_complete'] is False
+    assert received[0]['slippage'] > 0
+
+@pytest.mark.asyncio
+async def test_live_volatility_replaces_static_sigma(engine):
+    received = []
+    engine.subscribe(received.append)
+    await feed(engine, "BTC-USDT-SWAP", 50000.0)
+    assert received[-1]['volatility'] == engine.volatility
+    # Without live volatility no estimator is built or fed
+    assert engine.volatility_estimators == {}
+    
+    engine.config.live_volatility = True
+    for i in range(20):
+        await feed(engine, "BTC-USDT-SWAP", 50000.0 + (-1) ** i * 10)
+    assert engine.volatility_estimators["BTC-USDT-SWAP"].ready
+    assert received[-1]['volatility'] == engine.volatility_estimators["BTC-USDT-SWAP"].sigma(engine.volatility)
+    assert received[-1]['volatility'] != engine.volatility
+
+@pytest.mark.asyncio
+async def test_cost_ladder_attached_to_metrics(tmp_path):
+    config = TradingConfig(cost_ladder_enabled=True, cost_ladder_quantities=[100.0, 1000.0])
+    engine = SimulationEngine(config, quantity=1000.0, fee_tier="Tier 2")
+    received = []
+    engine.subscribe(received.append)
+    await feed(engine, "BTC-USDT-SWAP", 50000.0)
+    
+    ladder = received[0]['cost_ladder']
+    assert ladder.net_cost.shape == (2, len(config.fee_tiers))
+    # The 1000 USD / Tier 2 cell is the engine's own order
+    assert ladder.net_cost[1, 1] == pytest.approx(received[0]['net_cost'])
+
+@pytest.mark.asyncio
+async def test_ticks_are_stored(engine):
+    for i in range(5):
+        await feed(engine, "BTC-USDT-SWAP", 50000.0 + i)
+    engine.storage.flush()
+    
+    data = engine.storage.get_historical_data(
+        datetime.now() - timedelta(minutes=1), datetime.now() + timedelta(minutes=1),
+        symbol="BTC-USDT-SWAP"
+    )
+    assert len(data['trading']) == 5
+    assert data['orderbook']['mid_price'].tolist() == [50000.0 + i for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_async_subscriber_and_failures_are_isolated(engine):
+    received = []
+    
+    async def subscriber(metrics):
+        received.append(metrics['symbol'])
+    
+    def broken(metrics):
+        raise RuntimeError("boom")
+    
+    engine.subscribe(broken)
+    engine.subscribe(subscriber)
+    await feed(engine, "BTC-USDT-SWAP", 50000.0)
+    assert received == ["BTC-USDT-SWAP"]
+
+def test_unknown_fee_tier_rejected():
+    with pytest.raises(ValueError):
+        SimulationEngine(TradingConfig(), fee_tier="Tier 9")
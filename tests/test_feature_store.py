@@ -0,0 +1,41 @@
+import numpy as np
+from src.models.feature_store import FeatureStore, RingBuffer
+from src.models.maker_taker import MakerTakerPredictor
+
+def test_ring_buffer_wraps_contiguously():
+    buffer = RingBuffer(capacity=3, n_columns=2)
+    for i in range(5):
+        buffer.append((i, 10 * i))
+    
+    view = buffer.view()
+    assert len(buffer) == 3
+    assert view[0].tolist() == [2, 3, 4]
+    assert view[1].tolist() == [20, 30, 40]
+    assert buffer.column(0).flags['C_CONTIGUOUS']
+    assert not view.flags['WRITEABLE']
+
+def test_feature_store_views_are_zero_copy():
+    store = FeatureStore(("a", "b", "c"), capacity=4)
+    for i in range(6):
+        store.append((i, i + 0.5, -i), timestamp=float(i))
+    
+    X = store.matrix("a", "b")
+    assert X.shape == (4, 2)
+    assert X[:, 1].tolist() == [2.5, 3.5, 4.5, 5.5]
+    assert np.shares_memory(X, store.column("a"))
+    assert store.matrix("a", "c")[:, 1].tolist() == [-2, -3, -4, -5]
+
+def test_feature_store_time_window():
+    store = FeatureStore(("x",), capacity=100, max_age=10.0)
+    for t in range(30):
+        store.append((t,), timestamp=float(t))
+    
+    assert store.timestamps().tolist() == [float(t) for t in range(19, 30)]
+
+def test_maker_taker_history_is_bounded():
+    predictor = MakerTakerPredictor(max_history=20)
+    for i in range(100):
+        predictor.update(1.0, 2.0, 3.0, 0.02, 0.5)
+    
+    assert predictor.orderbook_history.shape == (20, 4)
+    assert predictor.maker_taker_history.shape == (20,)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.core.orderbook_processor import ArrayOrderBook, OrderBook, OrderBookLevel
+from src.models.fill_simulator import FillSimulator
+
+@pytest.fixture
+def book():
+    return ArrayOrderBook(
+        timestamp=datetime.now(),
+        exchange="OKX",
+        symbol="BTC-USDT-SWAP",
+        ask_levels=np.array([[101.0, 102.0, 103.0], [1.0, 2.0, 3.0]]),
+        bid_levels=np.array([[99.0, 98.0], [1.0, 1.0]])
+    )
+
+def test_buy_walks_levels(book):
+    fill = FillSimulator(book).simulate(2.5, side="buy")
+    
+    assert fill.complete
+    assert fill.filled_quantity == 2.5
+    assert fill.notional == pytest.approx(101.0 + 1.5 * 102.0)
+    assert fill.vwap == pytest.approx(101.6)
+    assert fill.levels_consumed == 2
+    assert fill.worst_price == 102.0
+    assert fill.slippage_bps == pytest.approx(160.0)
+
+def test_exact_level_boundary(book):
+    fill = FillSimulator(book).simulate(1.0)
+    assert fill.levels_consumed == 1
+    assert fill.vwap == 101.0
+
+def test_quote_quantity(book):
+    fill = FillSimulator(book).simulate(101.0 + 2 * 102.0, unit="quote")
+    assert fill.filled_quantity == pytest.approx(3.0)
+    assert fill.levels_consumed == 2
+    assert fill.vwap == pytest.approx(305.0 / 3.0)
+
+def test_sell_slippage_is_positive_cost(book):
+    fill = FillSimulator(book).simulate(1.5, side="sell")
+    assert fill.vwap == pytest.approx((99.0 + 0.5 * 98.0) / 1.5)
+    assert fill.worst_price == 98.0
+    assert fill.slippage_bps == pytest.approx((100.0 - fill.vwap) / 100.0 * 10000)
+
+def test_order_larger_than_book(book):
+    fill = FillSimulator(book).simulate(10.0)
+    assert not fill.complete
+    assert fill.filled_quantity == 6.0
+    assert fill.levels_consumed == 3
+    assert fill.worst_price == 103.0
+
+def test_batch_matches_single_fills(book):
+    simulator = FillSimulator(book)
+    sizes = [0.0, 0.5, 1.0, 2.5, 6.0, 7.0]
+    batch = simulator.simulate_batch(sizes)
+    
+    assert batch.levels_consumed.tolist() == [0, 1, 1, 2, 3, 3]
+    assert batch.complete.tolist() == [True, True, True, True, True, False]
+    for i, size in enumerate(sizes[1:], start=1):
+        single = simulator.simulate(size)
+        assert batch[i].vwap == pytest.approx(single.vwap)
+        assert batch[i].notional == pytest.approx(single.notional)
+
+def test_list_orderbook_and_empty_side():
+    book = OrderBook(
+        timestamp=datetime.now(), exchange="OKX", symbol="BTC-USDT-SWAP",
+        asks=[OrderBookLevel(101.0, 1.0), OrderBookLevel(102.0, 2.0)], bids=[]
+    )
+    simulator = FillSimulator(book)
+    assert simulator.simulate(2.0).vwap == pytest.approx((101.0 + 102.0) / 2)
+    
+    fill = simulator.simulate(1.0, side="sell")
+    assert not fill.complete
+    assert fill.filled_quantity == 0.0
+
+def test_invalid_arguments(book):
+    with pytest.raises(ValueError):
+        FillSimulator(book).simulate(1.0, side="short")
+    with pytest.raises(ValueError):
+        FillSimulator(book).simulate(1.0, unit="contracts")
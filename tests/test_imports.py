@@ -0,0 +1,25 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("sklearn", "scipy", "pandas", "pyarrow", "PyQt6", "PySide6", "pyqtgraph")
+
+@pytest.mark.parametrize("module", [
+    "src.engine",
+    "src.core.storage",
+    "src.core.archive",
+    "src.models.slippage",
+    "src.models.maker_taker",
+    "src.models.market_impact"
+])
+def test_import_does_not_load_heavy_dependencies(module):
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}} & {set(HEAVY_MODULES)!r})))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    assert json.loads(result.stdout) == []
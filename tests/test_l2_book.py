@@ -0,0 +1,95 @@
+import json
+import pytest
+from src.core.decoder import MessageDecoder
+from src.core.l2_book import L2Book, SequenceGapError, ChecksumMismatchError
+from src.core.orderbook_processor import OrderBookProcessor
+
+@pytest.fixture
+def snapshot_message():
+    return {
+        "action": "snapshot",
+        "timestamp": "2024-03-20T10:00:00Z",
+        "exchange": "OKX",
+        "symbol": "BTC-USDT-SWAP",
+        "seqId": 10,
+        "prevSeqId": -1,
+        "asks": [["50001.0", "2.0"], ["50000.0", "1.0"]],
+        "bids": [["49999.0", "1.5"], ["49998.0", "2.5"]]
+    }
+
+def test_snapshot_then_delta(snapshot_message):
+    book = L2Book()
+    book.apply(snapshot_message)
+    book.apply({
+        "action": "update",
+        "seqId": 11,
+        "prevSeqId": 10,
+        "asks": [["50000.0", "0"], ["50002.0", "3.0"]],
+        "bids": [["49999.5", "0.5"], ["49998.0", "4.0"]]
+    })
+    
+    orderbook = book.to_orderbook()
+    assert orderbook.ask_prices.tolist() == [50001.0, 50002.0]
+    assert orderbook.bid_prices.tolist() == [49999.5, 49999.0, 49998.0]
+    assert orderbook.bids[2].quantity == 4.0
+    assert orderbook.spread == 1.5
+    assert book.seq_id == 11
+
+def test_view_is_lazy_and_keeps_its_version(snapshot_message):
+    book = L2Book()
+    book.apply(snapshot_message)
+    view = book.to_orderbook()
+    assert book.to_orderbook() is view
+    assert view._book is book  # nothing materialized yet
+    
+    book.apply({"action": "update", "seqId": 11, "prevSeqId": 10,
+                "asks": [["50000.0", "0"]], "bids": []})
+    assert view.ask_prices.tolist() == [50000.0, 50001.0]
+    latest = book.to_orderbook()
+    assert latest is not view
+    assert latest.ask_prices.tolist() == [50001.0]
+    assert latest.timestamp == view.timestamp
+
+def test_processor_accepts_decoded_messages(snapshot_message):
+    decoder = MessageDecoder()
+    processor = OrderBookProcessor(incremental=True)
+    
+    orderbook = processor.process_message(decoder.decode_orderbook(json.dumps(snapshot_message)))
+    assert orderbook.ask_prices.tolist() == [50000.0, 50001.0]
+    update = {"action": "update", "seqId": 11, "prevSeqId": 10, "checksum": 123,
+              "asks": [["50000.0", "0"]], "bids": [["49999.5", "0.5"]]}
+    orderbook = processor.process_message(decoder.decode_orderbook(json.dumps(update)))
+    assert orderbook.ask_prices.tolist() == [50001.0]
+    assert orderbook.bid_prices.tolist() == [49999.5, 49999.0, 49998.0]
+    assert not processor.resync_required
+
+def test_sequence_gap_raises(snapshot_message):
+    book = L2Book()
+    book.apply(snapshot_message)
+    with pytest.raises(SequenceGapError):
+        book.apply({"action": "update", "seqId": 13, "prevSeqId": 12, "asks": [], "bids": []})
+
+def test_checksum_validation(snapshot_message):
+    book = L2Book()
+    book.apply(snapshot_message)
+    checksum = book.checksum()
+    
+    book.apply({"action": "update", "seqId": 11, "prevSeqId": 10,
+                "asks": [], "bids": [], "checksum": checksum})
+    with pytest.raises(ChecksumMismatchError):
+        book.apply({"action": "update", "seqId": 12, "prevSeqId": 11,
+                    "asks": [["50005.0", "1.0"]], "bids": [], "checksum": checksum})
+
+def test_processor_resyncs_on_gap(snapshot_message):
+    reasons = []
+    processor = OrderBookProcessor(incremental=True, on_resync=reasons.append)
+    
+    assert processor.process_message(snapshot_message).mid_price == (50000.0 + 49999.0) / 2
+    assert processor.process_message(
+        {"action": "update", "seqId": 20, "prevSeqId": 19, "asks": [], "bids": []}
+    ) is None
+    assert processor.resync_required
+    assert len(reasons) == 1
+    
+    assert processor.process_message(snapshot_message) is not None
+    assert not processor.resync_required
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.core.level_codec import decode_levels, encode_levels, is_encoded_levels
+from src.core.storage import TradingDataStorage
+
+@pytest.fixture
+def levels():
+    asks = np.array([[50000.1, 50000.2, 50001.5], [1.0, 0.25, 3.0]])
+    bids = np.array([[50000.0, 49999.9, 49990.0], [2.0, 0.5, 7.125]])
+    return asks, bids
+
+@pytest.mark.parametrize("delta", [True, False])
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip(levels, delta, compress):
+    asks, bids = levels
+    blob = encode_levels(asks, bids, delta=delta, compress=compress)
+    decoded_asks, decoded_bids = decode_levels(blob)
+    
+    assert is_encoded_levels(blob)
+    assert np.array_equal(decoded_asks, asks)
+    assert np.array_equal(decoded_bids, bids)
+
+def test_non_decimal_prices_fall_back_to_float(levels):
+    asks, bids = levels
+    asks = asks.copy()
+    asks[0] += np.pi * 1e-7
+    decoded_asks, _ = decode_levels(encode_levels(asks, bids))
+    
+    assert np.array_equal(decoded_asks, asks)
+
+def test_storage_round_trip(tmp_path, levels):
+    asks, bids = levels
+    storage = TradingDataStorage(str(tmp_path / "trading.db"))
+    now = datetime.now(timezone.utc)
+    storage.save_orderbook_snapshot({
+        'timestamp': now,
+        'exchange': 'okx',
+        'symbol': 'BTC-USDT-SWAP',
+        'mid_price': 50000.05,
+        'spread': 0.1,
+        'depth': 7.0,
+        'volume': 14.0,
+        'data': {'asks': [[str(p), str(q)] for p, q in asks.T], 'bids': bids}
+    })
+    storage.flush()
+    
+    rows = list(storage.iter_orderbook_levels(now - timedelta(seconds=1), now + timedelta(seconds=1)))
+    storage.close()
+    assert len(rows) == 1
+    assert rows[0][1] == 'BTC-USDT-SWAP'
+    assert np.array_equal(rows[0][2], asks)
+    assert np.array_equal(rows[0][3], bids)
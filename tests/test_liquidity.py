@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.core.l2_book import L2Book
+from src.core.liquidity import LiquidityProfile
+from src.core.orderbook_processor import ArrayOrderBook, OrderBook, OrderBookLevel
+
+@pytest.fixture
+def book():
+    return ArrayOrderBook(
+        timestamp=datetime.now(),
+        exchange="OKX",
+        symbol="BTC-USDT-SWAP",
+        ask_levels=np.array([[100.5, 101.0, 102.0], [1.0, 2.0, 3.0]]),
+        bid_levels=np.array([[99.5, 99.0, 97.0], [2.0, 1.0, 4.0]])
+    )
+
+def test_depth_and_imbalance_at_levels(book):
+    profile = book.liquidity
+    
+    assert profile.mid_price == 100.0
+    assert profile.depth_at_levels(1) == (2.0, 1.0)
+    assert profile.depth_at_levels(2) == (3.0, 3.0)
+    assert profile.depth_at_levels(10) == (7.0, 6.0)
+    assert profile.imbalance(1) == pytest.approx(1 / 3)
+    assert profile.imbalance(2) == 0.0
+    assert book.total_volume == 13.0
+    assert book.depth == 6.5
+
+def test_depth_within_bps_bands(book):
+    bid, ask = book.liquidity.depth_within_bps([10, 50, 100, 1000])
+    
+    assert bid.tolist() == [0.0, 2.0, 3.0, 7.0]
+    assert ask.tolist() == [0.0, 1.0, 3.0, 6.0]
+    assert book.liquidity.imbalance_within_bps(50) == pytest.approx(1 / 3)
+
+def test_depth_at_notional(book):
+    quantity, levels = book.liquidity.depth_at_notional([0.0, 50.25, 100.5 + 202.0, 1e6], side="ask")
+    
+    assert quantity[:3].tolist() == pytest.approx([0.0, 0.5, 3.0])
+    assert np.isnan(quantity[3])
+    assert levels.tolist() == [0, 1, 2, 3]
+    with pytest.raises(ValueError):
+        book.liquidity.depth_at_notional(1.0, side="buy")
+
+def test_profile_is_cached_per_book_version(book):
+    assert book.liquidity is book.liquidity
+    summary = book.liquidity.summary(levels=[1], bands_bps=[50])
+    assert summary == {
+        "imbalance_1": pytest.approx(1 / 3),
+        "bid_depth_50bps": 2.0,
+        "ask_depth_50bps": 1.0,
+        "imbalance_50bps": pytest.approx(1 / 3)
+    }
+    assert book.liquidity.summary(levels=[1], bands_bps=[50]) is summary
+    
+    l2 = L2Book()
+    l2.apply({
+        "action": "snapshot", "exchange": "OKX", "symbol": "BTC-USDT-SWAP",
+        "asks": [["100.5", "1.0"]], "bids": [["99.5", "2.0"]]
+    })
+    view = l2.to_orderbook()
+    first = view.liquidity
+    assert l2.to_orderbook().liquidity is first
+    l2.apply({"action": "update", "asks": [["100.5", "4.0"]], "bids": []})
+    assert l2.to_orderbook().liquidity is not first
+    assert l2.to_orderbook().liquidity.depth_at_levels(1) == (2.0, 4.0)
+
+def test_list_orderbook_and_empty_side():
+    book = OrderBook(
+        timestamp=datetime.now(), exchange="OKX", symbol="BTC-USDT-SWAP",
+        asks=[OrderBookLevel(100.5, 1.0)], bids=[]
+    )
+    profile = book.liquidity
+    
+    assert isinstance(profile, LiquidityProfile)
+    assert book.total_volume == 1.0
+    assert profile.depth_at_levels(5) == (0.0, 1.0)
+    bid, ask = profile.depth_within_bps(100)
+    assert (bid, ask) == (0.0, 0.0)
+    assert profile.imbalance(5) == -1.0
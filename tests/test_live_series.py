@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.config.settings import TradingConfig
+from src.engine import SimulationEngine
+from src.models.feature_store import RingBuffer
+from src.ui.live_series import PLOT_COLUMNS, live_row, visible_series
+
+def test_orderbook_tab_gets_points_from_engine_metrics():
+    engine = SimulationEngine(TradingConfig(), quantity=1000.0)
+    processor = engine.connections.processors[("okx", "BTC-USDT-SWAP")]
+    metrics = engine.compute_metrics(processor.process_message({
+        "timestamp": datetime.now().isoformat(),
+        "exchange": "okx",
+        "symbol": "BTC-USDT-SWAP",
+        "asks": [["50001", "1.0"], ["50002", "3.0"]],
+        "bids": [["49999", "2.0"], ["49998", "4.0"]]
+    }))
+    
+    assert live_row('orderbook_snapshots', metrics, timestamp=1.0) == [1.0, 2.0, 5.0, 10.0]
+    assert live_row('trading_metrics', {'slippage': 1.5}, timestamp=1.0)[1:2] == [1.5]
+    assert np.isnan(live_row('trading_metrics', {}, timestamp=1.0)[1:]).all()
+
+def test_window_slides_with_the_clock():
+    buffer = RingBuffer(10, len(PLOT_COLUMNS['orderbook_snapshots']) + 1)
+    for t in range(100, 106):
+        buffer.append(live_row('orderbook_snapshots', {'spread': t}, timestamp=float(t)))
+    live = buffer.view()
+    history = (np.array([90.0, 99.0]), np.array([1.0, 2.0]), np.array([0.0, 1.0]), np.array([2.0, 3.0]))
+    
+    x, mean, low, high = visible_series(history, live[0], live[1], history_end=99.5, now=105.0, span=10.0)
+    assert x.tolist() == [99.0, 100.0, 101.0, 102.0, 103.0, 104.0, 105.0]
+    assert mean.tolist() == [2.0, 100.0, 101.0, 102.0, 103.0, 104.0, 105.0]
+    assert low[0] == 1.0 and high[0] == 3.0
+    
+    # Without a storage reload, later redraws drop what left the range
+    x, mean, _, _ = visible_series(history, live[0], live[1], history_end=99.5, now=113.5, span=10.0)
+    assert x.tolist() == [104.0, 105.0]
+    assert mean.tolist() == pytest.approx([104.0, 105.0])
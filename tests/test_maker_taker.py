@@ -0,0 +1,42 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from src.models.maker_taker import MakerTakerPredictor, fit_logistic
+
+def feed(predictor, n, rng):
+    for _ in range(n):
+        spread = rng.uniform(0.1, 2.0)
+        # Tighter spreads attract more passive (maker) flow
+        predictor.update(spread, 10.0, 5.0, 0.02, 1.0 / (1.0 + np.exp(2.0 * (spread - 1.0))))
+
+def test_fit_logistic_recovers_proportions():
+    X = np.column_stack([np.linspace(0, 2, 50), np.ones(50), np.ones(50), np.ones(50)])
+    y = 1.0 / (1.0 + np.exp(2.0 * (X[:, 0] - 1.0)))
+    coefficients = fit_logistic(X, y)
+    
+    z = X @ coefficients.coef + coefficients.intercept
+    assert np.allclose(1.0 / (1.0 + np.exp(-z)), y, atol=0.05)
+
+def test_retrain_is_rate_limited():
+    rng = np.random.default_rng(1)
+    predictor = MakerTakerPredictor(retrain_every=50, retrain_interval=3600, background=False)
+    
+    feed(predictor, 9, rng)
+    assert predictor.predict_maker_proportion(1.0, 10.0, 5.0, 0.02) == 0.5
+    feed(predictor, 100, rng)
+    
+    assert predictor.fit_count == 2
+    assert predictor.predict_maker_proportion(0.2, 10.0, 5.0, 0.02) > 0.7
+    assert predictor.predict_maker_proportion(1.8, 10.0, 5.0, 0.02) < 0.3
+
+def test_background_retrain_swaps_coefficients():
+    rng = np.random.default_rng(2)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        predictor = MakerTakerPredictor(retrain_every=20, executor=executor)
+        feed(predictor, 30, rng)
+        predictor.wait_for_retrain(timeout=10)
+    
+    metrics = predictor.get_model_metrics()
+    assert predictor.coefficients is not None
+    assert metrics['fits'] >= 1
+    assert metrics['last_fit_duration_ms'] > 0
+    assert metrics['model_staleness_seconds'] >= 0
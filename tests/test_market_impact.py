@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from src.models.market_impact import AlmgrenChrissModel, MarketImpactParams
 
@@ -27,4 +28,23 @@ def test_optimal_execution(market_impact_model):
 def test_market_impact_calculation(market_impact_model):
     impact = market_impact_model.calculate_market_impact(1.0, 1.0)
     assert impact >= 0
-    assert isinstance(impact, float) 
\ No newline at end of file
+    assert isinstance(impact, float)
+
+
+def test_batch_matches_scalar(market_impact_model):
+    quantities = np.array([0.5, 1.0, 2.0])
+    times = np.array([0.5, 1.0, 4.0])
+    
+    impacts = market_impact_model.calculate_market_impact_batch(quantities, times)
+    costs = market_impact_model.estimate_execution_cost_batch(quantities, times)
+    for i, (quantity, time) in enumerate(zip(quantities, times)):
+        assert impacts[i] == pytest.approx(market_impact_model.calculate_market_impact(quantity, time))
+        assert costs[i] == pytest.approx(market_impact_model.estimate_execution_cost(quantity, time))
+
+def test_cost_surface_shape(market_impact_model):
+    surface = market_impact_model.cost_surface([1.0, 2.0], [0.5, 1.0, 2.0], [0.01, 0.02, 0.03, 0.04])
+    
+    assert surface.impact.shape == (2, 3, 4)
+    assert surface.cost.shape == (2, 3, 4)
+    expected = AlmgrenChrissModel(market_impact_model.params).calculate_market_impact_batch(2.0, 0.5, 0.03)
+    assert surface.impact[1, 0, 2] == pytest.approx(expected)
@@ -1,6 +1,6 @@
 import pytest
 from datetime import datetime
-from src.core.orderbook_processor import OrderBookProcessor, OrderBook
+from src.core.orderbook_processor import OrderBookProcessor, OrderBook, ArrayOrderBook
 
 @pytest.fixture
 def sample_orderbook_data():
@@ -38,4 +38,32 @@ def test_calculate_mid_price(processor, sample_orderbook_data):
     mid_price = processor.calculate_mid_price()
     
     expected_mid = (50000.0 + 49999.0) / 2
-    assert mid_price == expected_mid 
\ No newline at end of file
+    assert mid_price == expected_mid
+
+def test_delta_rejected_without_incremental(processor, sample_orderbook_data):
+    sample_orderbook_data["action"] = "update"
+    with pytest.raises(ValueError):
+        processor.process_message(sample_orderbook_data)
+    assert processor.current_orderbook is None
+
+def test_columnar_process_message(sample_orderbook_data):
+    processor = OrderBookProcessor(columnar=True)
+    orderbook = processor.process_message(sample_orderbook_data)
+    
+    assert isinstance(orderbook, ArrayOrderBook)
+    assert orderbook.ask_prices.flags['C_CONTIGUOUS']
+    assert orderbook.bid_quantities.tolist() == [1.5, 2.5]
+    assert len(orderbook.asks) == 2
+    assert orderbook.asks[0].price == 50000.0
+    assert orderbook.bids[-1].quantity == 2.5
+    assert processor.calculate_mid_price() == (50000.0 + 49999.0) / 2
+
+def test_columnar_matches_list_orderbook(processor, sample_orderbook_data):
+    orderbook = processor.process_message(sample_orderbook_data)
+    columnar = ArrayOrderBook.from_orderbook(orderbook)
+    
+    assert columnar.mid_price == orderbook.mid_price
+    assert columnar.spread == orderbook.spread
+    assert columnar.depth == orderbook.depth
+    assert columnar.total_volume == orderbook.total_volume
+    assert [level.price for level in columnar.bids] == [level.price for level in orderbook.bids]
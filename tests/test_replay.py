@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.config.settings import TradingConfig
+from src.core.connection_manager import ConnectionManager, StreamSpec
+from src.core.replay import Replayer, iter_capture_file, iter_storage_snapshots, write_capture_file
+from src.core.storage import TradingDataStorage
+from src.engine import SimulationEngine, main
+
+T0 = datetime(2024, 3, 20, 10, tzinfo=timezone.utc)
+
+def flat_frame(symbol, price, seconds):
+    return {
+        "timestamp": (T0 + timedelta(seconds=seconds)).isoformat(),
+        "exchange": "okx",
+        "symbol": symbol,
+        "asks": [[str(price + 1), "1.0"], [str(price + 2), "2.5"]],
+        "bids": [[str(price - 1), "2.0"], [str(price - 2), "1.5"]]
+    }
+
+@pytest.fixture
+def capture(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    frames = []
+    for i in range(10):
+        frames.append(flat_frame("BTC-USDT", 50000.0 + i, i))
+        frames.append(flat_frame("ETH-USDT", 3000.0 + i, i))
+    frames.append(flat_frame("DOGE-USDT", 0.1, 10))
+    frames.append({
+        "arg": {"channel": "books", "instId": "BTC-USDT"},
+        "action": "snapshot",
+        "data": [{"asks": [["50101", "1"]], "bids": [["50099", "1"]], "ts": str(int(T0.timestamp() * 1000) + 11000)}]
+    })
+    write_capture_file(str(path), frames)
+    return path
+
+def make_manager(symbols):
+    return ConnectionManager([StreamSpec("okx", symbol, "wss://example") for symbol in symbols])
+
+@pytest.mark.asyncio
+async def test_capture_replay_applies_native_deltas(tmp_path):
+    path = tmp_path / "native.jsonl"
+    ts = int(T0.timestamp() * 1000)
+    frames = [{
+        "arg": {"channel": "books", "instId": "BTC-USDT"},
+        "action": "snapshot",
+        "data": [{"asks": [["50101", "1", "0", "1"], ["50102", "2", "0", "1"]],
+                  "bids": [["50099", "1", "0", "1"], ["50098", "2", "0", "1"]], "ts": str(ts)}]
+    }, {
+        "arg": {"channel": "books", "instId": "BTC-USDT"},
+        "action": "update",
+        "data": [{"asks": [["50101", "0", "0", "0"]], "bids": [], "ts": str(ts + 100)}]
+    }, {
+        "arg": {"channel": "books", "instId": "BTC-USDT"},
+        "action": "update",
+        "data": [{"asks": [], "bids": [["50100", "3", "0", "1"]], "ts": str(ts + 200)}]
+    }]
+    write_capture_file(str(path), frames)
+    manager = make_manager(["BTC-USDT"])
+    received = []
+    manager.set_callback(lambda stream, orderbook: received.append(
+        (orderbook.bids[0].price, orderbook.asks[0].price)))
+    
+    stats = await Replayer(manager).run(iter_capture_file(str(path)))
+    
+    assert stats.updates == 3
+    assert stats.errors == 0
+    assert received == [(50099.0, 50101.0), (50099.0, 50102.0), (50100.0, 50102.0)]
+
+@pytest.mark.asyncio
+async def test_unapplied_updates_are_not_counted(tmp_path):
+    path = tmp_path / "orphan.jsonl"
+    write_capture_file(str(path), [{
+        "arg": {"channel": "books", "instId": "BTC-USDT"},
+        "action": "update",
+        "data": [{"asks": [["50101", "1", "0", "1"]], "bids": [], "ts": str(int(T0.timestamp() * 1000))}]
+    }, flat_frame("BTC-USDT", 50000.0, 1)])
+    manager = make_manager(["BTC-USDT"])
+    received = []
+    manager.set_callback(lambda stream, orderbook: received.append(orderbook.mid_price))
+    
+    stats = await Replayer(manager).run(iter_capture_file(str(path)))
+    
+    # A delta before any snapshot cannot be applied; the full book after it can
+    assert stats.updates == 1
+    assert stats.errors == 1
+    assert received == [50000.0]
+
+@pytest.mark.asyncio
+async def test_capture_replay_routes_through_processors(capture):
+    manager = make_manager(["BTC-USDT", "ETH-USDT"])
+    received = []
+    manager.set_callback(lambda stream, orderbook: received.append((stream.symbol, orderbook.mid_price)))
+    
+    stats = await Replayer(manager).run(iter_capture_file(str(capture)))
+    
+    assert stats.messages == 22
+    assert stats.updates == 21
+    assert stats.skipped == 1
+    assert stats.messages_per_second > 0
+    assert received[:2] == [("BTC-USDT", 50000.0), ("ETH-USDT", 3000.0)]
+    assert received[-1] == ("BTC-USDT", 50100.0)
+    # Replayed exchange timestamps are old; they must not count as feed latency
+    assert manager.get_stream_stats()["okx:BTC-USDT"]["avg_latency"] == 0.0
+
+@pytest.mark.asyncio
+async def test_paced_replay_follows_recorded_timestamps(capture):
+    now = [0.0]
+    sleeps = []
+    
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+    
+    manager = make_manager(["BTC-USDT", "ETH-USDT"])
+    replayer = Replayer(manager, speed=4.0, clock=lambda: now[0], sleep=fake_sleep)
+    stats = await replayer.run(iter_capture_file(str(capture)))
+    
+    # 11 seconds of recorded data at 4x wall-clock
+    assert sum(sleeps) == pytest.approx(11 / 4)
+    assert stats.elapsed_seconds == pytest.approx(11 / 4)
+
+@pytest.mark.asyncio
+async def test_storage_replay_is_deterministic(tmp_path):
+    storage = TradingDataStorage(str(tmp_path / "recorded.db"))
+    rng = np.random.default_rng(0)
+    for i in range(50):
+        mid = 50000.0 + rng.normal()
+        storage.save_orderbook_snapshot({
+            'timestamp': T0 + timedelta(seconds=i), 'exchange': 'okx', 'symbol': 'BTC-USDT',
+            'mid_price': mid, 'spread': 1.0, 'depth': 3.0, 'volume': 6.0,
+            'data': {'asks': np.array([[mid + 0.5, mid + 1.5], rng.uniform(0.1, 3, 2)]),
+                     'bids': np.array([[mid - 0.5, mid - 1.5], rng.uniform(0.1, 3, 2)])}
+        })
+    storage.flush()
+    
+    async def run_once():
+        engine = SimulationEngine(TradingConfig(symbols=["BTC-USDT"]))
+        results = []
+        engine.subscribe(lambda metrics: results.append((metrics['slippage'], metrics['net_cost'])))
+        events = iter_storage_snapshots(storage, T0, T0 + timedelta(minutes=1))
+        stats = await engine.replay(events)
+        return stats, results
+    
+    first_stats, first = await run_once()
+    _, second = await run_once()
+    storage.close()
+    
+    assert first_stats.updates == 50
+    assert len(first) == 50
+    assert first == second
+
+def test_invalid_speed():
+    with pytest.raises(ValueError):
+        Replayer(make_manager(["BTC-USDT"]), speed=0)
+
+def test_replay_db_refuses_to_write_into_its_source(tmp_path, capsys):
+    path = str(tmp_path / "trading.db")
+    with pytest.raises(SystemExit):
+        main(["--replay-db", path, "--db", str(tmp_path / "." / "trading.db")])
+    assert "same database" in capsys.readouterr().err
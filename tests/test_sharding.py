@@ -0,0 +1,97 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from src.config.settings import TradingConfig
+from src.engine import SimulationEngine
+from src.sharding import ShardedEngine
+
+SYMBOLS = ["BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"]
+
+def book_frame(symbol, price):
+    return json.dumps({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "exchange": "okx",
+        "symbol": symbol,
+        "asks": [[str(price + 1), "1.0"], [str(price + 2), "3.0"]],
+        "bids": [[str(price - 1), "2.0"], [str(price - 2), "4.0"]]
+    })
+
+@pytest.mark.asyncio
+async def test_workers_return_same_metrics_as_single_process():
+    config = TradingConfig(symbols=SYMBOLS)
+    sharded = ShardedEngine(config, workers=2, quantity=100.0, fee_tier="Tier 2")
+    received = []
+    sharded.subscribe(received.append)
+    assert [sharded.shard_of(symbol) for symbol in SYMBOLS] == [0, 1, 0]
+    
+    sharded.start_workers()
+    frames = [(symbol, book_frame(symbol, 100.0 * (i + 1) + tick))
+              for tick in range(5) for i, symbol in enumerate(SYMBOLS)]
+    for symbol, frame in frames:
+        await sharded.submit(symbol, frame)
+    await sharded.close()
+    
+    assert len(received) == len(frames)
+    # Order is kept per symbol (one worker each), not across workers
+    for symbol in SYMBOLS:
+        mids = [metrics['mid_price'] for metrics in received if metrics['symbol'] == symbol]
+        assert mids == sorted(mids)
+    
+    single = SimulationEngine(config, quantity=100.0, fee_tier="Tier 2")
+    processor = single.connections.processors[("okx", "ETH-USDT-SWAP")]
+    expected = single.compute_metrics(processor.process_message(json.loads(book_frame("ETH-USDT-SWAP", 204.0))))
+    actual = sharded.latest["ETH-USDT-SWAP"]
+    for name in ('mid_price', 'spread', 'slippage', 'fees', 'impact', 'net_cost'):
+        assert actual[name] == pytest.approx(expected[name])
+    assert sharded.performance_analyzer.get_performance_report()['total_ticks'] == len(frames)
+
+@pytest.mark.asyncio
+async def test_parameters_reach_workers():
+    sharded = ShardedEngine(TradingConfig(symbols=SYMBOLS[:1]), workers=4, quantity=1000.0)
+    assert sharded.workers == 1
+    received = []
+    sharded.subscribe(received.append)
+    
+    sharded.start_workers()
+    await sharded.submit(SYMBOLS[0], book_frame(SYMBOLS[0], 100.0))
+    sharded.set_parameters(quantity=2000.0, fee_tier="Tier 3")
+    await sharded.submit(SYMBOLS[0], book_frame(SYMBOLS[0], 100.0))
+    await sharded.close()
+    
+    assert [metrics['fees'] for metrics in received] == pytest.approx([1000.0 * 0.001, 2000.0 * 0.0006])
+
+@pytest.mark.asyncio
+async def test_overflow_policy_drops_instead_of_blocking():
+    config = TradingConfig(symbols=SYMBOLS[:1], ingest_queue_size=2, ingest_overflow_policy="drop_oldest")
+    sharded = ShardedEngine(config, workers=1, quantity=100.0)
+    received = []
+    sharded.subscribe(received.append)
+    
+    sharded.start_workers()
+    # The writer task has not run yet, so the queue overflows
+    for tick in range(5):
+        await sharded.submit(SYMBOLS[0], book_frame(SYMBOLS[0], 100.0 + tick))
+    assert sharded.dropped == 3
+    await sharded.close()
+    
+    assert [metrics['mid_price'] for metrics in received] == [103.0, 104.0]
+    assert sharded.performance_analyzer.get_performance_report()['dropped_messages'] == 3
+
+@pytest.mark.asyncio
+async def test_parameters_survive_queue_overflow():
+    config = TradingConfig(symbols=SYMBOLS[:1], ingest_queue_size=2, ingest_overflow_policy="drop_oldest")
+    sharded = ShardedEngine(config, workers=1, quantity=1000.0)
+    received = []
+    sharded.subscribe(received.append)
+    
+    sharded.start_workers()
+    await sharded.submit(SYMBOLS[0], book_frame(SYMBOLS[0], 100.0))
+    sharded.set_parameters(quantity=2000.0, fee_tier="Tier 3")
+    # The writer task has not run yet; the frames behind the control overflow the queue
+    for tick in range(1, 5):
+        await sharded.submit(SYMBOLS[0], book_frame(SYMBOLS[0], 100.0 + tick))
+    assert sharded.dropped == 3
+    await sharded.close()
+    
+    assert [metrics['mid_price'] for metrics in received] == [103.0, 104.0]
+    assert [metrics['fees'] for metrics in received] == pytest.approx([2000.0 * 0.0006] * 2)
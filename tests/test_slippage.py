@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from src.models.slippage import OnlineQuantileRegressor, OrderBookLevel, SlippageEstimator
+
+def test_online_quantile_regressor_tracks_quantile():
+    rng = np.random.default_rng(0)
+    model = OnlineQuantileRegressor(quantile=0.9)
+    for _ in range(50000):
+        x = rng.uniform(0, 100)
+        model.partial_fit(x, 2 * x + rng.normal(0, 5))
+    
+    # 90th percentile of N(100, 5) is ~106.4
+    assert model.predict(50.0) == pytest.approx(106.4, abs=3.0)
+
+def test_online_mode_bounded_history():
+    estimator = SlippageEstimator(mode="online", max_history=50)
+    levels = [OrderBookLevel(100.0, 1.0), OrderBookLevel(101.0, 2.0)]
+    for _ in range(200):
+        estimator.update(levels, 1.0)
+    
+    assert len(estimator.volume_history) == 50
+    assert estimator.online_model.n_samples == 200
+    assert estimator.predict_slippage(3.0) >= 0.0
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        SlippageEstimator(mode="streaming")
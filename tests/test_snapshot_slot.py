@@ -0,0 +1,37 @@
+import threading
+from src.core.snapshot_slot import LatestSlot
+
+def test_take_returns_latest_value_once():
+    slot = LatestSlot()
+    assert slot.take() is None
+    
+    for i in range(5):
+        slot.publish({'tick': i})
+    assert slot.take() == {'tick': 4}
+    assert slot.take() is None
+    assert slot.peek() == {'tick': 4}
+    assert slot.published == 5
+    assert slot.coalesced == 4
+
+def test_publish_from_another_thread():
+    slot = LatestSlot()
+    
+    def produce():
+        for i in range(10000):
+            slot.publish(i)
+    
+    thread = threading.Thread(target=produce)
+    thread.start()
+    taken = []
+    while thread.is_alive():
+        value = slot.take()
+        if value is not None:
+            taken.append(value)
+    thread.join()
+    value = slot.take()
+    if value is not None:
+        taken.append(value)
+    
+    assert taken[-1] == 9999
+    assert taken == sorted(taken)
+    assert slot.coalesced + len(taken) == 10000
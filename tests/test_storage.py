@@ -0,0 +1,177 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.core.storage import SCHEMA_VERSION, TradingDataStorage, choose_bucket
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = TradingDataStorage(str(tmp_path / "trading.db"), batch_size=50, flush_interval=0.05)
+    yield storage
+    storage.close()
+
+def trading_metrics(i):
+    return {
+        'slippage': i, 'fees': 0.1, 'impact': 0.2,
+        'net_cost': 1.0, 'maker_taker': 50.0, 'processing_time': 0.5
+    }
+
+def test_writes_are_batched(storage):
+    start = datetime.now() - timedelta(minutes=1)
+    for i in range(120):
+        storage.save_trading_metrics(trading_metrics(i))
+    storage.flush()
+    
+    stats = storage.get_writer_stats()
+    data = storage.get_historical_data(start, datetime.now() + timedelta(minutes=1))
+    assert len(data['trading']) == 120
+    assert stats['rows_written'] == 120
+    assert stats['commits'] < 120
+    assert stats['queue_depth'] == 0
+
+def test_trading_rows_use_tick_timestamp(storage):
+    tick_time = datetime(2024, 3, 20, 10, 0, tzinfo=timezone.utc)
+    storage.save_trading_metrics(dict(trading_metrics(0), timestamp=tick_time))
+    storage.flush()
+    
+    data = storage.get_historical_data(tick_time - timedelta(seconds=1), tick_time + timedelta(seconds=1))
+    assert data['trading']['timestamp'].tolist() == [int(tick_time.timestamp() * 1e9)]
+
+def test_close_flushes_pending_rows(tmp_path):
+    db_path = str(tmp_path / "trading.db")
+    storage = TradingDataStorage(db_path, batch_size=10000, flush_interval=60)
+    for i in range(10):
+        storage.save_trading_metrics(trading_metrics(i))
+    storage.close()
+    
+    reopened = TradingDataStorage(db_path)
+    data = reopened.get_historical_data(datetime.now() - timedelta(minutes=1), datetime.now())
+    reopened.close()
+    assert len(data['trading']) == 10
+    assert reopened.get_writer_stats()['rows_written'] == 0
+
+def test_wal_mode(storage):
+    mode = storage._read_conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+def test_flush_forces_commit(tmp_path):
+    storage = TradingDataStorage(str(tmp_path / "trading.db"), batch_size=10000, flush_interval=60)
+    storage.save_trading_metrics(trading_metrics(0))
+    storage.flush()
+    
+    assert storage.get_writer_stats()['rows_written'] == 1
+    storage.close()
+
+def test_migrates_legacy_text_timestamps(tmp_path):
+    import sqlite3
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE orderbook_snapshots (timestamp TEXT, exchange TEXT, symbol TEXT, "
+                 "mid_price REAL, spread REAL, depth REAL, volume REAL, data TEXT)")
+    conn.execute("CREATE TABLE trading_metrics (timestamp TEXT, slippage REAL, fees REAL, impact REAL, "
+                 "net_cost REAL, maker_taker REAL, processing_time REAL)")
+    conn.execute("CREATE TABLE performance_metrics (timestamp TEXT, avg_processing_time REAL, "
+                 "avg_ui_update_time REAL, avg_ws_latency REAL, error_rate REAL, ticks_per_second REAL)")
+    conn.execute("INSERT INTO orderbook_snapshots VALUES ('2024-03-20T10:00:00+00:00', 'OKX', "
+                 "'BTC-USDT-SWAP', 50000.0, 1.0, 2.0, 4.0, '{}')")
+    conn.commit()
+    conn.close()
+    
+    storage = TradingDataStorage(str(db_path))
+    data = storage.get_historical_data(
+        datetime.fromisoformat("2024-03-20T09:59:00+00:00"),
+        datetime.fromisoformat("2024-03-20T10:01:00+00:00"),
+        symbol="BTC-USDT-SWAP"
+    )
+    version = storage._read_conn.execute("PRAGMA user_version").fetchone()[0]
+    storage.close()
+    
+    assert version == SCHEMA_VERSION
+    assert data['orderbook']['timestamp'].tolist() == [1710928800 * 10**9]
+
+def test_range_queries_use_index(storage):
+    plan = storage._read_conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM orderbook_snapshots "
+        "WHERE timestamp BETWEEN ? AND ? AND symbol = ?", (0, 1, "BTC-USDT-SWAP")
+    ).fetchall()
+    
+    assert "idx_orderbook_symbol_time" in str(plan)
+
+T0 = datetime(2024, 3, 20, tzinfo=timezone.utc)
+
+def save_spreads(storage, n, step_seconds):
+    rng = np.random.default_rng(1)
+    spreads = rng.uniform(0.1, 2.0, n)
+    timestamps = [T0 + timedelta(seconds=i * step_seconds) for i in range(n)]
+    for timestamp, spread in zip(timestamps, spreads):
+        storage.save_orderbook_snapshot({
+            'timestamp': timestamp, 'exchange': 'OKX', 'symbol': 'BTC-USDT-SWAP',
+            'mid_price': 100.0, 'spread': spread, 'depth': 1.0, 'volume': 1.0, 'data': {}
+        })
+    storage.flush()
+    return [int(t.timestamp()) * 10**9 for t in timestamps], spreads
+
+def expected_buckets(timestamps, values, bucket_ns):
+    keys = np.asarray(timestamps) // bucket_ns * bucket_ns
+    return {
+        key: (values[keys == key].min(), values[keys == key].max(),
+              values[keys == key].mean(), values[keys == key][-1])
+        for key in np.unique(keys)
+    }
+
+def assert_matches(frame, expected):
+    assert frame['timestamp'].tolist() == sorted(expected)
+    for row in frame.itertuples():
+        low, high, mean, last = expected[row.timestamp]
+        assert row.min == pytest.approx(low)
+        assert row.max == pytest.approx(high)
+        assert row.mean == pytest.approx(mean)
+        assert row.last == pytest.approx(last)
+
+def test_choose_bucket():
+    hour = 3600 * 10**9
+    assert choose_bucket(0, 30 * 24 * hour, 1000) == (3000 * 10**9, 600)
+    assert choose_bucket(0, 30 * 24 * hour, 200) == (4 * hour, 3600)
+    assert choose_bucket(0, hour, 1000) == (4 * 10**9, 1)
+    assert choose_bucket(0, 60 * 10**9, 1000) == (60 * 10**6, None)
+
+def test_aggregated_query_uses_rollups(storage):
+    timestamps, spreads = save_spreads(storage, 2000, 7)
+    end = T0 + timedelta(seconds=2000 * 7)
+    frame = storage.get_aggregated_data('orderbook_snapshots', 'spread', T0, end, max_points=100)
+    
+    bucket_ns, resolution = choose_bucket(timestamps[0], int(end.timestamp()) * 10**9, 100)
+    assert resolution == 60
+    assert len(frame) <= 101
+    assert frame['count'].sum() == 2000
+    assert_matches(frame, expected_buckets(timestamps, spreads, bucket_ns))
+
+def test_aggregated_query_falls_back_to_raw_rows(storage):
+    timestamps, spreads = save_spreads(storage, 50, 1)
+    frame = storage.get_aggregated_data(
+        'orderbook_snapshots', 'spread', T0, T0 + timedelta(seconds=50), max_points=10
+    )
+    assert len(frame) == 10
+    assert_matches(frame, expected_buckets(timestamps, spreads, 5 * 10**9))
+
+def test_aggregated_query_rejects_unknown_column(storage):
+    with pytest.raises(ValueError):
+        storage.get_aggregated_data('orderbook_snapshots', 'data', T0, T0)
+
+def test_migration_backfills_rollups(tmp_path):
+    import sqlite3
+    db_path = tmp_path / "trading.db"
+    storage = TradingDataStorage(str(db_path))
+    timestamps, spreads = save_spreads(storage, 300, 1)
+    storage.close()
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE rollups")
+    conn.execute("PRAGMA user_version = 3")
+    conn.commit()
+    conn.close()
+    
+    storage = TradingDataStorage(str(db_path))
+    frame = storage.get_aggregated_data(
+        'orderbook_snapshots', 'spread', T0, T0 + timedelta(seconds=300), max_points=5
+    )
+    storage.close()
+    assert_matches(frame, expected_buckets(timestamps, spreads, 60 * 10**9))
@@ -0,0 +1,50 @@
+import math
+import numpy as np
+import pytest
+from src.models.volatility import RealizedVolatility
+
+def random_walk(estimator, sigma_daily, ticks, dt=1.0, start=0.0, seed=42):
+    rng = np.random.default_rng(seed)
+    step = sigma_daily * math.sqrt(dt / 86400)
+    price, t = 50000.0, start
+    for _ in range(ticks):
+        price *= math.exp(rng.normal(0, step))
+        t += dt
+        estimator.update(price, t)
+    return price, t
+
+def test_recovers_known_volatility():
+    estimator = RealizedVolatility(windows=(600.0, 3600.0), halflives=(300.0,))
+    random_walk(estimator, 0.03, 20000)
+    
+    for value in estimator.estimates().values():
+        assert value == pytest.approx(0.03, rel=0.15)
+    assert len(estimator.estimates()) == 3
+
+def test_windows_expire_old_returns():
+    estimator = RealizedVolatility(windows=(60.0, 3600.0), halflives=(10.0,))
+    price, t = random_walk(estimator, 0.05, 600)
+    # Ten quiet minutes: the short horizons forget, the hour window does not
+    for i in range(600):
+        estimator.update(price, t + i + 1)
+    
+    assert estimator.window(60) == pytest.approx(0.0, abs=1e-6)
+    assert estimator.ewma(10) == pytest.approx(0.0, abs=1e-6)
+    assert estimator.window(3600) > 0.02
+
+def test_warm_up_and_capacity():
+    estimator = RealizedVolatility(windows=(3600.0,), halflives=(60.0,), capacity=50, min_samples=10)
+    assert estimator.sigma(0.02) == 0.02
+    random_walk(estimator, 0.03, 5)
+    assert math.isnan(estimator.window(3600))
+    assert estimator.sigma(0.02) == 0.02
+    
+    random_walk(estimator, 0.03, 500, start=10.0)
+    assert len(estimator._buffers[3600.0]) == 50
+    assert estimator.sigma(0.02) == estimator.ewma(60)
+    assert estimator.window(3600) > 0
+
+def test_tick_rate_sizes_windows():
+    estimator = RealizedVolatility(windows=(60.0, 3600.0), capacity=10000, tick_rate=10.0)
+    assert estimator._buffers[60.0].capacity == 600
+    assert estimator._buffers[3600.0].capacity == 10000
@@ -1,11 +1,14 @@
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
-from src.core.websocket_client import WebSocketClient
+from unittest.mock import AsyncMock, Mock, patch
+from websockets.exceptions import ConnectionClosed
+from src.core.websocket_client import WebSocketClient, backoff_delay
+from src.core.ingest import IngestQueue
+from src.core.performance import PerformanceAnalyzer
 
 @pytest.fixture
 def mock_websocket():
-    with patch('websockets.connect') as mock:
+    with patch('websockets.connect', new_callable=AsyncMock) as mock:
         yield mock
 
 @pytest.fixture
@@ -27,9 +30,17 @@ async def test_message_processing(mock_websocket, ws_client):
     mock_callback = Mock()
     ws_client.set_callback(mock_callback)
     
-    # Simulate receiving a message
-    mock_ws = Mock()
-    mock_ws.recv.return_value = '{"test": "data"}'
+    # Simulate receiving a single message, then the server closing the socket
+    messages = ['{"test": "data"}']
+    
+    async def recv():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(0.01)
+        raise ConnectionClosed(None, None)
+    
+    mock_ws = AsyncMock()
+    mock_ws.recv.side_effect = recv
     mock_websocket.return_value = mock_ws
     
     # Start client and wait for one message
@@ -39,4 +50,151 @@ async def test_message_processing(mock_websocket, ws_client):
     await task
     
     # Verify callback was called
-    mock_callback.assert_called_once_with({"test": "data"}) 
\ No newline at end of file
+    mock_callback.assert_called_once_with({"test": "data"})
+
+@pytest.mark.asyncio
+async def test_ingest_queue_drop_oldest():
+    analyzer = PerformanceAnalyzer()
+    queue = IngestQueue(maxsize=2, policy="drop_oldest", performance_analyzer=analyzer)
+    for i in range(4):
+        await queue.put(i)
+    
+    assert [await queue.get(), await queue.get()] == [2, 3]
+    assert queue.dropped == 2
+    assert analyzer.get_performance_report()['dropped_messages'] == 2
+
+@pytest.mark.asyncio
+async def test_ingest_queue_conflates_per_key():
+    analyzer = PerformanceAnalyzer()
+    queue = IngestQueue(
+        maxsize=10,
+        policy="conflate",
+        key_func=lambda item: item[0],
+        performance_analyzer=analyzer
+    )
+    for item in [("BTC", 1), ("ETH", 1), ("BTC", 2), ("BTC", 3)]:
+        await queue.put(item)
+    
+    assert queue.qsize() == 2
+    assert await queue.get() == ("BTC", 3)
+    assert await queue.get() == ("ETH", 1)
+    assert analyzer.get_performance_report()['conflated_messages'] == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["drop_oldest", "conflate"])
+async def test_ingest_queue_never_drops_controls(policy):
+    queue = IngestQueue(maxsize=2, policy=policy, key_func=lambda item: item)
+    await queue.put("a")
+    queue.put_control("control")
+    for item in ["b", "c", "d"]:
+        await queue.put(item)
+    
+    assert queue.qsize() == 2
+    assert queue.dropped == 2
+    assert [await queue.get() for _ in range(3)] == ["control", "c", "d"]
+    assert queue.empty()
+
+@pytest.mark.asyncio
+async def test_ingest_queue_block_waits_for_consumer():
+    queue = IngestQueue(maxsize=1, policy="block")
+    await queue.put("first")
+    producer = asyncio.create_task(queue.put("second"))
+    await asyncio.sleep(0.01)
+    
+    assert not producer.done()
+    assert await queue.get() == "first"
+    await producer
+    assert await queue.get() == "second"
+
+def test_backoff_delay_is_capped_and_jittered():
+    assert backoff_delay(1, 0.1, 5.0, rng=lambda low, high: low) == pytest.approx(0.05)
+    assert backoff_delay(3, 0.1, 5.0, rng=lambda low, high: high) == pytest.approx(0.4)
+    assert backoff_delay(20, 0.1, 5.0, rng=lambda low, high: high) == pytest.approx(5.0)
+
+@pytest.mark.asyncio
+async def test_reconnect_triggers_resync_and_metrics(mock_websocket):
+    analyzer = PerformanceAnalyzer()
+    resyncs = []
+    client = WebSocketClient(
+        "wss://test.url",
+        performance_analyzer=analyzer,
+        reconnect_base_delay=0.001,
+        on_reconnect=lambda: resyncs.append(True)
+    )
+    
+    async def recv():
+        await asyncio.sleep(0.01)
+        raise ConnectionClosed(None, None)
+    
+    mock_ws = AsyncMock()
+    mock_ws.recv.side_effect = recv
+    mock_websocket.return_value = mock_ws
+    
+    task = asyncio.create_task(client.start())
+    await asyncio.sleep(0.05)
+    client.running = False
+    await task
+    
+    report = analyzer.get_performance_report()
+    assert client.reconnects >= 2
+    assert len(resyncs) == client.reconnects
+    assert report['reconnects'] == client.reconnects
+    assert report['downtime_seconds'] >= 0
+
+@pytest.mark.asyncio
+async def test_stale_connection_is_recycled(mock_websocket):
+    client = WebSocketClient("wss://test.url", stale_timeout=0.02, reconnect_base_delay=0.001)
+    
+    def make_socket():
+        closed = asyncio.Event()
+        
+        async def recv():
+            await closed.wait()
+            raise ConnectionClosed(None, None)
+        
+        async def close():
+            closed.set()
+        
+        socket = AsyncMock()
+        socket.recv.side_effect = recv
+        socket.close.side_effect = close
+        return socket
+    
+    mock_websocket.side_effect = lambda *args, **kwargs: make_socket()
+    
+    task = asyncio.create_task(client.start())
+    await asyncio.sleep(0.1)
+    await client.close()
+    await task
+    
+    assert client.reconnects >= 1
+
+@pytest.mark.asyncio
+async def test_flapping_connection_backs_off(mock_websocket):
+    attempts = []
+    
+    def make_socket(frames):
+        async def recv():
+            if frames:
+                return frames.pop()
+            raise ConnectionClosed(None, None)
+        
+        socket = AsyncMock()
+        socket.recv.side_effect = recv
+        return socket
+    
+    # Connects that close at once back off further each time; one that delivered data resets it
+    sockets = [make_socket([]), make_socket([]), make_socket(['{"test": "data"}'])]
+    mock_websocket.side_effect = lambda *args, **kwargs: sockets.pop(0) if sockets else make_socket([])
+    client = WebSocketClient("wss://test.url", max_reconnect_attempts=3, stale_timeout=None,
+                             min_stable_time=60.0)
+    
+    def record(attempt, base, cap):
+        attempts.append(attempt)
+        return 0
+    
+    with patch('src.core.websocket_client.backoff_delay', record):
+        await client.start()
+    
+    assert attempts == [1, 2, 1, 2, 3]
+    assert client.reconnects == 6